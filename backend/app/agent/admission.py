@@ -0,0 +1,193 @@
+import asyncio
+import bisect
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first: a resume finishes a negotiation a human is waiting on
+PRIORITY_RESUME = 0
+PRIORITY_NEGOTIATE = 1
+
+# (kind, value), e.g. ("supplier", "<uuid>"); each kind has its own cap
+AdmissionKey = Tuple[str, str]
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a graph run cannot be admitted; served as 429 with Retry-After.
+    """
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "keys", "future", "granted")
+
+    def __init__(self, priority: int, seq: int, keys: Sequence[AdmissionKey]):
+        self.priority = priority
+        self.seq = seq
+        self.keys = keys
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.granted = False
+
+
+class AdmissionController:
+    """
+    Limits concurrent graph runs in this process: globally and per key (supplier,
+    tenant). Runs over a limit wait in a bounded priority queue; when the queue is
+    full, or a run waited `max_wait` seconds, it is rejected so callers back off
+    instead of piling onto the LLM provider.
+
+    A run blocked only by its own supplier's cap does not hold up runs for other
+    suppliers queued behind it.
+
+    Attributes:
+        admitted (int): Runs admitted (immediately or after queueing).
+        rejected (int): Runs rejected (queue full or wait timeout).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_per_key: Optional[Dict[str, int]] = None,
+        max_queue: Optional[int] = None,
+        max_wait: Optional[float] = None,
+    ):
+        self.max_concurrent = max_concurrent or settings.AGENT_MAX_CONCURRENT_RUNS
+        self.max_per_key = max_per_key if max_per_key is not None else {
+            "supplier": settings.AGENT_MAX_RUNS_PER_SUPPLIER,
+            "tenant": settings.AGENT_MAX_RUNS_PER_TENANT,
+        }
+        self.max_queue = settings.AGENT_MAX_QUEUED_RUNS if max_queue is None else max_queue
+        self.max_wait = settings.AGENT_MAX_QUEUE_WAIT_SECONDS if max_wait is None else max_wait
+        self.admitted = 0
+        self.rejected = 0
+        self._active = 0
+        self._active_per_key: Dict[AdmissionKey, int] = {}
+        self._queue: List[_Waiter] = []
+        self._seq = 0
+        self._avg_run_seconds = 5.0  # EWMA, seeds the Retry-After estimate
+
+    @asynccontextmanager
+    async def admit(self, keys: Sequence[AdmissionKey] = (), priority: int = PRIORITY_NEGOTIATE) -> AsyncIterator[None]:
+        """
+        Hold a run slot for the duration of the block.
+
+        Raises:
+            AdmissionRejected: The queue is full or the wait exceeded `max_wait`.
+        """
+        keys = [key for key in keys if key[1]]
+        await self._acquire(keys, priority)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * (time.monotonic() - start)
+            self._release(keys)
+
+    async def _acquire(self, keys: List[AdmissionKey], priority: int):
+        if self._can_run(keys):
+            self._take(keys)
+            self.admitted += 1
+            return
+        if len(self._queue) >= self.max_queue:
+            self._reject(f"Negotiation queue full ({self.max_queue} waiting)")
+
+        self._seq += 1
+        waiter = _Waiter(priority, self._seq, keys)
+        bisect.insort(self._queue, waiter, key=lambda w: (w.priority, w.seq))
+        try:
+            await asyncio.wait_for(waiter.future, self.max_wait)
+        except asyncio.TimeoutError:
+            # The slot may have been granted just as the wait ran out: keep it
+            if not waiter.granted:
+                self._dequeue(waiter)
+                self._reject(f"No negotiation slot within {self.max_wait:.0f}s")
+        except asyncio.CancelledError:
+            if waiter.granted:
+                self._release(keys)
+            else:
+                self._dequeue(waiter)
+            raise
+        self.admitted += 1
+
+    def _dequeue(self, waiter: _Waiter):
+        # A release in between may already have dropped the abandoned waiter
+        if waiter in self._queue:
+            self._queue.remove(waiter)
+
+    def _can_run(self, keys: List[AdmissionKey]) -> bool:
+        if self._active >= self.max_concurrent:
+            return False
+        return all(
+            self._active_per_key.get(key, 0) < self.max_per_key[key[0]]
+            for key in keys if key[0] in self.max_per_key
+        )
+
+    def _take(self, keys: List[AdmissionKey]):
+        self._active += 1
+        for key in keys:
+            self._active_per_key[key] = self._active_per_key.get(key, 0) + 1
+
+    def _release(self, keys: List[AdmissionKey]):
+        self._active -= 1
+        for key in keys:
+            remaining = self._active_per_key.get(key, 0) - 1
+            if remaining > 0:
+                self._active_per_key[key] = remaining
+            else:
+                self._active_per_key.pop(key, None)
+        self._dispatch()
+
+    def _dispatch(self):
+        # Grant freed slots in priority order, skipping waiters whose own key is saturated.
+        # A waiter that timed out or was cancelled has a done future but only leaves the
+        # queue once its task resumes; drop it here rather than granting it a slot.
+        i = 0
+        while i < len(self._queue) and self._active < self.max_concurrent:
+            waiter = self._queue[i]
+            if waiter.future.done():
+                self._queue.pop(i)
+            elif self._can_run(waiter.keys):
+                self._queue.pop(i)
+                self._take(waiter.keys)
+                waiter.granted = True
+                waiter.future.set_result(None)
+            else:
+                i += 1
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        retry_after = self.retry_after()
+        logger.warning(f"Negotiation run rejected: {reason}; retry after {retry_after}s")
+        raise AdmissionRejected(reason, retry_after)
+
+    def retry_after(self) -> int:
+        """
+        Seconds until the current queue is expected to drain.
+        """
+        waves = (len(self._queue) + 1) / self.max_concurrent
+        return max(1, min(60, math.ceil(waves * self._avg_run_seconds)))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "active": self._active,
+            "queued": len(self._queue),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "avg_run_seconds": round(self._avg_run_seconds, 3),
+        }
+
+
+admission_controller = AdmissionController()
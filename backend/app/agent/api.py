@@ -1,34 +1,106 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
 
+from app.agent.admission import (
+    PRIORITY_NEGOTIATE, PRIORITY_RESUME, AdmissionRejected, admission_controller
+)
 from app.agent.graph import negotiation_graph
-from app.agent.state import NegotiationState
-from app.llm import LLMMessage
+from app.agent.routing import fast_path_stats
+from app.agent.state import NegotiationState, RESET_ROLE
+from app.agent.transcript import get_transcript_writer, load_transcript, message_dict
+from app.contract.clauses import rule_terms
+from app.database import async_session
+from app.llm import CoalescingLLMClient, LLMMessage, get_llm_client
+from app.models import Contract, ContractClause
+from app.supplier.intelligence import supplier_refreshes
 
 router = APIRouter(tags=["agent"])
 
+async def _run_graph(graph_input: Any, config: Dict[str, Any], contract_id: str):
+    """
+    Run the graph until it finishes or hits an interrupt, recording every step's
+    messages and decisions with the transcript writer. Recording only buffers;
+    the rows are written in batches in the background.
+
+    Returns:
+        StateSnapshot: The thread state after the run.
+    """
+    writer = get_transcript_writer()
+    thread_id = config["configurable"]["thread_id"]
+    values = (await negotiation_graph.aget_state(config)).values
+    # Transcript position of the next message: archived + still in the state window
+    sequence = (values.get("archived_message_count") or 0) + len(values.get("messages") or [])
+    if isinstance(graph_input, dict) and graph_input.get("messages"):
+        writer.record_messages(thread_id, contract_id, graph_input["messages"], sequence)
+        sequence += len(graph_input["messages"])
+
+    # Checkpoint once when the run stops (interrupt or end) instead of after every
+    # node: a run is short and its client retries it, and with the database
+    # checkpointer each checkpoint is a round trip
+    async for step in negotiation_graph.astream(graph_input, config=config, stream_mode="updates", durability="exit"):
+        for update in step.values():
+            if not isinstance(update, dict):
+                continue  # Interrupt payloads
+            messages = update.get("messages") or []
+            # Window resets (summarization) re-emit messages that are already recorded
+            if messages and messages[0].role != RESET_ROLE:
+                writer.record_messages(thread_id, contract_id, messages, sequence)
+                sequence += len(messages)
+            if update.get("strategy_decision"):
+                writer.record_decision(thread_id, contract_id, strategy=update["strategy_decision"],
+                                       reasoning=update.get("reasoning"))
+
+    snapshot = await negotiation_graph.aget_state(config)
+    writer.record_decision(thread_id, contract_id, status="active" if snapshot.next else "completed")
+    return snapshot
+
 class NegotiationRequest(BaseModel):
-    contract_id: str
+    contract_id: UUID
     supplier_id: str
-    clause_text: str
+    clause_text: str = ""
+    clause_id: Optional[UUID] = None # Stored ContractClause; its text and normalized terms are used
     thread_id: str = "default_thread" # Identifier for the conversation history
 
+def _admission_keys(supplier_id: Optional[str], tenant_id: Optional[str]):
+    return [("supplier", supplier_id or ""), ("tenant", tenant_id or "")]
+
 @router.post("/negotiate")
-async def start_negotiation(request: NegotiationRequest) -> Dict[str, Any]:
+async def start_negotiation(
+    request: NegotiationRequest, x_tenant_id: Optional[str] = Header(None)
+) -> Dict[str, Any]:
     """
     Triggers or resumes the Agentic Negotiation Workflow.
+    Runs beyond the admission limits wait briefly, then get 429 with Retry-After.
     """
     # Config for persistence
     config = {"configurable": {"thread_id": request.thread_id}}
+
+    clause_text, clause_terms = request.clause_text, None
+    if request.clause_id is not None:
+        async with async_session() as session:
+            clause = await session.get(ContractClause, request.clause_id)
+            contract = await session.get(Contract, clause.contract_id) if clause is not None else None
+        if clause is None:
+            raise HTTPException(status_code=404, detail="Clause not found")
+        # The clause is negotiated under the request's contract and supplier, so it must be theirs
+        if str(clause.contract_id) != str(request.contract_id):
+            raise HTTPException(status_code=422, detail="Clause does not belong to this contract")
+        if contract is not None and contract.supplier_id is not None and str(contract.supplier_id) != request.supplier_id:
+            raise HTTPException(status_code=422, detail="Contract does not belong to this supplier")
+        clause_text, clause_terms = clause.content, rule_terms(clause.terms)
+    if not clause_text:
+        raise HTTPException(status_code=422, detail="Provide clause_text or clause_id")
     
     # Initialize State
     initial_state: NegotiationState = {
-        "contract_id": request.contract_id,
+        "contract_id": str(request.contract_id),
         "supplier_id": request.supplier_id,
-        "current_clause_text": request.clause_text,
-        "messages": [LLMMessage(role="user", content=request.clause_text)],
+        "current_clause_text": clause_text,
+        "clause_terms": clause_terms,
+        "messages": [LLMMessage(role="user", content=clause_text)],
         "policy_analysis": None,
         "risk_profile": None,
         # "strategy_decision": None,  <-- REMOVED to avoid overwriting if graph persists it differently or if it's not needed here
@@ -39,12 +111,12 @@ async def start_negotiation(request: NegotiationRequest) -> Dict[str, Any]:
     }
     
     try:
-        # Run the Graph with persistence
-        # ainvoke will run until it finishes OR hits an interrupt
-        final_state = await negotiation_graph.ainvoke(initial_state, config=config)
+        # Run the Graph with persistence, until it finishes OR hits an interrupt
+        async with admission_controller.admit(_admission_keys(request.supplier_id, x_tenant_id), PRIORITY_NEGOTIATE):
+            snapshot = await _run_graph(initial_state, config, str(request.contract_id))
+        final_state = snapshot.values
         
         # Check for soft interrupt (Paused)
-        snapshot = negotiation_graph.get_state(config)
         if snapshot.next:
             return {
                 "status": "paused",
@@ -59,11 +131,13 @@ async def start_negotiation(request: NegotiationRequest) -> Dict[str, Any]:
             "reasoning": final_state.get("reasoning"),
             "redline": final_state.get("proposed_redline")
         }
+    except AdmissionRejected:
+        raise
     except Exception as e:
         # Check if it was an interrupt (not strictly an exception in recent versions, but control flow stops)
         # LangGraph usually returns the state at interrupt.
         # But if we want to catch the interrupt explicitly, we check the snapshot.
-        snapshot = negotiation_graph.get_state(config)
+        snapshot = await negotiation_graph.aget_state(config)
         if snapshot.next:
             return {
                 "status": "paused",
@@ -80,9 +154,10 @@ class ResumeRequest(BaseModel):
     feedback: str = ""
 
 @router.post("/resume")
-async def resume_negotiation(request: ResumeRequest) -> Dict[str, Any]:
+async def resume_negotiation(request: ResumeRequest, x_tenant_id: Optional[str] = Header(None)) -> Dict[str, Any]:
     """
-    Resumes a paused workflow with human input.
+    Resumes a paused workflow with human input. Resumes are admitted ahead of
+    queued new negotiations.
     """
     config = {"configurable": {"thread_id": request.thread_id}}
     
@@ -95,24 +170,30 @@ async def resume_negotiation(request: ResumeRequest) -> Dict[str, Any]:
     try:
         # We find the paused command and resume
         # For simplicity in this demo, we'll verify it's paused
-        snapshot = negotiation_graph.get_state(config)
+        snapshot = await negotiation_graph.aget_state(config)
         if not snapshot.next:
              return {"status": "error", "message": "Thread is not paused."}
              
         # Resume with the input expected by 'interrupt'
-        result = await negotiation_graph.ainvoke(
-             Command(resume={"status": request.action, "feedback": request.feedback}),
-             config=config
-        )
+        keys = _admission_keys(snapshot.values.get("supplier_id"), x_tenant_id)
+        async with admission_controller.admit(keys, PRIORITY_RESUME):
+            snapshot = await _run_graph(
+                 Command(resume={"status": request.action, "feedback": request.feedback}),
+                 config,
+                 snapshot.values.get("contract_id", "")
+            )
+        result = snapshot.values
         
         return {
             "status": "completed",
             "strategy": result.get("strategy_decision"),
             "redline": result.get("proposed_redline")
         }
+    except AdmissionRejected:
+        raise
     except Exception as e:
         # Again, check if paused again (multi-stage approval)
-        snapshot = negotiation_graph.get_state(config)
+        snapshot = await negotiation_graph.aget_state(config)
         if snapshot.next:
              return {"status": "paused", "message": "More approval needed."}
 @router.get("/thread/{thread_id}")
@@ -123,15 +204,27 @@ async def get_thread_state(thread_id: str) -> Dict[str, Any]:
     config = {"configurable": {"thread_id": thread_id}}
     
     try:
-        snapshot = negotiation_graph.get_state(config)
+        snapshot = await negotiation_graph.aget_state(config)
         if not snapshot.values:
-            # If no LangGraph state, check if we have SQL data to at least show the page
-            # For now, return empty-ish state so UI doesn't 404
-            return {"status": "inactive", "messages": []}
+            # No live graph state (e.g. after a restart): serve the stored transcript
+            async with async_session() as session:
+                rows = await load_transcript(session, thread_id, include_decisions=False)
+            return {"status": "inactive", "messages": [message_dict(r) for r in rows]}
+
+        # Messages summarized out of the state window come from the transcript table
+        archived = snapshot.values.get("archived_message_count") or 0
+        messages = [m.dict() for m in snapshot.values.get("messages", [])]
+        if archived:
+            async with async_session() as session:
+                rows = await load_transcript(session, thread_id, before_sequence=archived, include_decisions=False)
+            messages = [message_dict(r) for r in rows] + messages
             
         return {
             "status": "active" if not snapshot.next else "paused",
-            "messages": snapshot.values.get("messages", []),
+            "messages": messages,
+            # Older messages are archived to NegotiationMessage and condensed here
+            "summary": snapshot.values.get("conversation_summary"),
+            "archived_messages": snapshot.values.get("archived_message_count", 0),
             "current_context": {
                 "strategy": snapshot.values.get("strategy_decision"),
                 "reasoning": snapshot.values.get("reasoning"),
@@ -143,6 +236,46 @@ async def get_thread_state(thread_id: str) -> Dict[str, Any]:
         # If ID is invalid or other error
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/thread/{thread_id}/messages")
+async def get_thread_messages(
+    thread_id: str,
+    since: Optional[datetime] = None,
+    limit: int = 200
+) -> List[Dict[str, Any]]:
+    """
+    Stored transcript of a thread (messages and decisions) in time order, read from
+    NegotiationMessage. Pass the last seen `timestamp` as `since` to page forward.
+    Records are written in batches, so the latest step may appear after a short delay.
+    """
+    async with async_session() as session:
+        rows = await load_transcript(session, thread_id, since=since, limit=limit)
+    return [message_dict(r) for r in rows]
+
+@router.get("/fast-path/stats")
+async def get_fast_path_stats() -> Dict[str, Any]:
+    """
+    How many clauses were decided by the fast path (no negotiator/scribe LLM calls), by rule.
+    """
+    return fast_path_stats.to_dict()
+
+@router.get("/admission/stats")
+async def get_admission_stats() -> Dict[str, Any]:
+    """
+    Graph runs active, queued, admitted and rejected in this worker.
+    """
+    return admission_controller.stats()
+
+@router.get("/coalescing/stats")
+async def get_coalescing_stats() -> Dict[str, Any]:
+    """
+    Upstream calls started vs. callers that joined an identical call in flight.
+    """
+    llm = get_llm_client()
+    return {
+        "supplier_refresh": supplier_refreshes.stats(),
+        "llm": llm.stats() if isinstance(llm, CoalescingLLMClient) else None,
+    }
+
 @router.get("/negotiations")
 async def list_negotiations() -> List[Dict[str, Any]]:
     """
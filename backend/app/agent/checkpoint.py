@@ -0,0 +1,242 @@
+import logging
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models import GraphCheckpoint, GraphCheckpointWrite
+
+logger = logging.getLogger(__name__)
+
+# Application types stored in graph state (NegotiationState.messages)
+STATE_TYPES = [("app.llm.base", "LLMMessage")]
+
+
+class DatabaseCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer on the application database.
+
+    Checkpoints and pending writes (including interrupts waiting for /resume) live
+    in the GraphCheckpoint / GraphCheckpointWrite tables, so any API worker can
+    continue any thread. Async only: the graph must be driven with ainvoke/astream
+    and inspected with aget_state.
+    """
+
+    def __init__(self, session_factory, serde=None):
+        super().__init__(serde=serde or JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES))
+        self.session_factory = session_factory
+
+    # --- Reads ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = select(GraphCheckpoint).where(
+            GraphCheckpoint.thread_id == thread_id, GraphCheckpoint.checkpoint_ns == checkpoint_ns
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(GraphCheckpoint.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(GraphCheckpoint.checkpoint_id.desc()).limit(1)
+
+        async with self.session_factory() as session:
+            row = (await session.execute(query)).scalars().first()
+            if row is None:
+                return None
+            writes = await self._load_writes(session, [row])
+        return self._to_tuple(row, writes.get(row.checkpoint_id, []))
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        query = select(GraphCheckpoint)
+        if config:
+            query = query.where(GraphCheckpoint.thread_id == config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                query = query.where(GraphCheckpoint.checkpoint_ns == checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(GraphCheckpoint.checkpoint_id == checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query = query.where(GraphCheckpoint.checkpoint_id < before_id)
+        query = query.order_by(GraphCheckpoint.checkpoint_id.desc())
+        if limit is not None and not filter:
+            query = query.limit(limit)
+
+        async with self.session_factory() as session:
+            rows = list((await session.execute(query)).scalars().all())
+            writes = await self._load_writes(session, rows)
+
+        yielded = 0
+        for row in rows:
+            if limit is not None and yielded >= limit:
+                break
+            checkpoint_tuple = self._to_tuple(row, writes.get(row.checkpoint_id, []))
+            if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            yielded += 1
+            yield checkpoint_tuple
+
+    async def _load_writes(self, session, rows: List[GraphCheckpoint]) -> Dict[str, List[GraphCheckpointWrite]]:
+        if not rows:
+            return {}
+        result = await session.execute(
+            select(GraphCheckpointWrite).where(
+                GraphCheckpointWrite.thread_id == rows[0].thread_id,
+                GraphCheckpointWrite.checkpoint_id.in_([r.checkpoint_id for r in rows]),
+            )
+        )
+        grouped: Dict[str, List[GraphCheckpointWrite]] = {}
+        for write in result.scalars().all():
+            grouped.setdefault(write.checkpoint_id, []).append(write)
+        return grouped
+
+    def _to_tuple(self, row: GraphCheckpoint, writes: List[GraphCheckpointWrite]) -> CheckpointTuple:
+        def config(checkpoint_id: str) -> RunnableConfig:
+            return {"configurable": {
+                "thread_id": row.thread_id, "checkpoint_ns": row.checkpoint_ns, "checkpoint_id": checkpoint_id,
+            }}
+
+        ordered = sorted(writes, key=lambda w: writes_sort_key(w.task_path, w.task_id, w.idx))
+        return CheckpointTuple(
+            config=config(row.checkpoint_id),
+            checkpoint=self.serde.loads_typed((row.type, row.checkpoint)),
+            metadata=self.serde.loads_typed((row.metadata_type, row.checkpoint_metadata)),
+            parent_config=config(row.parent_checkpoint_id) if row.parent_checkpoint_id else None,
+            pending_writes=[(w.task_id, w.channel, self.serde.loads_typed((w.type, w.value))) for w in ordered],
+        )
+
+    # --- Writes ---
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, payload = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_payload = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        row = GraphCheckpoint(
+            thread_id=thread_id,
+            checkpoint_ns=checkpoint_ns,
+            checkpoint_id=checkpoint["id"],
+            parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+            type=type_,
+            checkpoint=payload,
+            metadata_type=metadata_type,
+            checkpoint_metadata=metadata_payload,
+        )
+        async with self.session_factory() as session:
+            # Checkpoint ids are fresh per step: a plain INSERT, no read-before-write
+            session.add(row)
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                await session.merge(row)
+                await session.commit()
+        return {"configurable": {
+            "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"],
+        }}
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        async with self.session_factory() as session:
+            existing = set((await session.execute(
+                select(GraphCheckpointWrite.idx).where(
+                    GraphCheckpointWrite.thread_id == thread_id,
+                    GraphCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                    GraphCheckpointWrite.checkpoint_id == checkpoint_id,
+                    GraphCheckpointWrite.task_id == task_id,
+                )
+            )).scalars().all())
+            rows, replaced = [], []
+            for i, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, i)
+                # Regular writes are immutable once stored; special channels (errors, interrupts) are replaced
+                if idx in existing:
+                    if idx >= 0:
+                        continue
+                    replaced.append(idx)
+                type_, payload = self.serde.dumps_typed(value)
+                rows.append({
+                    "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id,
+                    "task_id": task_id, "idx": idx, "channel": channel, "type": type_, "value": payload,
+                    "task_path": task_path,
+                })
+            if replaced:
+                await session.execute(delete(GraphCheckpointWrite).where(
+                    GraphCheckpointWrite.thread_id == thread_id,
+                    GraphCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                    GraphCheckpointWrite.checkpoint_id == checkpoint_id,
+                    GraphCheckpointWrite.task_id == task_id,
+                    GraphCheckpointWrite.idx.in_(replaced),
+                ))
+            if rows:
+                await session.execute(insert(GraphCheckpointWrite), rows)
+            await session.commit()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(delete(GraphCheckpointWrite).where(GraphCheckpointWrite.thread_id == thread_id))
+            await session.execute(delete(GraphCheckpoint).where(GraphCheckpoint.thread_id == thread_id))
+            await session.commit()
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Same monotonic "<counter>.<random>" scheme as the in-memory saver
+        return InMemorySaver.get_next_version(self, current, channel)
+
+    # --- Sync API (not supported) ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        raise NotImplementedError("DatabaseCheckpointSaver is async-only; use aget_state/ainvoke.")
+
+    def list(self, config: Optional[RunnableConfig], **kwargs) -> Iterator[CheckpointTuple]:
+        raise NotImplementedError("DatabaseCheckpointSaver is async-only; use aget_state/ainvoke.")
+
+    def put(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        raise NotImplementedError("DatabaseCheckpointSaver is async-only; use aget_state/ainvoke.")
+
+    def put_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        raise NotImplementedError("DatabaseCheckpointSaver is async-only; use aget_state/ainvoke.")
+
+
+def build_checkpointer(kind: str):
+    """
+    Checkpointer for GRAPH_CHECKPOINTER: "memory" (single process) or "database".
+    """
+    if kind == "database":
+        from app.database import async_session
+        return DatabaseCheckpointSaver(async_session)
+    if kind != "memory":
+        raise ValueError(f"Unknown GRAPH_CHECKPOINTER '{kind}' (expected 'memory' or 'database')")
+    return InMemorySaver()
@@ -1,7 +1,12 @@
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 from app.agent.state import NegotiationState
-from app.agent.nodes import policy_analysis_node, risk_analysis_node, strategy_node, drafting_node, human_review_gatekeeper
+from app.agent.nodes import (
+    policy_analysis_node, risk_analysis_node, strategy_node, drafting_node, human_review_gatekeeper,
+    summarize_node, fast_path_node
+)
+from app.agent.routing import route_after_analysis
+from app.agent.checkpoint import build_checkpointer
+from app.core.config import settings
 
 def build_negotiation_graph():
     """
@@ -15,6 +20,8 @@ def build_negotiation_graph():
     workflow.add_node("negotiator", strategy_node)
     workflow.add_node("gatekeeper", human_review_gatekeeper)
     workflow.add_node("scribe", drafting_node)
+    workflow.add_node("archivist", summarize_node)
+    workflow.add_node("fast_path", fast_path_node)
     
     # Define Edges
     # Start -> Lawyer (Check Policy)
@@ -23,8 +30,10 @@ def build_negotiation_graph():
     # Lawyer -> Analyst (Check Risk)
     workflow.add_edge("lawyer", "analyst")
     
-    # Analyst -> Negotiator (Synthesize)
-    workflow.add_edge("analyst", "negotiator")
+    # Analyst -> Negotiator (Synthesize), unless the outcome is already determined
+    # (sanctions hit, or compliant + low risk): then a templated decision, no LLM calls
+    workflow.add_conditional_edges("analyst", route_after_analysis, {"fast_path": "fast_path", "negotiator": "negotiator"})
+    workflow.add_edge("fast_path", "archivist")
     
     # Negotiator -> Gatekeeper (HITL Check)
     workflow.add_edge("negotiator", "gatekeeper")
@@ -36,11 +45,13 @@ def build_negotiation_graph():
     # For MVP: Proceed to Scribe. Scribe can check status.
     workflow.add_edge("gatekeeper", "scribe")
     
-    # Scribe -> End
-    workflow.add_edge("scribe", END)
+    # Scribe -> Archivist (bound the history carried in state) -> End
+    workflow.add_edge("scribe", "archivist")
+    workflow.add_edge("archivist", END)
     
-    # Persistence is required for interrupts
-    checkpointer = MemorySaver()
+    # Persistence is required for interrupts. With several workers the checkpoints
+    # live in the database, so a paused thread can be resumed by any of them.
+    checkpointer = build_checkpointer(settings.GRAPH_CHECKPOINTER)
     
     return workflow.compile(checkpointer=checkpointer)
 
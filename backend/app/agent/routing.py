@@ -0,0 +1,105 @@
+import logging
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.agent.state import NegotiationState
+from app.core.config import settings
+from app.supplier.intelligence import combined_risk_score
+
+logger = logging.getLogger(__name__)
+
+
+class FastPathDecision(NamedTuple):
+    rule: str
+    decision: str  # ACCEPT or REJECT
+    reasoning: str
+
+
+class FastPathStats:
+    """
+    Counts how many clauses were decided by the fast path without the negotiator
+    and scribe LLM calls.
+    """
+
+    def __init__(self):
+        self.routed = 0
+        self.by_rule: Dict[str, int] = {}
+
+    def record(self, decision: Optional[FastPathDecision]):
+        self.routed += 1
+        if decision is not None:
+            self.by_rule[decision.rule] = self.by_rule.get(decision.rule, 0) + 1
+
+    @property
+    def fast_path_rate(self) -> float:
+        return sum(self.by_rule.values()) / self.routed if self.routed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "clauses_routed": self.routed,
+            "fast_path": sum(self.by_rule.values()),
+            "by_rule": dict(self.by_rule),
+            "fast_path_rate": round(self.fast_path_rate, 4),
+        }
+
+
+fast_path_stats = FastPathStats()
+
+
+def supplier_risk(risk_profile: Dict[str, Any]) -> float:
+    return combined_risk_score(
+        risk_profile.get("financial_stress_score", 50),
+        risk_profile.get("news_sentiment_score", 0.0),
+        risk_profile.get("sanctions_flag", False),
+    )
+
+
+def fast_path_decision(state: NegotiationState) -> Optional[FastPathDecision]:
+    """
+    Decide a clause without the LLM when the outcome is already determined:
+
+    - the supplier has a sanctions hit -> REJECT;
+    - the policy check is COMPLIANT and supplier risk is at most FAST_PATH_MAX_RISK -> ACCEPT.
+
+    Only applies at the agency levels in FAST_PATH_AGENCY_LEVELS. The fast path goes
+    straight to the archivist, past the gatekeeper, so by default only AUTONOMOUS
+    threads take it: STRICT and MEDIUM keep the full path and its human review.
+    """
+    level = state.get("agency_level", settings.AGENCY_LEVEL)
+    if level not in settings.FAST_PATH_AGENCY_LEVELS:
+        return None
+    policy = state.get("policy_analysis") or {}
+    risk = state.get("risk_profile") or {}
+
+    if risk.get("sanctions_flag"):
+        match = risk.get("sanctions_list_match") or "unspecified list"
+        return FastPathDecision(
+            "sanctions_hit", "REJECT",
+            f"Supplier is flagged on a sanctions list ({match}). Engagement is not permitted, "
+            "so the clause is rejected without negotiation.",
+        )
+
+    if policy.get("status") == "COMPLIANT" and risk:
+        score = supplier_risk(risk)
+        if score <= settings.FAST_PATH_MAX_RISK:
+            version = f" v{policy['policy_version']}" if policy.get("policy_version") else ""
+            return FastPathDecision(
+                "compliant_low_risk", "ACCEPT",
+                f"Clause complies with policy{version} (score {policy.get('score', 100)}) and supplier "
+                f"risk is low ({score:.0f}/100). Accepted as is.",
+            )
+    return None
+
+
+def route_after_analysis(state: NegotiationState) -> str:
+    """
+    Conditional edge after the analyst: "fast_path" or "negotiator".
+    """
+    decision = fast_path_decision(state)
+    fast_path_stats.record(decision)
+    if decision is None:
+        return "negotiator"
+    logger.info(
+        f"Fast path '{decision.rule}' -> {decision.decision} "
+        f"({fast_path_stats.fast_path_rate:.0%} of clauses so far)"
+    )
+    return "fast_path"
@@ -0,0 +1,80 @@
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def draft_fingerprint(clause: str, reasoning: str) -> str:
+    """
+    Identifies the inputs a draft was made from, so a stale draft (new clause or
+    new strategy on the same thread) is never served.
+    """
+    return hashlib.sha256(f"{clause}\x00{reasoning}".encode("utf-8")).hexdigest()
+
+
+class SpeculativeDrafts:
+    """
+    Redlines drafted in the background while a thread waits for human approval.
+
+    At most one speculation per thread. Drafts live in this process only: a resume
+    served by another worker (or after a restart) simply drafts as usual.
+
+    Attributes:
+        hits (int): Resumes served by a speculative draft.
+        misses (int): Drafting runs that found no usable speculation.
+    """
+
+    def __init__(self, max_threads: int = 256):
+        self.max_threads = max_threads
+        self.hits = 0
+        self.misses = 0
+        self._drafts: "OrderedDict[str, Tuple[str, asyncio.Task]]" = OrderedDict()
+
+    def start(self, thread_id: str, fingerprint: str, draft: Callable[[], Awaitable[str]]) -> bool:
+        """
+        Start drafting in the background unless the same draft is already running.
+
+        Returns:
+            bool: True if a new speculation was started.
+        """
+        current = self._drafts.get(thread_id)
+        if current is not None and current[0] == fingerprint:
+            return False
+        self.discard(thread_id)
+        self._drafts[thread_id] = (fingerprint, asyncio.get_running_loop().create_task(draft()))
+        while len(self._drafts) > self.max_threads:
+            oldest = next(iter(self._drafts))
+            self.discard(oldest)
+        logger.info(f"Speculative drafting started for thread {thread_id}")
+        return True
+
+    async def take(self, thread_id: str, fingerprint: str) -> Optional[str]:
+        """
+        Claim the thread's draft (waiting for it if still running). Returns None if
+        there is none, it was made from other inputs, or it failed.
+        """
+        current = self._drafts.pop(thread_id, None)
+        if current is None or current[0] != fingerprint:
+            if current is not None:
+                current[1].cancel()
+            self.misses += 1
+            return None
+        try:
+            text = await current[1]
+        except Exception as e:
+            logger.warning(f"Speculative draft for thread {thread_id} failed: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+
+    def discard(self, thread_id: str):
+        current = self._drafts.pop(thread_id, None)
+        if current is not None:
+            current[1].cancel()
+
+
+speculative_drafts = SpeculativeDrafts()
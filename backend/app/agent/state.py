@@ -1,20 +1,41 @@
 from typing import TypedDict, List, Optional, Annotated
-import operator
 from uuid import UUID
 from app.llm import LLMMessage
 
+# A node returning messages that start with this marker replaces the window instead of appending
+RESET_ROLE = "__reset__"
+
+def merge_messages(left: Optional[List[LLMMessage]], right: Optional[List[LLMMessage]]) -> List[LLMMessage]:
+    """
+    Reducer for NegotiationState.messages: appends, unless the update starts with
+    a RESET_ROLE marker, in which case the rest of the update replaces the list.
+    """
+    right = right or []
+    if right and right[0].role == RESET_ROLE:
+        return list(right[1:])
+    return (left or []) + right
+
+def reset_messages(messages: List[LLMMessage]) -> List[LLMMessage]:
+    """
+    Node update that replaces the message window with `messages`.
+    """
+    return [LLMMessage(role=RESET_ROLE, content="")] + list(messages)
+
 class NegotiationState(TypedDict):
     contract_id: str # UUID string
     supplier_id: str # UUID string
     current_clause_text: str
+    clause_terms: Optional[dict] # Normalized terms of a stored ContractClause, if any
     
     # Context (Populated by Agents)
     # We store these as dicts (dumped models) to be serializable
     policy_analysis: Optional[dict] 
     risk_profile: Optional[dict]
     
-    # Chat History
-    messages: Annotated[List[LLMMessage], operator.add]
+    # Chat History: only the recent window; older messages live in NegotiationMessage rows
+    messages: Annotated[List[LLMMessage], merge_messages]
+    conversation_summary: Optional[str] # Running summary of the archived messages
+    archived_message_count: int # Transcript position of messages[0]
     
     # Decisions
     strategy_decision: Optional[str] # "ACCEPT", "REJECT", "COUNTER", "NEEDS_HUMAN"
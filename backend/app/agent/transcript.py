@@ -0,0 +1,285 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+from sqlalchemy import select
+from sqlalchemy.exc import DataError, IntegrityError, StatementError
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.llm import LLMMessage
+from app.models import Negotiation, NegotiationMessage
+
+logger = logging.getLogger(__name__)
+
+# Graph message roles <-> NegotiationMessage.sender / .type
+ROLE_SENDERS = {"user": "supplier", "agent": "company", "assistant": "company"}
+ROLE_TYPES = {"user": "proposal", "agent": "response", "assistant": "response"}
+SENDER_ROLES = {"supplier": "user", "company": "agent"}
+DECISION_TYPE = "decision"
+
+
+def negotiation_id_for_thread(thread_id: str) -> UUID:
+    """
+    Negotiation row backing a graph thread. Thread ids are normally Negotiation ids;
+    free-form ids ("default_thread") map to a stable derived UUID.
+    """
+    try:
+        return UUID(thread_id)
+    except ValueError:
+        return uuid5(NAMESPACE_URL, f"negotiation-thread:{thread_id}")
+
+
+def message_dict(row: NegotiationMessage) -> Dict[str, object]:
+    """
+    A stored message in the graph's {role, content} shape.
+    """
+    return {
+        "role": SENDER_ROLES.get(row.sender, row.sender),
+        "content": row.content,
+        "type": row.type,
+        "sequence": row.sequence,
+        "timestamp": row.timestamp.isoformat(),
+    }
+
+
+class TranscriptRecord(NamedTuple):
+    thread_id: str
+    contract_id: str
+    message: Optional[NegotiationMessage] = None
+    # Negotiation column updates (strategy, status)
+    updates: Optional[Dict[str, str]] = None
+    # Failed writes so far
+    attempts: int = 0
+
+
+def _is_permanent(error: Exception) -> bool:
+    """
+    Errors that retrying cannot fix: bad values (a non-UUID contract id) or rows the
+    database rejects (a contract that no longer exists).
+    """
+    if isinstance(error, (ValueError, TypeError, IntegrityError, DataError)):
+        return True
+    return isinstance(error, StatementError) and isinstance(error.orig, (ValueError, TypeError))
+
+
+class TranscriptWriter:
+    """
+    Buffers negotiation messages and decisions and writes them in batches, off the
+    request path.
+
+    `record_*` only appends to an in-memory buffer. A flush runs once the buffer
+    holds `batch_size` records or `flush_interval` seconds after the first buffered
+    record, whichever comes first. Records of a failed flush are kept for the
+    next one (up to `max_buffer` records), unless the failure is permanent or they
+    have failed `max_attempts` times: those are logged and dropped, so one poisoned
+    thread cannot keep every later flush failing.
+
+    Attributes:
+        written (int): Records persisted (this process).
+        dropped (int): Records discarded because the buffer overflowed.
+        dead_lettered (int): Records discarded because they could not be written.
+    """
+
+    def __init__(self, session_factory, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None, max_buffer: Optional[int] = None,
+                 max_attempts: Optional[int] = None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.TRANSCRIPT_BATCH_SIZE
+        self.flush_interval = settings.TRANSCRIPT_FLUSH_INTERVAL_SECONDS if flush_interval is None else flush_interval
+        self.max_buffer = max_buffer or self.batch_size * 20
+        self.max_attempts = max_attempts or settings.TRANSCRIPT_MAX_WRITE_ATTEMPTS
+        self.written = 0
+        self.dropped = 0
+        self.dead_lettered = 0
+        self._buffer: List[TranscriptRecord] = []
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    # --- Recording (synchronous, never touches the DB) ---
+
+    def record_messages(self, thread_id: str, contract_id: str, messages: Sequence[LLMMessage], start_sequence: int):
+        now = datetime.now(timezone.utc)
+        negotiation_id = negotiation_id_for_thread(thread_id)
+        for i, message in enumerate(messages):
+            self._append(TranscriptRecord(thread_id, contract_id, NegotiationMessage(
+                negotiation_id=negotiation_id,
+                content=message.content,
+                type=ROLE_TYPES.get(message.role, "response"),
+                sender=ROLE_SENDERS.get(message.role, message.role),
+                sequence=start_sequence + i,
+                timestamp=now,
+            )))
+
+    def record_decision(self, thread_id: str, contract_id: str, strategy: Optional[str] = None,
+                        reasoning: Optional[str] = None, status: Optional[str] = None):
+        updates = {k: v for k, v in (("strategy", strategy), ("status", status)) if v is not None}
+        message = None
+        if strategy is not None:
+            message = NegotiationMessage(
+                negotiation_id=negotiation_id_for_thread(thread_id),
+                content=f"{strategy}: {reasoning or ''}".strip(),
+                type=DECISION_TYPE,
+                sender="company",
+                timestamp=datetime.now(timezone.utc),
+            )
+        self._append(TranscriptRecord(thread_id, contract_id, message, updates or None))
+
+    def _append(self, record: TranscriptRecord):
+        self._buffer.append(record)
+        if len(self._buffer) > self.max_buffer:
+            overflow = len(self._buffer) - self.max_buffer
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.error(f"Transcript buffer full; dropped {overflow} oldest records")
+        if len(self._buffer) >= self.batch_size:
+            self._spawn(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = self._spawn(self._flush_later())
+
+    def _spawn(self, coro) -> Optional[asyncio.Task]:
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()  # No loop (sync caller); the next flush picks the records up
+            return None
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    # --- Writing ---
+
+    async def flush(self, thread_id: Optional[str] = None) -> bool:
+        """
+        Write everything buffered so far, normally in one transaction. If that fails,
+        each negotiation is retried on its own so one bad thread cannot block the rest.
+
+        Args:
+            thread_id: Only report on this thread's records (all records are written).
+
+        Returns:
+            bool: False if some records (of `thread_id`, if given) were not written.
+                Records that failed transiently stay buffered for the next flush.
+        """
+        async with self._flush_lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return True
+            try:
+                await self._write(batch)
+                self.written += len(batch)
+                return True
+            except Exception as e:
+                logger.warning(f"Transcript flush of {len(batch)} records failed, retrying per thread: {e}")
+
+            groups: Dict[UUID, List[TranscriptRecord]] = {}
+            for record in batch:
+                groups.setdefault(negotiation_id_for_thread(record.thread_id), []).append(record)
+            failed: List[TranscriptRecord] = []
+            retry: List[TranscriptRecord] = []
+            for negotiation_id, records in groups.items():
+                try:
+                    await self._write(records)
+                    self.written += len(records)
+                except Exception as e:
+                    failed.extend(records)
+                    records = [r._replace(attempts=r.attempts + 1) for r in records]
+                    if _is_permanent(e) or max(r.attempts for r in records) >= self.max_attempts:
+                        self._dead_letter(negotiation_id, records, e)
+                    else:
+                        logger.error(f"Transcript write for negotiation {negotiation_id} failed, will retry: {e}")
+                        retry.extend(records)
+            self._buffer = retry + self._buffer
+            if thread_id is not None:
+                return not any(r.thread_id == thread_id for r in failed)
+            return not failed
+
+    def _dead_letter(self, negotiation_id: UUID, records: List[TranscriptRecord], error: Exception):
+        self.dead_lettered += len(records)
+        logger.error(
+            f"Dropping {len(records)} transcript records of negotiation {negotiation_id} "
+            f"(thread {records[0].thread_id}, contract {records[0].contract_id}) after "
+            f"{max(r.attempts for r in records)} failed writes: {error}"
+        )
+        for record in records:
+            if record.message is not None:
+                logger.error(f"Dropped transcript {record.message.type} #{record.message.sequence}: "
+                             f"{record.message.content!r}")
+
+    async def _write(self, batch: List[TranscriptRecord]):
+        contract_ids: Dict[UUID, str] = {}
+        for record in batch:
+            contract_ids.setdefault(negotiation_id_for_thread(record.thread_id), record.contract_id)
+
+        async with self.session_factory() as session:
+            result = await session.execute(select(Negotiation).where(Negotiation.id.in_(list(contract_ids))))
+            negotiations = {n.id: n for n in result.scalars().all()}
+            for negotiation_id, contract_id in contract_ids.items():
+                if negotiation_id not in negotiations:
+                    negotiation = Negotiation(id=negotiation_id, contract_id=UUID(contract_id),
+                                              created_at=datetime.now(timezone.utc))
+                    session.add(negotiation)
+                    negotiations[negotiation_id] = negotiation
+
+            messages = []
+            for record in batch:
+                if record.message is not None:
+                    messages.append(record.message)
+                for field, value in (record.updates or {}).items():
+                    setattr(negotiations[negotiation_id_for_thread(record.thread_id)], field, value)
+            session.add_all(messages)
+            await session.commit()
+
+    async def close(self):
+        """
+        Flush pending records. Called on shutdown.
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        await self.flush()
+
+
+_writer: Optional[TranscriptWriter] = None
+
+
+def get_transcript_writer() -> TranscriptWriter:
+    """
+    Process-wide writer on the application's session factory.
+    """
+    global _writer
+    if _writer is None:
+        from app.database import async_session
+        _writer = TranscriptWriter(async_session)
+    return _writer
+
+
+async def load_transcript(
+    session: Session,
+    thread_id: str,
+    since: Optional[datetime] = None,
+    before_sequence: Optional[int] = None,
+    include_decisions: bool = True,
+    limit: Optional[int] = None,
+) -> List[NegotiationMessage]:
+    """
+    Stored transcript of a thread in order, served by the (negotiation_id, timestamp) index.
+    """
+    query = select(NegotiationMessage).where(NegotiationMessage.negotiation_id == negotiation_id_for_thread(thread_id))
+    if since is not None:
+        query = query.where(NegotiationMessage.timestamp > since)
+    if before_sequence is not None:
+        query = query.where(NegotiationMessage.sequence < before_sequence)
+    if not include_decisions:
+        query = query.where(NegotiationMessage.type != DECISION_TYPE)
+    query = query.order_by(NegotiationMessage.timestamp, NegotiationMessage.sequence)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await session.execute(query)
+    return list(result.scalars().all())
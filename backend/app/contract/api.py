@@ -1,7 +1,249 @@
-from fastapi import APIRouter
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from sqlalchemy import func, select
+from sqlmodel import Session
+from app.contract.cache import get_parse_cache
+from app.contract.clauses import CLAUSE_CATEGORIES, ClauseExtractor
+from app.contract.parser import (
+    MAX_FILE_SIZE_BYTES, SNIFF_BYTES, DocumentParsingError, FileSizeLimitExceeded, SecurityCheckError,
+    detect_parser, spool_upload
+)
+from app.core.config import settings
+from app.core.embeddings import active_embedding_space
+from app.core.rag import RAGService
+from app.core.search import SearchFilters
+from app.database import async_session, get_session
+from app.models import Contract, ContractChunk, ContractClause
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["contract"])
 
+_parse_slots = asyncio.Semaphore(settings.UPLOAD_MAX_CONCURRENT_PARSES)
+
 @router.get("/")
 async def list_contracts():
     return {"message": "Contract module active"}
+
+@router.get("/search")
+async def search_contracts(
+    q: str,
+    limit: int = 5,
+    contract_id: Optional[UUID] = None,
+    supplier_id: Optional[UUID] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    session: Session = Depends(get_session)
+):
+    """
+    Hybrid (keyword + semantic) search over contract chunks, optionally scoped
+    to one contract, one supplier and/or a contract creation date range.
+    """
+    filters = SearchFilters(
+        contract_id=contract_id, supplier_id=supplier_id,
+        created_after=created_after, created_before=created_before
+    )
+    chunks = await RAGService().hybrid_search(session, q, limit=limit, filters=filters)
+    return [
+        {"id": str(c.id), "contract_id": str(c.contract_id), "chunk_index": c.chunk_index, "content": c.content}
+        for c in chunks
+    ]
+
+@router.post("/upload")
+async def upload_contract(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    title: str,
+    filename: str = "contract",
+    supplier_id: Optional[UUID] = None,
+    session: Session = Depends(get_session)
+):
+    """
+    Upload a contract (PDF, DOCX, HTML or plain text) as the raw request body,
+    extract its text, store it and embed its chunks. The format is detected from
+    the file's magic bytes, not from the filename or Content-Type.
+
+    The body is streamed to a spooled temp file, so memory per upload stays bounded
+    by the spool size; oversized (413) or unsupported (415) bodies are rejected while
+    streaming. Text extraction is limited to UPLOAD_MAX_CONCURRENT_PARSES at a time.
+
+    The body is hashed while it streams. A file this supplier uploaded before returns
+    the existing contract without parsing, chunking or embedding ("duplicate": true).
+    The same file from another supplier becomes a new contract that reuses the other
+    copy's chunks and embeddings; a file whose parse is still in the on-disk parse
+    cache skips parsing.
+
+    Clause extraction may call the LLM, so it runs after the response is sent; the
+    clauses appear under GET /{contract_id}/clauses once it finishes.
+    """
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_FILE_SIZE_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds size limit of {MAX_FILE_SIZE_BYTES} bytes.")
+
+    digest = hashlib.sha256()
+    try:
+        spool = await spool_upload(request.stream(), filename, digest=digest)
+        with spool:
+            content_hash = digest.hexdigest()
+            existing = await _find_duplicate(session, content_hash, supplier_id)
+            if existing is not None:
+                return existing
+            parser = detect_parser(spool.read(SNIFF_BYTES), filename)
+            async with _parse_slots:
+                document = await get_parse_cache().get_or_parse(content_hash, parser, spool, filename)
+    except FileSizeLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except SecurityCheckError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except DocumentParsingError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    text = document.text
+
+    contract = Contract(title=title, supplier_id=supplier_id, content_text=text, content_hash=content_hash,
+                        created_at=datetime.now(timezone.utc))
+    session.add(contract)
+    await session.commit()
+    await session.refresh(contract)
+
+    if not await _copy_chunks(session, content_hash, contract.id):
+        await RAGService().ingest_contract(session, contract.id, text)
+    background_tasks.add_task(_extract_clauses, contract.id)
+    logger.info(f"Uploaded contract {contract.id} from {filename} ({len(text)} chars)")
+    return {
+        "id": str(contract.id),
+        "title": contract.title,
+        "format": document.format,
+        "characters": len(text),
+        "segments": len(document.segments),
+        "clause_extraction": "queued",
+        "duplicate": False,
+    }
+
+async def _extract_clauses(contract_id: UUID):
+    """
+    Background clause extraction for an uploaded contract, in its own session (the
+    request's is closed by the time this runs).
+    """
+    try:
+        async with async_session() as session:
+            contract = await session.get(Contract, contract_id)
+            if contract is None:
+                return
+            clauses = await ClauseExtractor().extract(session, contract)
+        logger.info(f"Extracted {len(clauses)} clauses from contract {contract_id}")
+    except Exception as e:
+        logger.error(f"Clause extraction failed for contract {contract_id}: {e}")
+
+def _clause_dict(clause: ContractClause) -> dict:
+    return {
+        "id": str(clause.id),
+        "clause_index": clause.clause_index,
+        "number": clause.number,
+        "heading": clause.heading,
+        "category": clause.category,
+        "classified_by": clause.classified_by,
+        "start_offset": clause.start_offset,
+        "end_offset": clause.end_offset,
+        "terms": clause.terms,
+        "content": clause.content,
+    }
+
+@router.get("/{contract_id}/clauses")
+async def list_clauses(
+    contract_id: UUID,
+    category: Optional[str] = None,
+    session: Session = Depends(get_session)
+):
+    """
+    Clauses extracted from a contract, in document order, optionally filtered by category.
+    """
+    if category is not None and category not in CLAUSE_CATEGORIES:
+        raise HTTPException(status_code=422, detail=f"Unknown category. Expected one of: {', '.join(CLAUSE_CATEGORIES)}")
+    query = select(ContractClause).where(ContractClause.contract_id == contract_id)
+    if category is not None:
+        query = query.where(ContractClause.category == category)
+    result = await session.execute(query.order_by(ContractClause.clause_index))
+    return [_clause_dict(c) for c in result.scalars().all()]
+
+@router.post("/{contract_id}/clauses")
+async def extract_clauses(contract_id: UUID, session: Session = Depends(get_session)):
+    """
+    (Re-)run clause extraction for a contract, replacing its stored clauses.
+    """
+    contract = await session.get(Contract, contract_id)
+    if contract is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    clauses = await ClauseExtractor().extract(session, contract)
+    return [_clause_dict(c) for c in clauses]
+
+async def _find_duplicate(session: Session, content_hash: str, supplier_id: Optional[UUID] = None) -> Optional[dict]:
+    """
+    Return the upload response for a copy of this file the same supplier already
+    uploaded, if any. Copies under other suppliers are separate contracts: reusing
+    one would tie this supplier's negotiations to theirs.
+
+    A copy whose chunks are missing (failed ingestion, embedding model change) is
+    re-chunked from its stored text, which still skips parsing.
+    """
+    same_supplier = Contract.supplier_id.is_(None) if supplier_id is None else Contract.supplier_id == supplier_id
+    result = await session.execute(
+        select(Contract).where(Contract.content_hash == content_hash, same_supplier)
+        .order_by(Contract.created_at).limit(1)
+    )
+    contract = result.scalars().first()
+    if contract is None:
+        return None
+
+    chunks = await session.execute(
+        select(func.count()).select_from(ContractChunk).where(
+            ContractChunk.contract_id == contract.id,
+            ContractChunk.embedding_model == active_embedding_space().key,
+        )
+    )
+    if not chunks.scalar() and contract.content_text:
+        await RAGService().ingest_contract(session, contract.id, contract.content_text)
+    logger.info(f"Upload matches contract {contract.id} (sha256 {content_hash[:12]}); reusing it")
+    return {
+        "id": str(contract.id),
+        "title": contract.title,
+        "characters": len(contract.content_text or ""),
+        "duplicate": True,
+    }
+
+async def _copy_chunks(session: Session, content_hash: str, contract_id: UUID) -> int:
+    """
+    Copy the active-space chunks of another contract with the same file into
+    `contract_id`, so an identical upload under another supplier is not re-embedded.
+
+    Returns:
+        int: Chunks copied; 0 if no other copy has any, and the caller embeds.
+    """
+    space = active_embedding_space().key
+    source = await session.execute(
+        select(ContractChunk.contract_id)
+        .join(Contract, Contract.id == ContractChunk.contract_id)
+        .where(Contract.content_hash == content_hash, Contract.id != contract_id,
+               ContractChunk.embedding_model == space)
+        .limit(1)
+    )
+    source_id = source.scalar()
+    if source_id is None:
+        return 0
+    result = await session.execute(
+        select(ContractChunk).where(ContractChunk.contract_id == source_id, ContractChunk.embedding_model == space)
+    )
+    chunks = result.scalars().all()
+    for chunk in chunks:
+        session.add(ContractChunk(
+            contract_id=contract_id, chunk_index=chunk.chunk_index, content=chunk.content,
+            embedding=chunk.embedding, embedding_blob=chunk.embedding_blob, embedding_q=chunk.embedding_q,
+            embedding_model=chunk.embedding_model,
+        ))
+    await session.commit()
+    logger.info(f"Reused {len(chunks)} chunks of contract {source_id} for contract {contract_id}")
+    return len(chunks)
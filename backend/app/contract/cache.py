@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from typing import BinaryIO, Dict, Optional
+
+from app.contract.parser import AbstractParser, ParsedDocument
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(file: BinaryIO) -> str:
+    """
+    Content hash of a seekable file, read in chunks. The file is rewound afterwards.
+    """
+    file.seek(0)
+    digest = hashlib.file_digest(file, "sha256").hexdigest()
+    file.seek(0)
+    return digest
+
+
+class ParsedDocumentCache:
+    """
+    On-disk cache of parsed documents (text + page/paragraph offsets), keyed by the
+    SHA-256 of the original file.
+
+    One JSON file per entry; a hit refreshes the file's mtime, and once the directory
+    grows past `max_bytes` the least recently used entries are evicted. Writes go
+    through a temp file + rename, so several processes (API workers, bulk-ingestion
+    workers) can share a directory.
+
+    Attributes:
+        hits (int): Lookups served from the cache (this process).
+        misses (int): Lookups that had to parse.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # Lazily scanned; approximate across processes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, f"{content_hash}.json")
+
+    def get(self, content_hash: str) -> Optional[ParsedDocument]:
+        path = self._path(content_hash)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = ParsedDocument.model_validate_json(f.read())
+            os.utime(path)  # LRU: mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            self._discard(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return document
+
+    def put(self, content_hash: str, document: ParsedDocument):
+        path = self._path(content_hash)
+        payload = document.model_dump_json().encode("utf-8")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(payload)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    async def get_or_parse(self, content_hash: str, parser: AbstractParser, file: BinaryIO,
+                           filename: str) -> ParsedDocument:
+        """
+        Return the cached parse of `content_hash`, parsing `file` on a miss. Cache reads,
+        writes and eviction scans run in a thread, off the event loop.
+        """
+        document = await asyncio.to_thread(self.get, content_hash)
+        if document is None:
+            document = await parser.parse_document(file, filename)
+            await asyncio.to_thread(self.put, content_hash, document)
+        return document
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "bytes": self._scan_size(), "max_bytes": self.max_bytes}
+
+    def _entries(self):
+        with os.scandir(self.directory) as it:
+            return [e for e in it if e.name.endswith(".json") and e.is_file()]
+
+    def _scan_size(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _evict(self):
+        # Evict down to 90% so a full cache doesn't rescan on every put
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        size = sum(e.stat().st_size for e in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for entry in entries:
+            if size <= target:
+                break
+            size -= entry.stat().st_size
+            self._discard(entry.path)
+            evicted += 1
+        self._size = size
+        logger.info(f"Parse cache evicted {evicted} entries ({size} bytes kept)")
+
+    @staticmethod
+    def _discard(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_cache: Optional[ParsedDocumentCache] = None
+
+
+def get_parse_cache() -> ParsedDocumentCache:
+    """
+    Process-wide cache configured by PARSE_CACHE_DIR / PARSE_CACHE_MAX_BYTES.
+    """
+    global _cache
+    if _cache is None:
+        _cache = ParsedDocumentCache(settings.PARSE_CACHE_DIR, settings.PARSE_CACHE_MAX_BYTES)
+    return _cache
@@ -1,14 +1,37 @@
 from abc import ABC, abstractmethod
+import asyncio
+import codecs
+import html.parser
 import io
 import logging
-from typing import Optional
+import mmap
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import AsyncIterator, BinaryIO, List, Optional
 import pypdf
+from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
 # Security Constants
 MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
-ALLOWED_MIME_TYPES = {"application/pdf"}
+# Decompressed size cap for zip-based formats (DOCX), against zip bombs
+MAX_UNCOMPRESSED_BYTES = 10 * MAX_FILE_SIZE_BYTES
+ALLOWED_MIME_TYPES = {
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/html",
+    "text/plain",
+}
+PDF_SIGNATURE = b"%PDF"
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+# Leading bytes inspected to pick a parser
+SNIFF_BYTES = 1024
+# Streaming uploads: bytes kept in memory before spooling to disk
+SPOOL_MAX_MEMORY_BYTES = 1024 * 1024  # 1 MB
+READ_CHUNK_BYTES = 64 * 1024
 
 class DocumentParsingError(Exception):
     """Raised when document parsing fails."""
@@ -22,15 +45,83 @@ class SecurityCheckError(DocumentParsingError):
     """Raised when the file fails security validation checks."""
     pass
 
+class DocumentSegment(BaseModel):
+    """
+    Location of a page or paragraph within the extracted text.
+    """
+    kind: str  # "page" or "paragraph"
+    index: int  # Page / paragraph number in the source document (0-based)
+    start: int  # Character offsets into ParsedDocument.text
+    end: int
+
+class ParsedDocument(BaseModel):
+    format: str
+    text: str
+    segments: List[DocumentSegment] = []
+
+class _SegmentWriter:
+    """
+    Joins page/paragraph texts with newlines while recording their offsets.
+    """
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.parts: List[str] = []
+        self.segments: List[DocumentSegment] = []
+        self.offset = 0
+
+    def add(self, text: str, index: int):
+        if not text:
+            return
+        if self.parts:
+            self.parts.append("\n")
+            self.offset += 1
+        self.parts.append(text)
+        self.segments.append(DocumentSegment(kind=self.kind, index=index, start=self.offset,
+                                             end=self.offset + len(text)))
+        self.offset += len(text)
+
+    def document(self, fmt: str) -> ParsedDocument:
+        return ParsedDocument(format=fmt, text="".join(self.parts), segments=self.segments)
+
 class AbstractParser(ABC):
     """
     Abstract base class for all document parsers.
-    
+
     This interface ensures that all parser implementations provide a consistent
-    method for converting raw file content into text.
+    method for converting raw file content into text. Size and signature checks
+    are shared; subclasses implement `matches` and the (blocking) `_extract`.
     """
+    format: str = ""
+
+    @abstractmethod
+    def matches(self, head: bytes) -> bool:
+        """
+        Whether the leading bytes of a file (up to SNIFF_BYTES) look like this format.
+        """
+        pass
 
     @abstractmethod
+    def _extract(self, file: BinaryIO, size: int, filename: str) -> ParsedDocument:
+        """
+        Extract text and segment offsets from a validated, rewound file.
+        Runs in a worker thread.
+        """
+        pass
+
+    def _validate(self, file: BinaryIO, filename: str) -> int:
+        size = file.seek(0, io.SEEK_END)
+        if size > MAX_FILE_SIZE_BYTES:
+            msg = f"File {filename} exceeds size limit of {MAX_FILE_SIZE_BYTES} bytes."
+            logger.warning(msg)
+            raise FileSizeLimitExceeded(msg)
+        file.seek(0)
+        if not self.matches(file.read(SNIFF_BYTES)):
+            msg = f"File {filename} does not contain a valid {self.format.upper()} signature."
+            logger.warning(msg)
+            raise SecurityCheckError(msg)
+        file.seek(0)
+        return size
+
     async def parse(self, file_content: bytes, filename: str) -> str:
         """
         Parse the given binary file content and return the extracted text.
@@ -47,55 +138,51 @@ class AbstractParser(ABC):
             FileSizeLimitExceeded: If the content is too large.
             SecurityCheckError: If the content appears malicious.
         """
-        pass
-
-class PDFParser(AbstractParser):
-    """
-    Concrete implementation for parsing PDF documents using pypdf.
-    
-    Includes security validations for file size and basic integrity.
-    """
+        return (await self.parse_document(io.BytesIO(file_content), filename)).text
 
-    async def parse(self, file_content: bytes, filename: str) -> str:
+    async def parse_file(self, file: BinaryIO, filename: str) -> str:
         """
-        Parses a PDF file from bytes.
-
-        Security Measures:
-            - Checks file size against MAX_FILE_SIZE_BYTES.
-            - Validates PDF header signature (%PDF).
-            - Uses robust pypdf reading to report form values + text.
-
-        Args:
-            file_content (bytes): The raw PDF bytes.
-            filename (str): Debug info.
+        Parse a seekable file (e.g. from `spool_upload`) without reading it into memory.
+        """
+        return (await self.parse_document(file, filename)).text
 
-        Returns:
-            str: Extracted text from all pages, concatenated with newlines.
+    async def parse_document(self, file: BinaryIO, filename: str) -> ParsedDocument:
+        """
+        Parse a seekable file into text plus page/paragraph offsets.
 
         Raises:
-            FileSizeLimitExceeded: If len(file_content) > 10MB.
-            SecurityCheckError: If file not a valid PDF (header check).
-            DocumentParsingError: If pypdf fails to read the stream.
+            DocumentParsingError: If the document is malformed or unreadable.
+            FileSizeLimitExceeded: If the file is too large.
+            SecurityCheckError: If the signature does not match the format.
         """
-        # 1. Size Check
-        if len(file_content) > MAX_FILE_SIZE_BYTES:
-            msg = f"File {filename} exceeds size limit of {MAX_FILE_SIZE_BYTES} bytes."
-            logger.warning(msg)
-            raise FileSizeLimitExceeded(msg)
+        size = self._validate(file, filename)
+        return await asyncio.to_thread(self._extract, file, size, filename)
+
+class PDFParser(AbstractParser):
+    """
+    Concrete implementation for parsing PDF documents using pypdf.
+
+    Includes security validations for file size and basic integrity.
+    Files larger than the in-memory spool are memory-mapped, so pypdf pages
+    through the OS page cache instead of a heap copy.
+    """
+    format = "pdf"
 
-        # 2. Magic Number Check (Basic Security)
+    def matches(self, head: bytes) -> bool:
         # PDF files must start with %PDF
-        if not file_content.startswith(b"%PDF"):
-            msg = f"File {filename} does not contain valid PDF signature."
-            logger.warning(msg)
-            raise SecurityCheckError(msg)
+        return head.startswith(PDF_SIGNATURE)
 
-        text_content = []
+    def _extract(self, file: BinaryIO, size: int, filename: str) -> ParsedDocument:
+        if size > SPOOL_MAX_MEMORY_BYTES and _has_fileno(file):
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self._read_pages(mapped, filename)
+        return self._read_pages(file, filename)
+
+    def _read_pages(self, stream, filename: str) -> ParsedDocument:
+        writer = _SegmentWriter("page")
         try:
-            # Create a file-like object
-            stream = io.BytesIO(file_content)
             reader = pypdf.PdfReader(stream)
-            
+
             # Check for encryption (optional policy: reject encrypted?)
             if reader.is_encrypted:
                 # We could try to decrypt with empty password, but usually it fails.
@@ -105,7 +192,7 @@ class PDFParser(AbstractParser):
             for i, page in enumerate(reader.pages):
                 extracted = page.extract_text()
                 if extracted:
-                    text_content.append(extracted)
+                    writer.add(extracted, i)
                 else:
                     logger.debug(f"Page {i} in {filename} yielded no text.")
 
@@ -113,4 +200,269 @@ class PDFParser(AbstractParser):
             logger.error(f"Failed to parse PDF {filename}: {e}")
             raise DocumentParsingError(f"PDF parsing failed: {str(e)}")
 
-        return "\n".join(text_content)
+        return writer.document(self.format)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+class DOCXParser(AbstractParser):
+    """
+    Parses Word (OOXML) documents by streaming word/document.xml out of the zip.
+
+    Tracked changes are read in their accepted form: inserted runs are kept and
+    deleted runs (w:delText) are dropped. Macro-enabled documents are rejected.
+    """
+    format = "docx"
+
+    def matches(self, head: bytes) -> bool:
+        return head.startswith(ZIP_SIGNATURE)
+
+    def _extract(self, file: BinaryIO, size: int, filename: str) -> ParsedDocument:
+        writer = _SegmentWriter("paragraph")
+        try:
+            with zipfile.ZipFile(file) as archive:
+                entries = archive.infolist()
+                names = {e.filename for e in entries}
+                if "word/document.xml" not in names:
+                    raise DocumentParsingError(f"{filename} is not a Word document.")
+                if "word/vbaProject.bin" in names:
+                    raise SecurityCheckError(f"{filename} contains macros.")
+                if sum(e.file_size for e in entries) > MAX_UNCOMPRESSED_BYTES:
+                    raise FileSizeLimitExceeded(f"{filename} expands beyond {MAX_UNCOMPRESSED_BYTES} bytes.")
+
+                with archive.open("word/document.xml") as xml:
+                    self._read_paragraphs(xml, writer)
+        except DocumentParsingError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to parse DOCX {filename}: {e}")
+            raise DocumentParsingError(f"DOCX parsing failed: {str(e)}")
+        return writer.document(self.format)
+
+    @staticmethod
+    def _read_paragraphs(xml: BinaryIO, writer: _SegmentWriter):
+        parts: List[str] = []
+        index = 0
+        in_run = 0
+        ancestors: List[ET.Element] = []
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if tag == _W + "r":
+                in_run += 1 if event == "start" else -1
+            if event == "start":
+                ancestors.append(elem)
+                continue
+            ancestors.pop()
+            if ancestors and ancestors[-1].tag == _W + "body":
+                # Detach finished top-level blocks (paragraphs, tables) so the tree
+                # never holds more than the block being read
+                ancestors[-1].remove(elem)
+            if tag == _W + "t":
+                parts.append(elem.text or "")
+            elif in_run and tag == _W + "tab":  # w:tab outside runs is a tab-stop definition
+                parts.append("\t")
+            elif in_run and tag in (_W + "br", _W + "cr"):
+                parts.append("\n")
+            elif tag == _W + "p":
+                writer.add("".join(parts).strip(), index)
+                parts = []
+                index += 1
+                elem.clear()  # Paragraphs nested in tables go when their table is detached
+
+class _HTMLTextExtractor(html.parser.HTMLParser):
+    BLOCK_TAGS = {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "footer",
+        "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "ol", "p", "pre", "section",
+        "table", "td", "th", "tr", "ul",
+    }
+    SKIP_TAGS = {"head", "noscript", "script", "style", "template"}
+
+    def __init__(self, writer: _SegmentWriter):
+        super().__init__(convert_charrefs=True)
+        self.writer = writer
+        self.buffer: List[str] = []
+        self.index = 0
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skipping += 1
+        elif tag in self.BLOCK_TAGS:
+            self.flush()
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.flush()
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.buffer.append(data)
+
+    def flush(self):
+        text = " ".join("".join(self.buffer).split())
+        self.buffer = []
+        if text:
+            self.writer.add(text, self.index)
+            self.index += 1
+
+class HTMLParser(AbstractParser):
+    """
+    Extracts visible text from HTML, one paragraph per block element.
+    Scripts, styles and <head> are skipped. The file is decoded and fed incrementally.
+    """
+    format = "html"
+    _MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body")
+
+    def matches(self, head: bytes) -> bool:
+        start = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+        return any(start.startswith(m) for m in self._MARKERS)
+
+    def _extract(self, file: BinaryIO, size: int, filename: str) -> ParsedDocument:
+        writer = _SegmentWriter("paragraph")
+        extractor = _HTMLTextExtractor(writer)
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace")
+        try:
+            while chunk := text.read(READ_CHUNK_BYTES):
+                extractor.feed(chunk)
+            extractor.close()
+            extractor.flush()
+        except Exception as e:
+            logger.error(f"Failed to parse HTML {filename}: {e}")
+            raise DocumentParsingError(f"HTML parsing failed: {str(e)}")
+        finally:
+            text.detach()  # Leave the caller's file open
+        return writer.document(self.format)
+
+class TextParser(AbstractParser):
+    """
+    Plain UTF-8 prose; paragraphs are separated by blank lines.
+
+    As the fallback format it only accepts text that reads like a document: no NUL or
+    other control bytes, no leading JSON/XML/markup, and enough whitespace and letters
+    to be words rather than an encoded payload.
+    """
+    format = "text"
+    _STRUCTURED_PREFIXES = ("{", "[", "<")
+    _CONTROL_CHARS = frozenset(chr(c) for c in range(32) if chr(c) not in "\t\n\r\f") | {"\x7f"}
+    MIN_WHITESPACE_RATIO = 0.05   # Of all sniffed characters
+    MIN_LETTER_RATIO = 0.5        # Of the non-whitespace characters
+
+    def matches(self, head: bytes) -> bool:
+        if b"\x00" in head:
+            return False
+        try:
+            # The sniffed prefix may end mid-character
+            sample = codecs.getincrementaldecoder("utf-8-sig")().decode(head, final=False)
+        except UnicodeDecodeError:
+            return False
+        stripped = sample.lstrip()
+        if not stripped or stripped.startswith(self._STRUCTURED_PREFIXES):
+            return False
+        if any(ch in self._CONTROL_CHARS for ch in sample):
+            return False
+        whitespace = sum(ch.isspace() for ch in sample)
+        letters = sum(ch.isalpha() for ch in sample)
+        return (whitespace >= self.MIN_WHITESPACE_RATIO * len(sample)
+                and letters >= self.MIN_LETTER_RATIO * (len(sample) - whitespace))
+
+    def _extract(self, file: BinaryIO, size: int, filename: str) -> ParsedDocument:
+        writer = _SegmentWriter("paragraph")
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="strict")
+        lines: List[str] = []
+        index = 0
+        try:
+            for line in text:
+                if "\x00" in line:
+                    raise SecurityCheckError(f"{filename} contains binary data.")
+                if line.strip():
+                    lines.append(line.rstrip())
+                    continue
+                if lines:
+                    writer.add("\n".join(lines), index)
+                    index += 1
+                    lines = []
+            if lines:
+                writer.add("\n".join(lines), index)
+        except UnicodeDecodeError as e:
+            raise SecurityCheckError(f"{filename} is not valid UTF-8 text: {e}")
+        finally:
+            text.detach()
+        return writer.document(self.format)
+
+def _has_fileno(file) -> bool:
+    try:
+        file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    return True
+
+# Format expected for each file extension; a mismatch means a mislabelled file
+EXTENSION_FORMATS = {".pdf": "pdf", ".docx": "docx", ".html": "html", ".htm": "html", ".txt": "text"}
+
+# Checked in order; plain text is the fallback for prose-like UTF-8
+PARSERS: List[AbstractParser] = [PDFParser(), DOCXParser(), HTMLParser(), TextParser()]
+
+def detect_parser(head: bytes, filename: str = "") -> AbstractParser:
+    """
+    Select a parser from the leading bytes of a file (magic bytes, not the extension).
+
+    Raises:
+        SecurityCheckError: If no supported format matches.
+    """
+    for parser in PARSERS:
+        if parser.matches(head):
+            return parser
+    msg = f"File {filename} is not a supported document type."
+    logger.warning(msg)
+    raise SecurityCheckError(msg)
+
+async def spool_upload(chunks: AsyncIterator[bytes], filename: str,
+                       max_bytes: int = MAX_FILE_SIZE_BYTES, digest=None) -> BinaryIO:
+    """
+    Stream an upload body into a spooled temporary file.
+
+    Only SPOOL_MAX_MEMORY_BYTES are held in memory (the rest goes to disk), the format
+    is detected as soon as SNIFF_BYTES have arrived, and the size limit is enforced per
+    chunk, so an oversized or unsupported upload is rejected without reading the rest
+    of the body.
+
+    Args:
+        chunks: Body chunks, e.g. `request.stream()`.
+        filename: Debug info.
+        max_bytes: Size limit.
+        digest: Optional hashlib object, updated with the body as it streams in.
+
+    Returns:
+        BinaryIO: The spooled file, rewound. The caller must close it.
+
+    Raises:
+        FileSizeLimitExceeded: As soon as more than `max_bytes` were received.
+        SecurityCheckError: If the body does not match a supported format.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES)
+    received = 0
+    head = b""
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            received += len(chunk)
+            if received > max_bytes:
+                msg = f"File {filename} exceeds size limit of {max_bytes} bytes."
+                logger.warning(msg)
+                raise FileSizeLimitExceeded(msg)
+            if len(head) < SNIFF_BYTES:
+                head += chunk[:SNIFF_BYTES - len(head)]
+                if len(head) == SNIFF_BYTES:
+                    detect_parser(head, filename)
+            spool.write(chunk)
+            if digest is not None:
+                digest.update(chunk)
+        if len(head) < SNIFF_BYTES:
+            detect_parser(head, filename)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
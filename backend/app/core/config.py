@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -10,6 +11,18 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "negotiator"
     SQLALCHEMY_DATABASE_URI: str | None = None
+    SQL_ECHO: bool = True # Log every SQL statement (disabled by scripts/serve.py)
+
+    # Vector Search (pgvector)
+    VECTOR_INDEX_TYPE: str = "hnsw" # hnsw, ivfflat, none
+    VECTOR_IVFFLAT_LISTS: int = 100
+    EMBEDDING_QUANTIZATION: str = "none" # none, float16, int8 (coarse-scan copy; float32 kept for rescoring)
+    EMBEDDING_RESCORE_FACTOR: int = 4 # Candidates rescored at full precision, as a multiple of the limit
+
+    # Embedding model (empty = provider default). A smaller model or a reduced width
+    # (text-embedding-3-*, titan-embed-text-v2) trades some recall for latency and storage.
+    EMBEDDING_MODEL: str = ""
+    EMBEDDING_DIMENSIONS: int | None = None # None = the model's native width
 
     # LLM Settings
     LLM_PROVIDER: str = "aws"  # aws, mistral, or openai
@@ -25,15 +38,94 @@ class Settings(BaseSettings):
     MISTRAL_MODEL_ID: str = "mistral-large-latest"
 
     # Supplier Intelligence
-    SUPPLIER_DATA_PROVIDER: str = "mock" # mock, dnb, newsapi
+    SUPPLIER_DATA_PROVIDER: str = "mock" # mock, live (D&B financials, NewsAPI news, sanctions screening)
+    DNB_API_URL: str = "https://plus.dnb.com"
+    DNB_API_KEY: str | None = None
+    DNB_API_SECRET: str | None = None
+    NEWS_API_URL: str = "https://newsapi.org"
     NEWS_API_KEY: str | None = None
+    SANCTIONS_API_URL: str = "https://api.opensanctions.org" # Or a self-hosted yente instance
+    SANCTIONS_API_KEY: str | None = None
+    SANCTIONS_DATASET: str = "default"
+    SANCTIONS_MATCH_THRESHOLD: float = 0.7 # Match score counted as a sanctions hit
+    SANCTIONS_BATCH_SIZE: int = 50 # Entities screened per request
+    SANCTIONS_SCREENING: str = "api" # api, local (fuzzy index over list files, see app/supplier/sanctions_index.py)
+    SANCTIONS_LIST_DIR: str = "sanctions_lists" # OFAC sdn.csv/alt.csv, EU consolidated CSV or simple id,name CSV files
+    SANCTIONS_LIST_RELOAD_SECONDS: float = 60.0 # Poll for changed list files (0 = load at startup only)
+    SANCTIONS_LIST_MATCH_THRESHOLD: float = 0.8 # Local screening score (0-1) counted as a hit
+    # Shared HTTP connection pool for the data vendors
+    SUPPLIER_HTTP_MAX_CONNECTIONS: int = 20
+    SUPPLIER_HTTP_MAX_KEEPALIVE: int = 10
+    SUPPLIER_HTTP_TIMEOUT_SECONDS: float = 10.0
+    SUPPLIER_HTTP_RETRIES: int = 2 # On transport errors, 429 and 502-504
+    # Vendor response cache TTLs by data type (0 = no caching)
+    SUPPLIER_CACHE_TTL_FINANCIALS_SECONDS: float = 24 * 3600
+    SUPPLIER_CACHE_TTL_NEWS_SECONDS: float = 15 * 60
+    SUPPLIER_CACHE_TTL_SANCTIONS_SECONDS: float = 3600
+    SUPPLIER_CACHE_MAX_ENTRIES: int = 10000
+    # Supplier risk score weights (see app/supplier/scoring.py); only the ratios matter
+    RISK_WEIGHT_FINANCIAL: float = 0.6
+    RISK_WEIGHT_SENTIMENT: float = 0.4
+    RISK_WEIGHT_PERFORMANCE: float = 0.0 # Latest quality/delivery/cost KPIs
+    # Risk profile history compaction (scripts/compact_risk_history.py)
+    RISK_HISTORY_KEEP_ALL_DAYS: int = 7 # Every snapshot is kept this long
+    RISK_HISTORY_DAILY_DAYS: int = 90 # Then one per day until this age, then one per week
+
+    # Contract Uploads
+    UPLOAD_MAX_CONCURRENT_PARSES: int = 4 # PDF text extraction is CPU/memory heavy; excess uploads wait
+    PARSE_CACHE_DIR: str = ".parse_cache" # Parsed documents keyed by file SHA-256
+    PARSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024 # LRU-evicted beyond this size
+
+    # Prompt Budgets (tokens)
+    LLM_PROMPT_MAX_TOKENS: int = 8000 # Older conversation history is dropped beyond this
+    POLICY_TEXT_MAX_TOKENS: int = 3000 # Longer policies are cut to the chunks most relevant to the clause
+
+    # Policy Evaluation
+    POLICY_BATCH_MAX_PROMPT_TOKENS: int = 12000 # Split batched evaluations above this estimate
+
+    # Negotiation Threads
+    NEGOTIATION_SUMMARY_THRESHOLD: int = 24 # Summarize once a thread holds more messages than this
+    NEGOTIATION_RECENT_MESSAGES: int = 8 # Messages kept verbatim in graph state after summarizing
+    TRANSCRIPT_BATCH_SIZE: int = 50 # Buffered transcript records written per transaction
+    TRANSCRIPT_FLUSH_INTERVAL_SECONDS: float = 0.5 # Max delay before buffered records are written
+    TRANSCRIPT_MAX_WRITE_ATTEMPTS: int = 5 # Failed flushes before a thread's records are dropped
+    # Admission control for graph runs (per worker process); excess runs queue, then get 429
+    AGENT_MAX_CONCURRENT_RUNS: int = 16
+    AGENT_MAX_RUNS_PER_SUPPLIER: int = 4
+    AGENT_MAX_RUNS_PER_TENANT: int = 8 # Tenant from the X-Tenant-ID header
+    AGENT_MAX_QUEUED_RUNS: int = 64
+    AGENT_MAX_QUEUE_WAIT_SECONDS: float = 10.0 # Queued runs are rejected after this wait
+    GRAPH_CHECKPOINTER: str = "memory" # memory (single process), database (shared by all workers)
+
+    # Deployment
+    WEB_CONCURRENCY: int = 1 # API worker processes started by scripts/serve.py
+    SKIP_INIT_DB: bool = False # Skip schema setup at startup (set by scripts/serve.py, which runs it once)
+    # Periodic policy index reload (0 = off); picks up edits made via other workers.
+    # Unset: 30s with the database checkpointer (several workers), else off
+    POLICY_INDEX_RELOAD_SECONDS: Optional[float] = None
 
     # Agency/Autonomy Settings
     AGENCY_LEVEL: str = "MEDIUM" # STRICT, MEDIUM, AUTONOMOUS
+    # Fast path: clauses whose outcome is already determined skip the negotiator/scribe LLM calls
+    FAST_PATH_AGENCY_LEVELS: List[str] = ["AUTONOMOUS"] # The fast path skips the gatekeeper; STRICT and MEDIUM review every decision
+    FAST_PATH_MAX_RISK: float = 40.0 # Max supplier risk (0-100) for auto-accepting compliant clauses
+    SPECULATIVE_DRAFTING: bool = False # Draft COUNTER/REJECT redlines while awaiting approval (discarded on REJECT)
+
+    # Concurrent identical JSON prompts / embedding texts share one provider call
+    LLM_COALESCE_REQUESTS: bool = True
+
+    # Mock LLM
+    MOCK_LLM_LATENCY_SECONDS: float = 1.0 # Simulated latency per mock LLM call
 
     # OpenAI (Legacy/Global)
     OPENAI_API_KEY: str = ""
 
+    @property
+    def policy_index_reload_seconds(self) -> float:
+        if self.POLICY_INDEX_RELOAD_SECONDS is not None:
+            return self.POLICY_INDEX_RELOAD_SECONDS
+        return 30.0 if self.GRAPH_CHECKPOINTER == "database" else 0.0
+
     class Config:
         case_sensitive = True
 
@@ -0,0 +1,330 @@
+import logging
+import os
+import re
+import struct
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import inspect as sa_inspect, select, text, update
+from sqlmodel import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# --- Embedding spaces ---
+
+# Output width of known embedding models
+NATIVE_DIMENSIONS = {
+    "amazon.titan-embed-text-v1": 1536,
+    "amazon.titan-embed-text-v2:0": 1024,
+    "mistral-embed": 1024,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "mock": 1536,
+}
+# Models that accept a smaller requested width (Matryoshka-style truncation)
+SHORTENABLE_MODELS = {"amazon.titan-embed-text-v2:0", "text-embedding-3-small", "text-embedding-3-large"}
+PROVIDER_DEFAULT_MODELS = {
+    "aws": "amazon.titan-embed-text-v1",
+    "mistral": "mistral-embed",
+    "openai": "text-embedding-3-small",
+}
+
+
+class EmbeddingSpace(NamedTuple):
+    """
+    An embedding model at a given output width. Vectors from different spaces are
+    not comparable, so every chunk row is tagged with the space it was embedded in.
+    """
+    model: str
+    dimensions: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.model}@{self.dimensions}"
+
+
+def resolve_space(model: Optional[str] = None, dimensions: Optional[int] = None,
+                  provider: Optional[str] = None) -> EmbeddingSpace:
+    """
+    Resolve an embedding space. With no model given, uses settings.EMBEDDING_MODEL /
+    EMBEDDING_DIMENSIONS, falling back to the provider's default model at native width.
+
+    Raises:
+        ValueError: Unknown model without explicit dimensions, or a reduced width
+            requested from a model that cannot produce it.
+    """
+    if model is None:
+        provider = (provider or os.getenv("LLM_PROVIDER", "mock")).lower()
+        model = settings.EMBEDDING_MODEL or PROVIDER_DEFAULT_MODELS.get(provider, "mock")
+        dimensions = dimensions or settings.EMBEDDING_DIMENSIONS
+    native = NATIVE_DIMENSIONS.get(model)
+    dimensions = dimensions or native
+    if dimensions is None:
+        raise ValueError(f"Unknown embedding model {model}; set EMBEDDING_DIMENSIONS")
+    if native is not None and dimensions != native and model not in SHORTENABLE_MODELS:
+        raise ValueError(f"{model} only produces {native}-dimensional embeddings")
+    return EmbeddingSpace(model, dimensions)
+
+
+def active_embedding_space() -> EmbeddingSpace:
+    """
+    The space new chunks are written in and queries are embedded in.
+    """
+    return resolve_space()
+
+
+# --- Binary encoding ---
+
+# Blob layout: 1 format byte, then (int8 only) a float32 scale, then the payload.
+FORMAT_FLOAT32 = 0
+FORMAT_FLOAT16 = 1
+FORMAT_INT8 = 2
+_FORMAT_CODES = {"float32": FORMAT_FLOAT32, "float16": FORMAT_FLOAT16, "int8": FORMAT_INT8}
+_SCALE = struct.Struct("<f")
+
+
+def encode(vector: Sequence[float], fmt: str = "float32") -> bytes:
+    """
+    Encode an embedding as a self-describing binary blob.
+
+    Args:
+        vector: Embedding values.
+        fmt: "float32" (lossless), "float16" or "int8" (symmetric scalar quantization
+             with the scale stored in the header).
+    """
+    arr = np.asarray(vector, dtype=np.float32)
+    code = _FORMAT_CODES[fmt]
+    if code == FORMAT_FLOAT32:
+        return bytes([code]) + arr.astype("<f4").tobytes()
+    if code == FORMAT_FLOAT16:
+        return bytes([code]) + arr.astype("<f2").tobytes()
+
+    max_abs = float(np.max(np.abs(arr))) if arr.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    quantized = np.clip(np.rint(arr / scale), -127, 127).astype(np.int8)
+    return bytes([code]) + _SCALE.pack(scale) + quantized.tobytes()
+
+
+def decode(blob: bytes) -> np.ndarray:
+    """
+    Decode a blob produced by `encode` into a float32 vector.
+    """
+    code = blob[0]
+    if code == FORMAT_FLOAT32:
+        return np.frombuffer(blob, dtype="<f4", offset=1)
+    if code == FORMAT_FLOAT16:
+        return np.frombuffer(blob, dtype="<f2", offset=1).astype(np.float32)
+    if code == FORMAT_INT8:
+        (scale,) = _SCALE.unpack_from(blob, 1)
+        return np.frombuffer(blob, dtype=np.int8, offset=1 + _SCALE.size).astype(np.float32) * scale
+    raise ValueError(f"Unknown embedding blob format: {code}")
+
+
+def is_lossy(blob: bytes) -> bool:
+    return blob[0] != FORMAT_FLOAT32
+
+
+def keeps_vector_column() -> bool:
+    """
+    The pgvector column is only needed where ANN indexes run (Postgres). Elsewhere it
+    is a text-serialized duplicate, so new rows leave it empty.
+    """
+    from app.database import DATABASE_URL
+    return "postgresql" in DATABASE_URL
+
+
+# Width of each table's pgvector column as it exists in the database (None until loaded).
+# The ORM type follows the configured model, but create_all never alters an existing
+# column, so after a model switch the two differ until the column is rebuilt.
+_vector_widths: Optional[Dict[str, int]] = None
+_VECTOR_TYPE_RE = re.compile(r"^vector\((\d+)\)$")
+
+
+def parse_vector_type(type_name: Optional[str]) -> Optional[int]:
+    """
+    Width of a pgvector column from its `format_type` name ("vector(1536)").
+    """
+    match = _VECTOR_TYPE_RE.match(type_name or "")
+    return int(match.group(1)) if match else None
+
+
+async def load_vector_column_dimensions(conn, refresh: bool = True) -> Dict[str, int]:
+    """
+    Read the chunk tables' pgvector column widths from the database catalog and cache
+    them for `vector_column_dimensions`. Called by init_db; databases without pgvector
+    columns cache an empty mapping.
+
+    Args:
+        conn: Async connection or session.
+        refresh: Re-read the catalog even if the widths are already cached.
+    """
+    global _vector_widths
+    from app.models import ContractChunk, PolicyChunk
+
+    if _vector_widths is not None and not refresh:
+        return _vector_widths
+    dialect = getattr(conn, "dialect", None) or conn.bind.dialect
+    widths: Dict[str, int] = {}
+    if dialect.name == "postgresql":
+        result = await conn.execute(
+            text(
+                "SELECT c.relname, format_type(a.atttypid, a.atttypmod) FROM pg_attribute a "
+                "JOIN pg_class c ON c.oid = a.attrelid "
+                "WHERE c.relname IN (:contract, :policy) AND a.attname = 'embedding' AND NOT a.attisdropped"
+            ),
+            {"contract": ContractChunk.__tablename__, "policy": PolicyChunk.__tablename__},
+        )
+        for table_name, type_name in result.all():
+            width = parse_vector_type(type_name)
+            if width is not None:
+                widths[table_name] = width
+        configured = active_embedding_space().dimensions
+        for table_name, width in widths.items():
+            if width != configured:
+                logger.warning(
+                    f"{table_name}.embedding is vector({width}) but the active space has {configured} "
+                    f"dimensions; searches in that space use the binary scan"
+                )
+    _vector_widths = widths
+    return widths
+
+
+def vector_column_dimensions(model=None) -> Optional[int]:
+    """
+    Width of the pgvector column backing `model` (default: ContractChunk) in the
+    database, or None if there is none or it has not been loaded yet.
+    """
+    from app.models import ContractChunk
+    if _vector_widths is None:
+        return None
+    return _vector_widths.get((model or ContractChunk).__tablename__)
+
+
+def embedding_fields(vector: Optional[Sequence[float]], space: Optional[EmbeddingSpace] = None,
+                     model=None) -> Dict[str, Any]:
+    """
+    Column values for a chunk row: the space tag, full-precision float32 blob, optional
+    quantized copy for the coarse scan (settings.EMBEDDING_QUANTIZATION), and the
+    pgvector column where it is used and its width in the database matches.
+
+    Args:
+        vector: Embedding values.
+        space: Space the vector was produced in (default: the active space).
+        model: Chunk table the row goes to (default: ContractChunk).
+    """
+    space = space or active_embedding_space()
+    if vector is None:
+        return {"embedding": None, "embedding_blob": None, "embedding_q": None, "embedding_model": space.key}
+    quantization = settings.EMBEDDING_QUANTIZATION.lower()
+    fits_column = keeps_vector_column() and len(vector) == vector_column_dimensions(model)
+    return {
+        "embedding": list(vector) if fits_column else None,
+        "embedding_blob": encode(vector, "float32"),
+        "embedding_q": encode(vector, quantization) if quantization != "none" else None,
+        "embedding_model": space.key,
+    }
+
+
+def chunk_vector(chunk) -> Optional[np.ndarray]:
+    """
+    Full-precision vector of a chunk row, whichever column it is stored in.
+    """
+    blob = getattr(chunk, "embedding_blob", None)
+    if blob is not None:
+        return decode(blob)
+    if chunk.embedding is not None:
+        return np.asarray(chunk.embedding, dtype=np.float32)
+    return None
+
+
+# --- Migration ---
+
+EMBEDDING_COLUMNS = ("embedding_blob", "embedding_q", "embedding_model")
+
+
+def _existing_columns(sync_conn, table_name: str) -> set:
+    return {c["name"] for c in sa_inspect(sync_conn).get_columns(table_name)}
+
+
+async def add_missing_columns(conn, table_name: str, column_types: Dict[str, str]) -> List[str]:
+    """
+    Add columns to a table created before they existed (create_all never alters
+    existing tables).
+
+    Args:
+        conn: Async connection.
+        table_name: Table to alter.
+        column_types: Column name -> DDL type, including any NOT NULL / DEFAULT.
+
+    Returns:
+        List[str]: Names of the columns that were added.
+    """
+    existing = await conn.run_sync(_existing_columns, table_name)
+    added = []
+    for column, column_type in column_types.items():
+        if column in existing:
+            continue
+        logger.info(f"Adding column {table_name}.{column}")
+        await conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type}"))
+        added.append(column)
+    return added
+
+
+async def ensure_embedding_columns(conn):
+    """
+    Add the binary embedding and space-tag columns to chunk tables created before they
+    existed. Untagged rows are assumed to belong to the active space.
+    """
+    from app.models import ContractChunk, PolicyChunk
+
+    blob_type = "BYTEA" if conn.dialect.name == "postgresql" else "BLOB"
+    column_types = {
+        column: "VARCHAR NOT NULL DEFAULT ''" if column == "embedding_model" else blob_type
+        for column in EMBEDDING_COLUMNS
+    }
+    for model in (ContractChunk, PolicyChunk):
+        await add_missing_columns(conn, model.__tablename__, column_types)
+        await conn.execute(
+            update(model).where(model.embedding_model == "").values(embedding_model=active_embedding_space().key)
+        )
+
+
+async def migrate_embeddings(session: Session, model, batch_size: int = 500,
+                             drop_vector_column: bool = False) -> int:
+    """
+    Backfill binary embeddings for rows that only have the legacy vector/JSON column.
+
+    Args:
+        session: DB Session.
+        model: ContractChunk or PolicyChunk.
+        batch_size: Rows converted per transaction.
+        drop_vector_column: Clear the legacy column after conversion (not on Postgres,
+            where the pgvector column backs the ANN index).
+
+    Returns:
+        int: Number of rows migrated.
+    """
+    migrated = 0
+    while True:
+        stmt = (
+            select(model.id, model.embedding)
+            .where(model.embedding_blob.is_(None), model.embedding.is_not(None))
+            .limit(batch_size)
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            break
+        params = []
+        for chunk_id, vector in rows:
+            values = embedding_fields(vector, model=model)
+            values.pop("embedding_model")
+            if not drop_vector_column or keeps_vector_column():
+                values.pop("embedding")
+            params.append({"id": chunk_id, **values})
+        await session.execute(update(model), params)
+        await session.commit()
+        migrated += len(rows)
+        logger.info(f"Migrated {migrated} {model.__tablename__} embeddings")
+    return migrated
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set
+from uuid import uuid4
+
+import yaml
+from sqlalchemy import insert
+
+from app.core.embeddings import embedding_fields
+from app.core.rag import split_text
+from app.llm import get_llm_client
+from app.models import Contract, ContractChunk, Policy, PolicyChunk
+
+logger = logging.getLogger(__name__)
+
+CONTRACT_EXTENSIONS = {".pdf", ".docx", ".html", ".htm", ".txt"}  # see parser.EXTENSION_FORMATS
+POLICY_EXTENSIONS = {".yaml", ".yml"}
+
+
+# --- Parsing (runs in worker processes) ---
+
+def _parse_file(path: str) -> Dict[str, Any]:
+    """
+    Parse a single file into a plain dict. Executed in a worker process, so it
+    must be a picklable top-level function and return picklable data.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    filename = os.path.basename(path)
+    try:
+        if ext in CONTRACT_EXTENSIONS:
+            from app.contract.cache import file_sha256, get_parse_cache
+            from app.contract.parser import EXTENSION_FORMATS, SNIFF_BYTES, SecurityCheckError, detect_parser
+            with open(path, "rb") as f:
+                parser = detect_parser(f.read(SNIFF_BYTES), filename)
+                if parser.format != EXTENSION_FORMATS[ext]:
+                    raise SecurityCheckError(f"{filename} contains {parser.format}, not {EXTENSION_FORMATS[ext]}")
+                content_hash = file_sha256(f)
+                document = asyncio.run(get_parse_cache().get_or_parse(content_hash, parser, f, filename))
+            return {"path": path, "kind": "contract", "title": os.path.splitext(filename)[0],
+                    "text": document.text, "content_hash": content_hash}
+
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        doc = yaml.safe_load(text)
+        meta = (doc or {}).get("policy_meta", {}) if isinstance(doc, dict) else {}
+        return {
+            "path": path,
+            "kind": "policy",
+            "title": meta.get("name") or os.path.splitext(filename)[0],
+            "version": str(meta.get("version", "1.0")),
+            "text": text,
+        }
+    except Exception as e:
+        return {"path": path, "kind": "error", "error": f"{type(e).__name__}: {e}"}
+
+
+# --- Checkpointing ---
+
+class IngestionCheckpoint:
+    """
+    Append-only log of files that were fully committed to the database.
+    Keys include size and mtime so modified files are re-ingested on resume.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Set[str] = set()
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self.done.add(json.loads(line)["key"])
+
+    @staticmethod
+    def key(path: str) -> str:
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def is_done(self, path: str) -> bool:
+        return self.key(path) in self.done
+
+    def mark(self, paths: List[str]):
+        if not self.path:
+            return
+        with open(self.path, "a") as f:
+            for path in paths:
+                key = self.key(path)
+                self.done.add(key)
+                f.write(json.dumps({"key": key}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# --- Reporting ---
+
+class IngestionReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.documents = 0
+        self.skipped = 0
+        self.chunks = 0
+        self.embeddings = 0
+        self.failures: List[Dict[str, str]] = []
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def _rate(self, count: int) -> float:
+        return count / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "skipped": self.skipped,
+            "failed": len(self.failures),
+            "chunks": self.chunks,
+            "embeddings": self.embeddings,
+            "elapsed_s": round(self.elapsed, 2),
+            "docs_per_s": round(self._rate(self.documents), 2),
+            "chunks_per_s": round(self._rate(self.chunks), 2),
+            "embeddings_per_s": round(self._rate(self.embeddings), 2),
+        }
+
+    def format(self) -> str:
+        d = self.to_dict()
+        lines = [
+            "--- Ingestion Report ---",
+            f"Documents: {d['documents']} ingested, {d['skipped']} skipped (checkpoint), {d['failed']} failed",
+            f"Chunks: {d['chunks']}  Embeddings: {d['embeddings']}  Elapsed: {d['elapsed_s']}s",
+            f"Throughput: {d['docs_per_s']} docs/s, {d['chunks_per_s']} chunks/s, {d['embeddings_per_s']} embeddings/s",
+        ]
+        for failure in self.failures[:20]:
+            lines.append(f"  FAILED {failure['path']}: {failure['error']}")
+        return "\n".join(lines)
+
+
+# --- Pipeline ---
+
+def discover_files(root: str) -> Iterator[str]:
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            ext = os.path.splitext(name)[1].lower()
+            if ext in CONTRACT_EXTENSIONS or ext in POLICY_EXTENSIONS:
+                yield os.path.join(dirpath, name)
+
+
+class BulkIngestor:
+    """
+    Walks a directory of contract documents (PDF, DOCX, HTML, text) and policy YAMLs
+    and loads them into the database.
+
+    Pipeline:
+    1. Parse files in a process pool (CPU-bound document / YAML parsing off the event loop).
+    2. Chunk and embed with batched embedding calls under a concurrency limit.
+    3. Write documents and chunks with bulk INSERTs, one transaction per DB batch.
+    4. Record committed files in a checkpoint so a crashed run can resume.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        workers: int = os.cpu_count() or 2,
+        embed_batch_size: int = 64,
+        embed_concurrency: int = 4,
+        db_batch_size: int = 50,
+        checkpoint_path: Optional[str] = None,
+        llm=None,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.embed_batch_size = embed_batch_size
+        self.db_batch_size = db_batch_size
+        self.checkpoint = IngestionCheckpoint(checkpoint_path)
+        self.llm = llm or get_llm_client()
+        self._embed_semaphore = asyncio.Semaphore(embed_concurrency)
+        self.report = IngestionReport()
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        batches = [texts[i:i + self.embed_batch_size] for i in range(0, len(texts), self.embed_batch_size)]
+
+        async def run(batch: List[str]) -> List[List[float]]:
+            async with self._embed_semaphore:
+                return await self.llm.generate_embeddings(batch)
+
+        results = await asyncio.gather(*(run(b) for b in batches))
+        vectors = [v for batch in results for v in batch]
+        self.report.embeddings += len(vectors)
+        return vectors
+
+    async def _prepare(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        chunks = split_text(parsed["text"])
+        parsed["id"] = uuid4()
+        parsed["chunks"] = chunks
+        try:
+            parsed["embeddings"] = await self._embed(chunks) if chunks else []
+        except Exception as e:
+            logger.error(f"Embedding failed for {parsed['path']}: {e}")
+            return {"path": parsed["path"], "kind": "error", "error": f"Embedding failed: {e}"}
+        return parsed
+
+    def _chunk_rows(self, docs: List[Dict[str, Any]], parent_key: str) -> List[Dict[str, Any]]:
+        space = self.llm.embedding_space
+        model = ContractChunk if parent_key == "contract_id" else PolicyChunk
+        return [
+            {"id": uuid4(), parent_key: d["id"], "chunk_index": i, "content": c, **embedding_fields(e, space, model)}
+            for d in docs for i, (c, e) in enumerate(zip(d["chunks"], d["embeddings"]))
+        ]
+
+    async def _flush(self, docs: List[Dict[str, Any]]):
+        if not docs:
+            return
+        contracts = [d for d in docs if d["kind"] == "contract"]
+        policies = [d for d in docs if d["kind"] == "policy"]
+
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            if contracts:
+                await session.execute(insert(Contract), [
+                    {"id": d["id"], "title": d["title"], "status": "draft",
+                     "content_text": d["text"], "content_hash": d["content_hash"], "created_at": now}
+                    for d in contracts
+                ])
+                rows = self._chunk_rows(contracts, "contract_id")
+                if rows:
+                    await session.execute(insert(ContractChunk), rows)
+            if policies:
+                await session.execute(insert(Policy), [
+                    {"id": d["id"], "name": d["title"], "version": d["version"],
+                     "text_content": d["text"], "is_active": True}
+                    for d in policies
+                ])
+                rows = self._chunk_rows(policies, "policy_id")
+                if rows:
+                    await session.execute(insert(PolicyChunk), rows)
+            await session.commit()
+
+        self.checkpoint.mark([d["path"] for d in docs])
+        self.report.documents += len(docs)
+        self.report.chunks += sum(len(d["chunks"]) for d in docs)
+        logger.info(f"Committed {len(docs)} documents ({self.report.documents} total).")
+
+    async def run(self, root: str) -> IngestionReport:
+        loop = asyncio.get_running_loop()
+        pending_paths = []
+        for path in discover_files(root):
+            if self.checkpoint.is_done(path):
+                self.report.skipped += 1
+            else:
+                pending_paths.append(path)
+
+        buffer: List[Dict[str, Any]] = []
+        # Bounded window keeps memory flat regardless of corpus size
+        window = max(self.workers * 4, self.db_batch_size)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for start in range(0, len(pending_paths), window):
+                futures = [loop.run_in_executor(pool, _parse_file, p) for p in pending_paths[start:start + window]]
+                prepare_tasks = []
+                for future in asyncio.as_completed(futures):
+                    parsed = await future
+                    if parsed["kind"] == "error":
+                        self.report.failures.append({"path": parsed["path"], "error": parsed["error"]})
+                        continue
+                    prepare_tasks.append(asyncio.ensure_future(self._prepare(parsed)))
+
+                for task in asyncio.as_completed(prepare_tasks):
+                    prepared = await task
+                    if prepared["kind"] == "error":
+                        self.report.failures.append({"path": prepared["path"], "error": prepared["error"]})
+                        continue
+                    buffer.append(prepared)
+                    if len(buffer) >= self.db_batch_size:
+                        await self._flush(buffer)
+                        buffer = []
+
+        await self._flush(buffer)
+        self.report.finished = time.perf_counter()
+        return self.report
@@ -1,14 +1,40 @@
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from uuid import UUID
 from sqlmodel import select, Session
 from sqlalchemy import text as sa_text
 from app.models import ContractChunk, PolicyChunk
 from app.llm import get_llm_client
 from app.database import get_session
+from app.core.embeddings import embedding_fields
+from app.core.search import SearchFilters, hybrid_search, load_chunks, vector_search
 
 logger = logging.getLogger(__name__)
 
+def split_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
+    """
+    Simple recursive character splitting strategy.
+    
+    Args:
+        text (str): Input text.
+        chunk_size (int): Target characters per chunk.
+        overlap (int): Overlap characters.
+    
+    Returns:
+        List[str]: List of text chunks.
+    """
+    if not text:
+        return []
+        
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        chunk = text[start:end]
+        chunks.append(chunk)
+        start += (chunk_size - overlap)
+    return chunks
+
 class RAGService:
     """
     Service for Handling Retrieval Augmented Generation (RAG) operations.
@@ -24,28 +50,13 @@ class RAGService:
         self.llm = get_llm_client()
 
     def _split_text(self, text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
-        """
-        Simple recursive character splitting strategy.
-        
-        Args:
-            text (str): Input text.
-            chunk_size (int): Target characters per chunk.
-            overlap (int): Overlap characters.
-        
-        Returns:
-            List[str]: List of text chunks.
-        """
-        if not text:
-            return []
-            
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start += (chunk_size - overlap)
-        return chunks
+        return split_text(text, chunk_size, overlap)
+
+    def _in_space(self, filters: Optional[SearchFilters]) -> SearchFilters:
+        # Only compare the query against chunks embedded by the same model
+        filters = filters.copy() if filters is not None else SearchFilters()
+        filters.embedding_space = self.llm.embedding_space.key
+        return filters
 
     async def ingest_contract(self, session: Session, contract_id: UUID, content: str):
         """
@@ -69,7 +80,7 @@ class RAGService:
                     contract_id=contract_id,
                     chunk_index=i,
                     content=chunk_text,
-                    embedding=embedding
+                    **embedding_fields(embedding, self.llm.embedding_space, ContractChunk)
                 )
                 session.add(db_chunk)
                 
@@ -81,7 +92,13 @@ class RAGService:
         
         await session.commit()
 
-    async def search(self, session: Session, query: str, limit: int = 5) -> List[ContractChunk]:
+    async def search(
+        self,
+        session: Session,
+        query: str,
+        limit: int = 5,
+        filters: Optional[SearchFilters] = None
+    ) -> List[ContractChunk]:
         """
         Semantic search for contract chunks.
 
@@ -89,6 +106,9 @@ class RAGService:
             session: DB Session.
             query: User question or search phrase.
             limit: Number of results.
+            filters: Optional scope (contract, supplier, created_at range). Scoped
+                searches only rank that subset, so latency tracks the size of the
+                scope rather than the whole corpus.
 
         Returns:
             List[ContractChunk]: Relevant chunks.
@@ -96,16 +116,9 @@ class RAGService:
         # 1. Embed Query
         query_embedding = await self.llm.generate_embedding(query)
 
-        # 2. Search via pgvector (L2 distance via <-> operator)
-        # Note: SQLModel doesn't native support vector ops easily in pythonic select yet, 
-        # usually requires `order_by(ContractChunk.embedding.l2_distance(query_embedding))`
-        
-        stmt = select(ContractChunk).order_by(
-            ContractChunk.embedding.l2_distance(query_embedding)
-        ).limit(limit)
-        
-        results = await session.exec(stmt)
-        return results.all()
+        # 2. Search via pgvector (L2 distance via <-> operator), pre-filtered when scoped
+        ids = await vector_search(session, ContractChunk, query_embedding, limit, self._in_space(filters))
+        return await load_chunks(session, ContractChunk, ids)
 
     async def ingest_policy(self, session: Session, policy_id: UUID, content: str):
         """
@@ -121,7 +134,7 @@ class RAGService:
                     policy_id=policy_id,
                     chunk_index=i,
                     content=chunk_text,
-                    embedding=embedding
+                    **embedding_fields(embedding, self.llm.embedding_space, PolicyChunk)
                 )
                 session.add(db_chunk)
             except Exception as e:
@@ -130,15 +143,50 @@ class RAGService:
         
         await session.commit()
 
-    async def search_policies(self, session: Session, query: str, limit: int = 5) -> List[PolicyChunk]:
+    async def search_policies(
+        self,
+        session: Session,
+        query: str,
+        limit: int = 5,
+        filters: Optional[SearchFilters] = None
+    ) -> List[PolicyChunk]:
         """
-        Semantic search for policy chunks.
+        Semantic search for policy chunks, optionally scoped to a policy and/or version.
         """
         query_embedding = await self.llm.generate_embedding(query)
-        
-        stmt = select(PolicyChunk).order_by(
-            PolicyChunk.embedding.l2_distance(query_embedding)
-        ).limit(limit)
-        
-        results = await session.exec(stmt)
-        return results.all()
+        ids = await vector_search(session, PolicyChunk, query_embedding, limit, self._in_space(filters))
+        return await load_chunks(session, PolicyChunk, ids)
+
+    async def hybrid_search(
+        self,
+        session: Session,
+        query: str,
+        limit: int = 5,
+        filters: Optional[SearchFilters] = None
+    ) -> List[ContractChunk]:
+        """
+        Hybrid (BM25 + vector) search for contract chunks, fused by reciprocal rank.
+        Exact terms like "Net 45", "Section 12.3" or party names are caught by the
+        lexical leg, so a small limit is usually enough.
+
+        Args:
+            session: DB Session.
+            query: User question or search phrase.
+            limit: Number of results.
+            filters: Optional scope (contract, supplier, created_at range).
+        """
+        query_embedding = await self.llm.generate_embedding(query)
+        return await hybrid_search(session, ContractChunk, query, query_embedding, limit, self._in_space(filters))
+
+    async def hybrid_search_policies(
+        self,
+        session: Session,
+        query: str,
+        limit: int = 5,
+        filters: Optional[SearchFilters] = None
+    ) -> List[PolicyChunk]:
+        """
+        Hybrid (BM25 + vector) search for policy chunks, optionally scoped to a policy/version.
+        """
+        query_embedding = await self.llm.generate_embedding(query)
+        return await hybrid_search(session, PolicyChunk, query, query_embedding, limit, self._in_space(filters))
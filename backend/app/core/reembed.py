@@ -0,0 +1,102 @@
+import logging
+from typing import Dict, List, Tuple
+from uuid import uuid4
+
+from sqlalchemy import and_, delete, exists, func, insert, select
+from sqlalchemy.orm import aliased
+from sqlmodel import Session
+
+from app.core.embeddings import EmbeddingSpace, embedding_fields
+from app.llm import get_embedding_client
+from app.models import ContractChunk, PolicyChunk
+
+logger = logging.getLogger(__name__)
+
+
+def _parent_key(model) -> str:
+    return "contract_id" if model is ContractChunk else "policy_id"
+
+
+def _pending(model, target: EmbeddingSpace):
+    """
+    Chunks that have no counterpart in the target space yet.
+    """
+    parent = _parent_key(model)
+    counterpart = aliased(model)
+    return and_(
+        model.embedding_model != target.key,
+        ~exists().where(
+            getattr(counterpart, parent) == getattr(model, parent),
+            counterpart.chunk_index == model.chunk_index,
+            counterpart.embedding_model == target.key,
+        ),
+    )
+
+
+async def reembed_progress(session: Session, model, target: EmbeddingSpace) -> Tuple[int, int]:
+    """
+    Returns:
+        Tuple[int, int]: (chunks still to re-embed, chunks already in the target space).
+    """
+    pending = await session.execute(select(func.count()).select_from(model).where(_pending(model, target)))
+    done = await session.execute(
+        select(func.count()).select_from(model).where(model.embedding_model == target.key)
+    )
+    return pending.scalar(), done.scalar()
+
+
+async def reembed(session_factory, model, target: EmbeddingSpace, llm=None, batch_size: int = 64) -> int:
+    """
+    Copy chunks into another embedding space without taking the current one offline.
+
+    Target rows are inserted next to the existing ones. Reads stay on the active space
+    (settings.EMBEDDING_MODEL) until it is switched to the target, after which
+    `prune_spaces` removes the old rows. Safe to re-run: chunks that already have a
+    target row are skipped, so a second run after the switch picks up documents
+    ingested in the meantime.
+
+    Args:
+        session_factory: Async session maker.
+        model: ContractChunk or PolicyChunk.
+        target: Space to embed into.
+        llm: Client producing target-space embeddings (default: built for `target`).
+        batch_size: Chunks per embedding call and transaction.
+
+    Returns:
+        int: Number of chunks re-embedded.
+    """
+    llm = llm or get_embedding_client(target)
+    parent = _parent_key(model)
+    total = 0
+    while True:
+        async with session_factory() as session:
+            stmt = (
+                select(getattr(model, parent), model.chunk_index, model.content)
+                .where(_pending(model, target))
+                .limit(batch_size)
+            )
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                break
+            # A chunk can still exist in more than one old space; embed it once
+            unique: Dict[Tuple, str] = {(parent_id, index): content for parent_id, index, content in rows}
+            vectors: List[List[float]] = await llm.generate_embeddings(list(unique.values()))
+            await session.execute(insert(model), [
+                {"id": uuid4(), parent: parent_id, "chunk_index": index, "content": content, **embedding_fields(vector, target, model)}
+                for ((parent_id, index), content), vector in zip(unique.items(), vectors)
+            ])
+            await session.commit()
+        total += len(unique)
+        logger.info(f"Re-embedded {total} {model.__tablename__} chunks into {target.key}")
+    return total
+
+
+async def prune_spaces(session: Session, model, keep: EmbeddingSpace) -> int:
+    """
+    Delete chunk rows from every space other than `keep`. Run after the switch.
+    """
+    result = await session.execute(delete(model).where(model.embedding_model != keep.key))
+    await session.commit()
+    logger.info(f"Pruned {result.rowcount} {model.__tablename__} chunks outside {keep.key}")
+    return result.rowcount
+
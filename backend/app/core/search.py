@@ -0,0 +1,312 @@
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+from uuid import UUID
+
+import numpy as np
+from pydantic import BaseModel
+from sqlalchemy import desc, func, literal_column, select, table, column, text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.embeddings import decode, is_lossy, load_vector_column_dimensions, vector_column_dimensions
+from app.models import Contract, ContractChunk, Policy, PolicyChunk
+
+logger = logging.getLogger(__name__)
+
+ChunkModel = Union[Type[ContractChunk], Type[PolicyChunk]]
+
+# Reciprocal-rank fusion constant (Cormack et al.); dampens the weight of top ranks
+RRF_K = 60
+# Candidates pulled from each retriever before fusion, as a multiple of the final limit
+CANDIDATE_MULTIPLIER = 4
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_table(model: ChunkModel) -> str:
+    return f"{model.__tablename__}_fts"
+
+
+class SearchFilters(BaseModel):
+    """
+    Metadata scope for chunk search. Contract filters apply to ContractChunk,
+    policy filters to PolicyChunk; unset fields are ignored.
+
+    `embedding_space` is not a scope: it restricts results to rows embedded in the
+    query's space when several coexist during a re-embedding.
+    """
+    contract_id: Optional[UUID] = None
+    supplier_id: Optional[UUID] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    policy_id: Optional[UUID] = None
+    policy_version: Optional[str] = None
+    embedding_space: Optional[str] = None
+
+    def is_scoped(self) -> bool:
+        return any(v is not None for k, v in self.model_dump().items() if k != "embedding_space")
+
+
+# --- Index DDL ---
+
+def _sqlite_fts_ddl(chunk_table: str) -> List[str]:
+    fts = f"{chunk_table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(content, content='{chunk_table}', content_rowid='rowid')",
+        f"CREATE TRIGGER IF NOT EXISTS {chunk_table}_fts_ai AFTER INSERT ON {chunk_table} BEGIN "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.rowid, new.content); END",
+        f"CREATE TRIGGER IF NOT EXISTS {chunk_table}_fts_ad AFTER DELETE ON {chunk_table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.rowid, old.content); END",
+        f"CREATE TRIGGER IF NOT EXISTS {chunk_table}_fts_au AFTER UPDATE OF content ON {chunk_table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.rowid, old.content); "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.rowid, new.content); END",
+        # Index rows that existed before the FTS table was created
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+async def create_lexical_indexes(conn, dialect: str):
+    """
+    Create full-text indexes over chunk content.
+
+    - SQLite: external-content FTS5 tables kept in sync by triggers (BM25 ranking).
+    - Postgres: GIN expression indexes on to_tsvector('english', content).
+    """
+    for model in (ContractChunk, PolicyChunk):
+        chunk_table = model.__tablename__
+        if dialect == "sqlite":
+            exists = await conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+                {"name": _fts_table(model)},
+            )
+            if exists.first():
+                continue
+            for statement in _sqlite_fts_ddl(chunk_table):
+                await conn.execute(text(statement))
+        elif dialect == "postgresql":
+            await conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{chunk_table}_content_fts "
+                f"ON {chunk_table} USING GIN (to_tsvector('english', content))"
+            ))
+
+
+async def create_vector_indexes(conn, dialect: str):
+    """
+    Create approximate-nearest-neighbour indexes on chunk embeddings (Postgres/pgvector only).
+    Index type is settings.VECTOR_INDEX_TYPE: "hnsw", "ivfflat" or "none".
+    """
+    index_type = settings.VECTOR_INDEX_TYPE.lower()
+    if dialect != "postgresql" or index_type == "none":
+        return
+    for model in (ContractChunk, PolicyChunk):
+        chunk_table = model.__tablename__
+        if index_type == "ivfflat":
+            ddl = (
+                f"CREATE INDEX IF NOT EXISTS ix_{chunk_table}_embedding_ivfflat ON {chunk_table} "
+                f"USING ivfflat (embedding vector_l2_ops) WITH (lists = {settings.VECTOR_IVFFLAT_LISTS})"
+            )
+        else:
+            ddl = (
+                f"CREATE INDEX IF NOT EXISTS ix_{chunk_table}_embedding_hnsw ON {chunk_table} "
+                f"USING hnsw (embedding vector_l2_ops)"
+            )
+        await conn.execute(text(ddl))
+
+
+# --- Retrieval legs ---
+
+def _apply_filters(stmt, model: ChunkModel, filters: Optional[SearchFilters]):
+    if filters is None:
+        return stmt
+    if filters.embedding_space is not None:
+        stmt = stmt.where(model.embedding_model == filters.embedding_space)
+    if model is ContractChunk:
+        if filters.contract_id is not None:
+            stmt = stmt.where(ContractChunk.contract_id == filters.contract_id)
+        if any(v is not None for v in (filters.supplier_id, filters.created_after, filters.created_before)):
+            stmt = stmt.join(Contract, Contract.id == ContractChunk.contract_id)
+            if filters.supplier_id is not None:
+                stmt = stmt.where(Contract.supplier_id == filters.supplier_id)
+            if filters.created_after is not None:
+                stmt = stmt.where(Contract.created_at >= filters.created_after)
+            if filters.created_before is not None:
+                stmt = stmt.where(Contract.created_at < filters.created_before)
+    else:
+        if filters.policy_id is not None:
+            stmt = stmt.where(PolicyChunk.policy_id == filters.policy_id)
+        if filters.policy_version is not None:
+            stmt = stmt.join(Policy, Policy.id == PolicyChunk.policy_id).where(Policy.version == filters.policy_version)
+    return stmt
+
+
+async def lexical_search(session: Session, model: ChunkModel, query: str, limit: int,
+                         filters: Optional[SearchFilters] = None) -> List[UUID]:
+    """
+    BM25-style keyword search. Returns chunk ids, best first.
+    Terms are OR-ed so partial matches ("Net 45" vs "net forty-five (45)") still rank.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return []
+
+    dialect = session.bind.dialect.name
+    if dialect == "sqlite":
+        fts_name = _fts_table(model)
+        fts = table(fts_name, column("rowid"))
+        match = " OR ".join(f'"{t}"' for t in tokens)
+        rank = literal_column(f"bm25({fts_name})")
+        stmt = (
+            select(model.id)
+            .select_from(fts.join(model.__table__, literal_column(f"{model.__tablename__}.rowid") == fts.c.rowid))
+            .where(text(f"{fts_name} MATCH :match").bindparams(match=match))
+            .order_by(rank)  # bm25(): lower is better
+            .limit(limit)
+        )
+    elif dialect == "postgresql":
+        tsquery = func.to_tsquery("english", " | ".join(tokens))
+        tsvector = func.to_tsvector("english", model.content)
+        stmt = (
+            select(model.id)
+            .where(tsvector.op("@@")(tsquery))
+            .order_by(desc(func.ts_rank_cd(tsvector, tsquery)))
+            .limit(limit)
+        )
+    else:
+        logger.warning(f"No lexical index support for dialect {dialect}")
+        return []
+
+    stmt = _apply_filters(stmt, model, filters)
+    result = await session.execute(stmt)
+    return [row[0] for row in result.all()]
+
+
+async def vector_search(session: Session, model: ChunkModel, query_embedding: List[float], limit: int,
+                        filters: Optional[SearchFilters] = None) -> List[UUID]:
+    """
+    Nearest-neighbour search by L2 distance. Returns chunk ids, best first.
+
+    Query plans:
+    - Postgres, unscoped: ORDER BY embedding <-> q LIMIT k, served by the HNSW/IVFFlat index.
+    - Postgres, scoped: the filtered candidate set is materialized first (B-tree on
+      contract_id/policy_id) and ranked exactly. ANN indexes post-filter, which both
+      scans the whole corpus and can return fewer than k rows for a small contract.
+    - A space whose width differs from the pgvector column in the database (during or
+      after a switch to another model) has no vectors in that column and is served
+      by the binary scan below.
+    - SQLite: filtered candidates are fetched via the B-tree index and ranked in NumPy
+      from their binary embeddings (coarse scan + rescoring, see _scan_binary).
+    Either way, a single-contract search only touches that contract's chunks.
+    """
+    scoped = filters is not None and filters.is_scoped()
+    if session.bind.dialect.name == "postgresql":
+        await load_vector_column_dimensions(session, refresh=False)
+    if session.bind.dialect.name == "postgresql" and len(query_embedding) == vector_column_dimensions(model):
+        if not scoped:
+            stmt = (
+                _apply_filters(select(model.id), model, filters)
+                .order_by(model.embedding.l2_distance(query_embedding))
+                .limit(limit)
+            )
+        else:
+            candidates = (
+                _apply_filters(select(model.id, model.embedding), model, filters)
+                .cte("candidates")
+                .prefix_with("MATERIALIZED")
+            )
+            stmt = (
+                select(candidates.c.id)
+                .order_by(candidates.c.embedding.l2_distance(query_embedding))
+                .limit(limit)
+            )
+        result = await session.execute(stmt)
+        return [row[0] for row in result.all()]
+
+    return await _scan_binary(session, model, np.asarray(query_embedding, dtype=np.float32), limit, filters)
+
+
+def _top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    distances = np.linalg.norm(matrix - query, axis=1)
+    k = min(k, len(distances))
+    top = np.argpartition(distances, k - 1)[:k]
+    return top[np.argsort(distances[top])]
+
+
+async def _scan_binary(session: Session, model: ChunkModel, query: np.ndarray, limit: int,
+                       filters: Optional[SearchFilters]) -> List[UUID]:
+    """
+    Brute-force scan over binary embeddings (see app.core.embeddings).
+
+    The coarse pass ranks the compact copy (quantized if present, else float32); when
+    that copy is lossy, the top `limit * EMBEDDING_RESCORE_FACTOR` candidates are
+    rescored against the float32 blob. Rows not yet migrated fall back to the legacy
+    vector column.
+    """
+    coarse = func.coalesce(model.embedding_q, model.embedding_blob)
+    rows = (await session.execute(_apply_filters(select(model.id, coarse), model, filters))).all()
+
+    ids, vectors, legacy_ids, lossy = [], [], [], False
+    for chunk_id, blob in rows:
+        if blob is None:
+            legacy_ids.append(chunk_id)
+            continue
+        ids.append(chunk_id)
+        vectors.append(decode(blob))
+        lossy = lossy or is_lossy(blob)
+    if legacy_ids:
+        legacy = await session.execute(select(model.id, model.embedding).where(model.id.in_(legacy_ids)))
+        for chunk_id, vector in legacy.all():
+            if vector is not None:
+                ids.append(chunk_id)
+                vectors.append(np.asarray(vector, dtype=np.float32))
+    if not ids:
+        return []
+
+    shortlist = limit * settings.EMBEDDING_RESCORE_FACTOR if lossy else limit
+    candidate_ids = [ids[i] for i in _top_k(np.vstack(vectors), query, shortlist)]
+    if not lossy:
+        return candidate_ids
+
+    exact = await session.execute(select(model.id, model.embedding_blob).where(model.id.in_(candidate_ids)))
+    full = {chunk_id: decode(blob) for chunk_id, blob in exact.all() if blob is not None}
+    rescored = [cid for cid in candidate_ids if cid in full]
+    return [rescored[i] for i in _top_k(np.vstack([full[cid] for cid in rescored]), query, limit)]
+
+
+async def load_chunks(session: Session, model: ChunkModel, ids: List[UUID]) -> list:
+    """
+    Fetch chunk rows by id, preserving the given order.
+    """
+    if not ids:
+        return []
+    rows = (await session.execute(select(model).where(model.id.in_(ids)))).scalars().all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[UUID]], k: int = RRF_K) -> List[Tuple[UUID, float]]:
+    """
+    Fuse several ranked id lists: score(d) = sum over lists of 1 / (k + rank(d)).
+    """
+    scores: Dict[UUID, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+async def hybrid_search(session: Session, model: ChunkModel, query: str, query_embedding: List[float],
+                        limit: int = 5, filters: Optional[SearchFilters] = None) -> list:
+    """
+    Combine lexical and vector retrieval with reciprocal-rank fusion.
+
+    Returns:
+        List of chunk rows (ContractChunk or PolicyChunk), best first.
+    """
+    candidates = limit * CANDIDATE_MULTIPLIER
+    lexical = await lexical_search(session, model, query, candidates, filters)
+    vector = await vector_search(session, model, query_embedding, candidates, filters)
+
+    fused = reciprocal_rank_fusion([lexical, vector])[:limit]
+    return await load_chunks(session, model, [chunk_id for chunk_id, _ in fused])
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent identical calls: while a call for a key is in flight,
+    later callers with the same key await its result instead of starting their own.
+    Nothing is cached once the call completes.
+
+    The shared call runs as its own task, so a caller that is cancelled does not
+    cancel it for the others.
+
+    Attributes:
+        calls (int): Upstream calls started.
+        shared (int): Callers served by a call already in flight.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self.calls = 0
+        self.shared = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = self._start(key, fn())
+        else:
+            self.shared += 1
+            logger.debug(f"{self.name}: joined in-flight call")
+        return await asyncio.shield(task)
+
+    async def do_many(self, keys: Sequence[Hashable], fn: Callable[[List[Hashable]], Awaitable[List[Any]]]) -> List[Any]:
+        """
+        Batch variant: keys already in flight are joined, the rest are fetched with
+        one `fn(missing_keys)` call, which returns results in the same order.
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self._inflight]
+        if missing:
+            self.calls += 1
+            batch = asyncio.get_running_loop().create_task(fn(missing))
+            for i, key in enumerate(missing):
+                self._start(key, self._pick(batch, i))
+        self.shared += len(keys) - len(missing)
+        tasks = {key: self._inflight[key] for key in keys}
+        results = {}
+        for key, task in tasks.items():
+            results[key] = await asyncio.shield(task)
+        return [results[key] for key in keys]
+
+    @staticmethod
+    async def _pick(batch: asyncio.Task, i: int) -> Any:
+        return (await asyncio.shield(batch))[i]
+
+    def _start(self, key: Hashable, coro: Awaitable[Any]) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return task
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved by the awaiting callers; avoid "never retrieved" warnings
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": self.in_flight()}
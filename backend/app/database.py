@@ -10,15 +10,31 @@ from app.core.config import settings
 # Use SQLite as default fallback if no ENV is set, to ensure it works without Docker
 DATABASE_URL = settings.SQLALCHEMY_DATABASE_URI or "sqlite+aiosqlite:///./negotiator.db"
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+engine = create_async_engine(DATABASE_URL, echo=settings.SQL_ECHO, future=True)
+
+if engine.dialect.name == "sqlite":
+    from sqlalchemy import event
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed during writes; several worker processes share the file
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 async def get_session() -> AsyncSession:
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
     async with async_session() as session:
         yield session
 
+def _create_missing_indexes(sync_conn):
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
 async def init_db():
     async with engine.begin() as conn:
         # Import models so SQLModel knows about them
@@ -30,3 +46,23 @@ async def init_db():
             await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
             
         await conn.run_sync(SQLModel.metadata.create_all)
+        # Columns added after the first release (create_all never alters existing tables)
+        from app.core.embeddings import add_missing_columns, ensure_embedding_columns, load_vector_column_dimensions
+        await ensure_embedding_columns(conn)
+        # Other nullable columns (content_hash, sequence, ...); anything needing a
+        # default or backfill gets its own step, like the embedding columns above
+        for table in SQLModel.metadata.sorted_tables:
+            await add_missing_columns(conn, table.name, {
+                column.name: column.type.compile(dialect=conn.dialect)
+                for column in table.columns if column.nullable
+            })
+        # The pgvector column keeps its original width when the embedding model changes
+        await load_vector_column_dimensions(conn)
+        # create_all only indexes newly created tables; add missing indexes to existing ones
+        await conn.run_sync(_create_missing_indexes)
+
+        # Full-text indexes for hybrid (lexical + vector) retrieval
+        # and ANN indexes for vector search (Postgres only)
+        from app.core.search import create_lexical_indexes, create_vector_indexes
+        await create_lexical_indexes(conn, engine.dialect.name)
+        await create_vector_indexes(conn, engine.dialect.name)
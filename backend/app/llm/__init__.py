@@ -1,2 +1,4 @@
 from .base import AbstractLLMClient, LLMMessage
-from .factory import get_llm_client
+from .coalescing import CoalescingLLMClient
+from .factory import get_embedding_client, get_llm_client
+from .tokens import PromptBudget, TokenCounter, get_token_counter
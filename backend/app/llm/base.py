@@ -1,12 +1,17 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
+from app.core.embeddings import EmbeddingSpace
 
 class LLMMessage(BaseModel):
     role: str
     content: str
 
 class AbstractLLMClient(ABC):
+    # Space produced by generate_embedding(s); set by each provider
+    embedding_space: EmbeddingSpace
+
     @abstractmethod
     async def generate_response(
         self, 
@@ -37,3 +42,10 @@ class AbstractLLMClient(ABC):
         Generate a vector embedding for the given text.
         """
         pass
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts.
+        Providers with a native batch endpoint override this; the default fans out.
+        """
+        return list(await asyncio.gather(*(self.generate_embedding(t) for t in texts)))
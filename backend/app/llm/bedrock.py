@@ -2,14 +2,16 @@ import json
 import boto3
 import logging
 from typing import List, Dict, Any, Optional
+from app.core.embeddings import EmbeddingSpace, NATIVE_DIMENSIONS, resolve_space
 from .base import AbstractLLMClient, LLMMessage
 
 logger = logging.getLogger(__name__)
 
 class BedrockClient(AbstractLLMClient):
-    def __init__(self, region_name: str, model_id: str):
+    def __init__(self, region_name: str, model_id: str, embedding_space: Optional[EmbeddingSpace] = None):
         self.client = boto3.client(service_name="bedrock-runtime", region_name=region_name)
         self.model_id = model_id
+        self.embedding_space = embedding_space or resolve_space(provider="aws")
 
     async def generate_response(
         self, 
@@ -75,12 +77,13 @@ class BedrockClient(AbstractLLMClient):
             raise ValueError("LLM failed to generate valid JSON")
 
     async def generate_embedding(self, text: str) -> List[float]:
-        # Using Titan Embeddings v1 by default for embeddings
-        embedding_model_id = "amazon.titan-embed-text-v1"
+        # Titan Embeddings v1 by default; v2 accepts a reduced output width
+        embedding_model_id, dimensions = self.embedding_space
         
-        body = json.dumps({
-            "inputText": text
-        })
+        request = {"inputText": text}
+        if dimensions != NATIVE_DIMENSIONS.get(embedding_model_id):
+            request["dimensions"] = dimensions
+        body = json.dumps(request)
         
         try:
             response = self.client.invoke_model(
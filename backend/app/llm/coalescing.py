@@ -0,0 +1,69 @@
+import copy
+import hashlib
+import inspect
+import json
+from typing import Any, Dict, List, Optional
+
+from app.core.singleflight import SingleFlight
+from .base import AbstractLLMClient, LLMMessage
+
+
+def json_prompt_key(messages: List[LLMMessage], schema: Dict[str, Any], system_prompt: Optional[str]) -> str:
+    payload = json.dumps(
+        {"system": system_prompt, "messages": [[m.role, m.content] for m in messages], "schema": schema},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CoalescingLLMClient(AbstractLLMClient):
+    """
+    Wraps a provider client so concurrent identical requests share one upstream call:
+    the same JSON prompt (system prompt, messages and schema) or the same embedding
+    text. Free-text responses are sampled (temperature > 0) and never shared.
+
+    Every caller gets its own copy of the result.
+    """
+
+    def __init__(self, client: AbstractLLMClient):
+        self.client = client
+        self.embedding_space = client.embedding_space
+        self.json_flights = SingleFlight("llm.generate_json")
+        self.embedding_flights = SingleFlight("llm.generate_embedding")
+        # Not every provider client takes a temperature; it then uses its own default
+        parameters = inspect.signature(client.generate_response).parameters
+        self._passes_temperature = "temperature" in parameters or any(
+            p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+        )
+
+    async def generate_response(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> str:
+        if not self._passes_temperature:
+            return await self.client.generate_response(messages, system_prompt=system_prompt)
+        return await self.client.generate_response(messages, system_prompt=system_prompt, temperature=temperature)
+
+    async def generate_json(
+        self,
+        messages: List[LLMMessage],
+        schema: Dict[str, Any],
+        system_prompt: Optional[str] = None
+    ) -> Dict[str, Any]:
+        result = await self.json_flights.do(
+            json_prompt_key(messages, schema, system_prompt),
+            lambda: self.client.generate_json(messages, schema, system_prompt=system_prompt),
+        )
+        return copy.deepcopy(result)
+
+    async def generate_embedding(self, text: str) -> List[float]:
+        return list(await self.embedding_flights.do(text, lambda: self.client.generate_embedding(text)))
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        # Texts already being embedded are joined; the rest go upstream in one batch
+        return [list(v) for v in await self.embedding_flights.do_many(texts, self.client.generate_embeddings)]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"generate_json": self.json_flights.stats(), "embeddings": self.embedding_flights.stats()}
@@ -1,33 +1,50 @@
 import os
 from functools import lru_cache
 from typing import Optional
+from app.core.config import settings
+from app.core.embeddings import EmbeddingSpace
 from .base import AbstractLLMClient
 from .bedrock import BedrockClient
+from .coalescing import CoalescingLLMClient
 from .mistral import MistralClient
 
 class LLMFactory:
     @staticmethod
-    def get_client() -> AbstractLLMClient:
+    def get_client(embedding_space: Optional[EmbeddingSpace] = None) -> AbstractLLMClient:
+        """
+        Build a client for the configured provider. `embedding_space` overrides the
+        configured embedding model (used by the re-embedding job).
+        """
         provider = os.getenv("LLM_PROVIDER", "mock").lower()
         
         if provider == "aws":
             return BedrockClient(
                 region_name=os.getenv("AWS_REGION", "eu-central-1"),
-                model_id=os.getenv("AWS_BEDROCK_MODEL_ID", "anthropic.claude-3-5-sonnet-20240620-v1:0")
+                model_id=os.getenv("AWS_BEDROCK_MODEL_ID", "anthropic.claude-3-5-sonnet-20240620-v1:0"),
+                embedding_space=embedding_space
             )
         elif provider == "mistral":
             return MistralClient(
                 api_key=os.getenv("MISTRAL_API_KEY", ""),
-                model_id=os.getenv("MISTRAL_MODEL_ID", "mistral-large-latest")
+                model_id=os.getenv("MISTRAL_MODEL_ID", "mistral-large-latest"),
+                embedding_space=embedding_space
             )
         elif provider == "openai":
             from .openai_client import OpenAIClient
-            return OpenAIClient()
+            return OpenAIClient(embedding_space=embedding_space)
         else:
             # Default to Mock
             from .mock import MockLLMClient
-            return MockLLMClient()
+            return MockLLMClient(embedding_space=embedding_space)
+
+def _shared(client: AbstractLLMClient) -> AbstractLLMClient:
+    # Process-wide clients deduplicate concurrent identical requests
+    return CoalescingLLMClient(client) if settings.LLM_COALESCE_REQUESTS else client
 
 @lru_cache()
 def get_llm_client() -> AbstractLLMClient:
-    return LLMFactory.get_client()
+    return _shared(LLMFactory.get_client())
+
+@lru_cache()
+def get_embedding_client(embedding_space: EmbeddingSpace) -> AbstractLLMClient:
+    return _shared(LLMFactory.get_client(embedding_space))
@@ -3,14 +3,17 @@ import logging
 import os
 from typing import List, Dict, Any, Optional
 from mistralai import Mistral
+from app.core.embeddings import EmbeddingSpace, resolve_space
 from .base import AbstractLLMClient, LLMMessage
 
 logger = logging.getLogger(__name__)
 
 class MistralClient(AbstractLLMClient):
-    def __init__(self, api_key: str, model_id: str = "mistral-large-latest"):
+    def __init__(self, api_key: str, model_id: str = "mistral-large-latest",
+                 embedding_space: Optional[EmbeddingSpace] = None):
         self.client = Mistral(api_key=api_key)
         self.model_id = model_id
+        self.embedding_space = embedding_space or resolve_space(provider="mistral")
 
     async def generate_response(
         self, 
@@ -73,10 +76,21 @@ class MistralClient(AbstractLLMClient):
     async def generate_embedding(self, text: str) -> List[float]:
         try:
             resp = self.client.embeddings.create(
-                model="mistral-embed",
+                model=self.embedding_space.model,
                 inputs=[text]
             )
             return resp.data[0].embedding
         except Exception as e:
             logger.error(f"Error generating embedding with Mistral: {e}")
             raise
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        try:
+            resp = self.client.embeddings.create(
+                model=self.embedding_space.model,
+                inputs=texts
+            )
+            return [d.embedding for d in resp.data]
+        except Exception as e:
+            logger.error(f"Error generating embeddings with Mistral: {e}")
+            raise
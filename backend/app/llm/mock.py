@@ -1,8 +1,13 @@
 import asyncio
 from typing import List, Dict, Any, Optional
+from app.core.config import settings
+from app.core.embeddings import EmbeddingSpace, resolve_space
 from .base import AbstractLLMClient, LLMMessage
 
 class MockLLMClient(AbstractLLMClient):
+    def __init__(self, embedding_space: Optional[EmbeddingSpace] = None):
+        self.embedding_space = embedding_space or resolve_space(provider="mock")
+
     async def generate_response(
         self, 
         messages: List[LLMMessage], 
@@ -10,7 +15,7 @@ class MockLLMClient(AbstractLLMClient):
         temperature: float = 0.7
     ) -> str:
         # Simulate latency
-        await asyncio.sleep(1.0)
+        await asyncio.sleep(settings.MOCK_LLM_LATENCY_SECONDS)
         return "This is a mock response from the AI Agent. Please configure a real LLM Provider for dynamic content."
 
     async def generate_json(
@@ -19,7 +24,7 @@ class MockLLMClient(AbstractLLMClient):
         schema: Dict[str, Any],
         system_prompt: Optional[str] = None
     ) -> Dict[str, Any]:
-        await asyncio.sleep(1.0)
+        await asyncio.sleep(settings.MOCK_LLM_LATENCY_SECONDS)
         # Return a safe default matching the negotiation schema
         return {
             "decision": "COUNTER",
@@ -27,5 +32,8 @@ class MockLLMClient(AbstractLLMClient):
         }
 
     async def generate_embedding(self, text: str) -> List[float]:
-        # Return random or zero vector of length 1536
-        return [0.0] * 1536
+        # Return a zero vector of the configured width
+        return [0.0] * self.embedding_space.dimensions
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return [[0.0] * self.embedding_space.dimensions for _ in texts]
@@ -5,6 +5,7 @@ import os
 from openai import AsyncOpenAI
 from app.llm.base import AbstractLLMClient, LLMMessage
 from app.core.config import settings
+from app.core.embeddings import EmbeddingSpace, NATIVE_DIMENSIONS, resolve_space
 
 logger = logging.getLogger(__name__)
 
@@ -12,11 +13,25 @@ class OpenAIClient(AbstractLLMClient):
     """
     Client for OpenAI API (GPT-4o, etc.)
     """
-    def __init__(self):
+    def __init__(self, embedding_space: Optional[EmbeddingSpace] = None):
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = "gpt-4o" # or gpt-3.5-turbo if cost is concern
+        self.embedding_space = embedding_space or resolve_space(provider="openai")
 
-    async def generate_response(self, messages: List[LLMMessage], system_prompt: Optional[str] = None) -> str:
+    def _embedding_params(self) -> Dict[str, Any]:
+        model, dimensions = self.embedding_space
+        params = {"model": model}
+        # text-embedding-3-* can return shortened vectors directly
+        if dimensions != NATIVE_DIMENSIONS.get(model):
+            params["dimensions"] = dimensions
+        return params
+
+    async def generate_response(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> str:
         """
         Generates a text response from OpenAI.
         """
@@ -31,7 +46,7 @@ class OpenAIClient(AbstractLLMClient):
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=formatted_messages,
-                temperature=0.7
+                temperature=temperature
             )
             return response.choices[0].message.content or ""
         except Exception as e:
@@ -71,9 +86,20 @@ class OpenAIClient(AbstractLLMClient):
         try:
             response = await self.client.embeddings.create(
                 input=text,
-                model="text-embedding-3-small"
+                **self._embedding_params()
             )
             return response.data[0].embedding
         except Exception as e:
             logger.error(f"OpenAI Embedding Error: {e}")
             raise
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        try:
+            response = await self.client.embeddings.create(
+                input=texts,
+                **self._embedding_params()
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+        except Exception as e:
+            logger.error(f"OpenAI Embedding Error: {e}")
+            raise
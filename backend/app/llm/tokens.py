@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.llm.base import LLMMessage
+
+logger = logging.getLogger(__name__)
+
+# Characters per token when no exact tokenizer is available. Claude (Bedrock) and
+# Mistral tokenizers are not published for offline use; these ratios are measured
+# averages on English contract text and err towards over-counting.
+CHARS_PER_TOKEN: Dict[str, float] = {"aws": 3.5, "mistral": 3.5, "openai": 4.0, "mock": 4.0}
+MESSAGE_OVERHEAD_TOKENS = 4  # Role markers and separators per chat message
+OMITTED_NOTE_TOKENS = 12  # "[N earlier messages omitted]"
+TRUNCATION_MARKER = " [...]"
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+@lru_cache(maxsize=4)
+def _tiktoken_encoding(model: str):
+    """
+    tiktoken encoding for an OpenAI model, or None when tiktoken or its BPE files
+    are unavailable (they are downloaded on first use).
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable for {model}, estimating tokens from length: {e}")
+        return None
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens for one provider: exactly with tiktoken for OpenAI,
+    by a calibrated character ratio otherwise.
+    """
+
+    def __init__(self, provider: Optional[str] = None, model: str = "gpt-4o"):
+        self.provider = (provider or os.getenv("LLM_PROVIDER", "mock")).lower()
+        self._encoding = _tiktoken_encoding(model) if self.provider == "openai" else None
+        self._chars_per_token = CHARS_PER_TOKEN.get(self.provider, 3.5)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return int(len(text) / self._chars_per_token) + 1
+
+    def count_messages(self, messages: Sequence[LLMMessage], system_prompt: Optional[str] = None) -> int:
+        total = sum(self.count(m.content) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+        if system_prompt:
+            total += self.count(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+        return total
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut `text` to at most `max_tokens`, marking the cut.
+        """
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return self._encoding.decode(tokens[:max(max_tokens - 2, 0)]) + TRUNCATION_MARKER
+        return text[:int(max(max_tokens - 2, 0) * self._chars_per_token)] + TRUNCATION_MARKER
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(provider: Optional[str] = None) -> TokenCounter:
+    """
+    Shared counter for a provider (default: the configured LLM_PROVIDER).
+    """
+    return TokenCounter(provider)
+
+
+def compact_context(
+    data: Optional[Dict[str, Any]],
+    fields: Optional[Iterable[str]] = None,
+    max_string_tokens: int = 200,
+    counter: Optional[TokenCounter] = None,
+) -> str:
+    """
+    Serialize state for a prompt: keep only `fields`, drop empty values and cap long
+    strings. Ids, timestamps and bookkeeping fields carry no signal for the model.
+
+    Returns:
+        str: Compact JSON.
+    """
+    counter = counter or get_token_counter()
+    wanted = set(fields) if fields is not None else None
+    compact: Dict[str, Any] = {}
+    for key, value in (data or {}).items():
+        if wanted is not None and key not in wanted:
+            continue
+        if value is None or value == "" or value == [] or value == {}:
+            continue
+        if isinstance(value, str):
+            value = counter.truncate(value, max_string_tokens)
+        elif isinstance(value, list):
+            value = [counter.truncate(v, max_string_tokens) if isinstance(v, str) else v for v in value]
+        compact[key] = value
+    return json.dumps(compact, default=str, separators=(",", ":"))
+
+
+def select_passages(
+    passages: Sequence[str],
+    query: str,
+    max_tokens: int,
+    counter: Optional[TokenCounter] = None,
+) -> str:
+    """
+    Join the passages most relevant to `query` (by word overlap) that fit in
+    `max_tokens`, kept in their original order.
+    """
+    counter = counter or get_token_counter()
+    query_words = set(_WORD_RE.findall(query.lower()))
+    ranked = sorted(
+        range(len(passages)),
+        key=lambda i: len(query_words & set(_WORD_RE.findall(passages[i].lower()))),
+        reverse=True,
+    )
+    chosen: List[int] = []
+    used = 0
+    for i in ranked:
+        cost = counter.count(passages[i])
+        if used + cost > max_tokens:
+            continue
+        chosen.append(i)
+        used += cost
+    return "\n".join(passages[i] for i in sorted(chosen))
+
+
+def fit_history(
+    messages: Sequence[LLMMessage],
+    max_tokens: int,
+    counter: Optional[TokenCounter] = None,
+) -> Tuple[List[LLMMessage], int]:
+    """
+    Keep the most recent messages that fit in `max_tokens`. The newest message is
+    always kept (truncated if necessary).
+
+    Returns:
+        Tuple[List[LLMMessage], int]: Kept messages in order, and how many were dropped.
+    """
+    counter = counter or get_token_counter()
+    kept: List[LLMMessage] = []
+    used = 0
+    for message in reversed(messages):
+        cost = counter.count(message.content) + MESSAGE_OVERHEAD_TOKENS
+        if used + cost > max_tokens:
+            if not kept:
+                kept.append(LLMMessage(
+                    role=message.role,
+                    content=counter.truncate(message.content, max_tokens - MESSAGE_OVERHEAD_TOKENS),
+                ))
+            break
+        kept.append(message)
+        used += cost
+    kept.reverse()
+    return kept, len(messages) - len(kept)
+
+
+class PromptBudget:
+    """
+    Fits a prompt into a token budget before it is sent, and logs its size.
+
+    The system prompt and the last message (the current request) are always sent;
+    older messages are dropped oldest-first and a one-line note records how many.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, counter: Optional[TokenCounter] = None):
+        self.max_tokens = max_tokens or settings.LLM_PROMPT_MAX_TOKENS
+        self.counter = counter or get_token_counter()
+
+    def fit(
+        self,
+        label: str,
+        messages: Sequence[LLMMessage],
+        system_prompt: Optional[str] = None,
+    ) -> List[LLMMessage]:
+        """
+        Args:
+            label: Call site, for the prompt-size log line.
+            messages: Chat messages, oldest first.
+            system_prompt: System prompt sent alongside the messages.
+
+        Returns:
+            List[LLMMessage]: Messages to send.
+        """
+        budget = self.max_tokens - self.counter.count_messages([], system_prompt) - OMITTED_NOTE_TOKENS
+        fitted, dropped = fit_history(messages, budget, self.counter)
+        if dropped:
+            # Folded into the oldest kept message so user/assistant turns keep alternating
+            first = fitted[0]
+            fitted[0] = LLMMessage(role=first.role, content=f"[{dropped} earlier messages omitted]\n{first.content}")
+        tokens = self.counter.count_messages(fitted, system_prompt)
+        logger.info(
+            f"Prompt {label}: {tokens} tokens ({len(fitted)} messages"
+            f"{f', {dropped} dropped' if dropped else ''}; budget {self.max_tokens}, {self.counter.provider})"
+        )
+        return fitted
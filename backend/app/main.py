@@ -2,9 +2,12 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 
+from app.agent.admission import AdmissionRejected
+
 # Configure Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -12,16 +15,67 @@ logging.basicConfig(
 )
 logger = logging.getLogger("nexus_core")
 
+async def _reload_policy_index(interval: float):
+    # Each worker holds its own policy index; policy edits are only applied by the
+    # worker that served them, the others catch up here
+    from app.database import async_session
+    from app.policy.index import load_policy_index
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_session() as session:
+                await load_policy_index(session)
+        except Exception as e:
+            logger.warning(f"Policy index reload failed: {e}")
+
+async def _watch_sanctions_lists(interval: float):
+    # Rebuilds the screening index when list files are added, replaced or removed
+    from app.supplier.sanctions_index import reload_sanctions_index
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reload_sanctions_index()
+        except Exception as e:
+            logger.warning(f"Sanctions list reload failed: {e}")
+
 # Define lifespan (startup/shutdown) events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Initialize DB, models, etc.
     logger.info("Nexus Core: System Initializing...")
-    from app.database import init_db
-    await init_db()
+    from app.database import init_db, get_session
+    from app.policy.index import load_policy_index
+    from app.core.config import settings
+    if settings.SKIP_INIT_DB:
+        logger.info("Schema setup done by the launcher; skipping init_db.")
+    else:
+        await init_db()
+    async for session in get_session():
+        await load_policy_index(session)
+    reloader = None
+    reload_seconds = settings.policy_index_reload_seconds
+    if reload_seconds > 0:
+        reloader = asyncio.create_task(_reload_policy_index(reload_seconds))
+    elif settings.GRAPH_CHECKPOINTER == "database":
+        logger.warning("POLICY_INDEX_RELOAD_SECONDS=0 with the database checkpointer: policy edits made "
+                       "through other workers will not reach this worker's policy index.")
+    sanctions_watcher = None
+    if settings.SANCTIONS_SCREENING == "local":
+        from app.supplier.sanctions_index import reload_sanctions_index
+        await reload_sanctions_index()
+        if settings.SANCTIONS_LIST_RELOAD_SECONDS > 0:
+            sanctions_watcher = asyncio.create_task(_watch_sanctions_lists(settings.SANCTIONS_LIST_RELOAD_SECONDS))
     yield
     # Shutdown: Clean up connections
     logger.info("Nexus Core: System Shutting Down...")
+    if reloader is not None:
+        reloader.cancel()
+    if sanctions_watcher is not None:
+        sanctions_watcher.cancel()
+    from app.agent.transcript import get_transcript_writer
+    await get_transcript_writer().close()
+    from app.supplier.adapters.http import close_http_client
+    await close_http_client()
 
 app = FastAPI(
     title="Agentic Contract Negotiator",
@@ -53,6 +107,14 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"message": "Internal Server Error", "detail": str(exc)},
     )
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"message": "Too many negotiations in progress", "detail": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
@@ -69,6 +131,41 @@ async def root():
         "message": "Welcome to the Agentic Contract Negotiator API"
     }
 
+@app.get("/health")
+async def health():
+    """
+    Liveness: the worker process is serving requests.
+    """
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness: the database is reachable and the policy index is loaded. Load
+    balancers should only route to workers answering 200 here.
+    """
+    from sqlalchemy import text
+    from app.core.config import settings
+    from app.database import async_session
+    from app.policy.index import get_policy_index
+
+    checks = {"database": True, "policy_index": get_policy_index().generation > 0}
+    if settings.SANCTIONS_SCREENING == "local":
+        from app.supplier.sanctions_index import get_sanctions_index
+        checks["sanctions_index"] = len(get_sanctions_index()) > 0
+    try:
+        async with async_session() as session:
+            await session.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning(f"Readiness check: database unavailable: {e}")
+        checks["database"] = False
+    is_ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "not_ready", "checks": checks,
+                 "checkpointer": settings.GRAPH_CHECKPOINTER},
+    )
+
 from app.policy import api as policy
 from app.supplier import api as supplier
 from app.contract import api as contract
@@ -1,37 +1,51 @@
 from datetime import datetime
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from uuid import UUID, uuid4
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON, LargeBinary
+from app.core.embeddings import active_embedding_space
 
 # Dynamic Vector Type based on available drivers/config
 # Ideally we check settings, but simple try-import works for minimal dependencies
 try:
     from pgvector.sqlalchemy import Vector
-    vector_type = Vector(1536)
+    # Width follows the configured embedding model (EMBEDDING_MODEL / EMBEDDING_DIMENSIONS)
+    vector_type = Vector(active_embedding_space().dimensions)
 except ImportError:
     vector_type = JSON # Fallback for SQLite to avoid crashes on model definition
 
 class ContractChunk(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    contract_id: UUID = Field(foreign_key="contract.id")
+    contract_id: UUID = Field(foreign_key="contract.id", index=True)
     chunk_index: int
     content: str
     # If using SQLite, this will just be a JSON field (no similarity search)
     embedding: List[float] = Field(sa_column=Column(vector_type))  
+    # Compact binary copies (see app.core.embeddings): float32 for exact scoring,
+    # optional float16/int8 quantized copy for the coarse scan
+    embedding_blob: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    embedding_q: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    # Embedding space ("<model>@<dimensions>"); several can coexist while re-embedding
+    embedding_model: str = Field(default="", index=True)
     
     contract: "Contract" = Relationship(back_populates="chunks")
 
 class PolicyChunk(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    policy_id: UUID = Field(foreign_key="policy.id")
+    policy_id: UUID = Field(foreign_key="policy.id", index=True)
     chunk_index: int
     content: str
     embedding: List[float] = Field(sa_column=Column(vector_type))
+    embedding_blob: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    embedding_q: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    embedding_model: str = Field(default="", index=True)
 
     policy: "Policy" = Relationship(back_populates="chunks")
 
 class SupplierRiskProfile(SQLModel, table=True):
+    # Time-series reads are "one supplier, a time range"; see app.supplier.history
+    __table_args__ = (Index("ix_supplierriskprofile_supplier_time", "supplier_id", "retrieved_at"),)
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     supplier_id: UUID = Field(foreign_key="supplier.id")
     retrieved_at: datetime = Field(default_factory=datetime.utcnow)
@@ -65,12 +79,38 @@ class SupplierPerformance(SQLModel, table=True):
     
     supplier: "Supplier" = Relationship(back_populates="performance_reports")
 
+class SupplierPerformanceRollup(SQLModel, table=True):
+    """
+    Running totals of a supplier's performance reports per calendar month / quarter
+    (by report period_end), maintained on insert by app.supplier.performance.
+    Trend and ranking queries read these instead of the raw reports.
+    """
+    __table_args__ = (
+        Index("ux_supplierperformancerollup_key", "supplier_id", "period_type", "period_start", unique=True),
+        # Rankings: all suppliers in one period
+        Index("ix_supplierperformancerollup_period", "period_type", "period_start"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    supplier_id: UUID = Field(foreign_key="supplier.id")
+    period_type: str  # "month" or "quarter"
+    period_start: datetime
+    report_count: int = 0
+    quality_sum: float = 0.0
+    delivery_sum: float = 0.0
+    cost_sum: float = 0.0
+    overall_sum: float = 0.0
+    overall_min: Optional[float] = None
+    overall_max: Optional[float] = None
+
 class Supplier(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     name: str = Field(index=True)
     domain: Optional[str] = None
     lei: Optional[str] = Field(default=None, description="Legal Entity Identifier")
     risk_score: float = Field(default=0.0)
+    # Latest SupplierRiskProfile (no FK: the tables would reference each other)
+    current_risk_profile_id: Optional[UUID] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     contracts: List["Contract"] = Relationship(back_populates="supplier")
@@ -88,15 +128,39 @@ class Policy(SQLModel, table=True):
 
 class Contract(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    supplier_id: Optional[UUID] = Field(default=None, foreign_key="supplier.id")
+    supplier_id: Optional[UUID] = Field(default=None, foreign_key="supplier.id", index=True)
     title: str
     status: str = "draft"
     content_text: Optional[str] = None
+    # SHA-256 of the uploaded file; a re-upload of the same file reuses this contract
+    content_hash: Optional[str] = Field(default=None, index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     supplier: Optional[Supplier] = Relationship(back_populates="contracts")
     negotiations: List["Negotiation"] = Relationship(back_populates="contract")
     chunks: List["ContractChunk"] = Relationship(back_populates="contract")
+    clauses: List["ContractClause"] = Relationship(back_populates="contract")
+
+class ContractClause(SQLModel, table=True):
+    """
+    A numbered clause segmented from Contract.content_text (see app.contract.clauses).
+    """
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    contract_id: UUID = Field(foreign_key="contract.id", index=True)
+    clause_index: int
+    number: Optional[str] = None  # "12.3"; None for text before the first numbered clause
+    heading: Optional[str] = None
+    content: str
+    category: str = Field(default="other", index=True)  # payment, liability, renewal, ...
+    classified_by: str = "rules"  # "rules" or "llm"
+    # Character offsets into Contract.content_text
+    start_offset: int
+    end_offset: int
+    # Normalized terms: payment_days, liability_cap, durations_days, amounts, percentages...
+    terms: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    contract: Contract = Relationship(back_populates="clauses")
 
 class Negotiation(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -111,11 +175,43 @@ class Negotiation(SQLModel, table=True):
     messages: List["NegotiationMessage"] = Relationship(back_populates="negotiation")
 
 class NegotiationMessage(SQLModel, table=True):
+    # Transcript reads are "one thread, in time order"
+    __table_args__ = (Index("ix_negotiationmessage_thread_time", "negotiation_id", "timestamp"),)
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     negotiation_id: UUID = Field(foreign_key="negotiation.id")
     content: str
     type: str = Field(description="proposal or response")
     sender: str = Field(description="company or supplier")
+    sequence: Optional[int] = Field(default=None, description="Position in the thread transcript")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     negotiation: Negotiation = Relationship(back_populates="messages")
+
+class GraphCheckpoint(SQLModel, table=True):
+    """
+    LangGraph checkpoint (see app.agent.checkpoint). Shared by all API workers, so
+    a thread can be resumed by any of them.
+    """
+    thread_id: str = Field(primary_key=True)
+    checkpoint_ns: str = Field(default="", primary_key=True)
+    checkpoint_id: str = Field(primary_key=True)  # uuid6: sorts by creation time
+    parent_checkpoint_id: Optional[str] = None
+    type: str
+    checkpoint: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    metadata_type: str
+    checkpoint_metadata: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+
+class GraphCheckpointWrite(SQLModel, table=True):
+    """
+    Pending writes of a checkpoint, including interrupts awaiting a human decision.
+    """
+    thread_id: str = Field(primary_key=True)
+    checkpoint_ns: str = Field(default="", primary_key=True)
+    checkpoint_id: str = Field(primary_key=True)
+    task_id: str = Field(primary_key=True)
+    idx: int = Field(primary_key=True)
+    channel: str
+    type: str
+    value: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    task_path: str = ""
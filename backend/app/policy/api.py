@@ -1,13 +1,106 @@
-from fastapi import APIRouter
-from app.models import Policy
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlmodel import Session
+from app.core.rag import RAGService
+from app.core.search import SearchFilters
+from app.database import get_session
+from app.models import Policy, PolicyChunk
+from app.policy.index import get_policy_index, refresh_policy
+from app.policy.rules import prescreen_stats
 
 router = APIRouter(tags=["policy"])
 
+class PolicyCreate(BaseModel):
+    name: str
+    version: str
+    text_content: str
+    is_active: bool = True
+
+class PolicyUpdate(BaseModel):
+    name: Optional[str] = None
+    version: Optional[str] = None
+    text_content: Optional[str] = None
+    is_active: Optional[bool] = None
+
 @router.get("/")
 async def list_policies():
-    return {"message": "Policy module active"}
+    index = get_policy_index()
+    return {
+        "index_generation": index.generation,
+        "policies": [
+            {"id": str(p.id), "name": p.name, "version": p.version, "rules": len(p.rules)}
+            for p in index.active()
+        ]
+    }
+
+@router.post("/", response_model=Policy)
+async def create_policy(payload: PolicyCreate, session: Session = Depends(get_session)):
+    """
+    Create a policy, embed its chunks and swap it into the in-memory policy index.
+    """
+    policy = Policy(**payload.dict())
+    session.add(policy)
+    await session.commit()
+    await session.refresh(policy)
+
+    await RAGService().ingest_policy(session, policy.id, policy.text_content)
+    await refresh_policy(session, policy.id)
+    return policy
+
+@router.put("/{policy_id}", response_model=Policy)
+async def update_policy(policy_id: UUID, payload: PolicyUpdate, session: Session = Depends(get_session)):
+    """
+    Update a policy and atomically swap the refreshed entry into the policy index.
+    Changed text is re-chunked and re-embedded.
+    """
+    policy = await session.get(Policy, policy_id)
+    if not policy:
+        raise HTTPException(status_code=404, detail="Policy not found")
+
+    changes = payload.dict(exclude_unset=True)
+    text_changed = "text_content" in changes and changes["text_content"] != policy.text_content
+    for field, value in changes.items():
+        setattr(policy, field, value)
+    session.add(policy)
+    await session.commit()
+    await session.refresh(policy)
+
+    if text_changed:
+        await session.execute(delete(PolicyChunk).where(PolicyChunk.policy_id == policy_id))
+        await RAGService().ingest_policy(session, policy.id, policy.text_content)
+
+    await refresh_policy(session, policy.id)
+    return policy
+
+@router.get("/search")
+async def search_policies(
+    q: str,
+    limit: int = 5,
+    policy_id: Optional[UUID] = None,
+    version: Optional[str] = None,
+    session: Session = Depends(get_session)
+):
+    """
+    Hybrid (keyword + semantic) search over policy chunks, optionally scoped to a policy/version.
+    """
+    filters = SearchFilters(policy_id=policy_id, policy_version=version)
+    chunks = await RAGService().hybrid_search_policies(session, q, limit=limit, filters=filters)
+    return [
+        {"id": str(c.id), "policy_id": str(c.policy_id), "chunk_index": c.chunk_index, "content": c.content}
+        for c in chunks
+    ]
 
 @router.post("/check")
 async def check_compliance(clause: str):
     # Placeholder for Agent/RAG logic
     return {"compliant": True, "analysis": "Placeholder analysis"}
+
+@router.get("/prescreen/stats")
+async def get_prescreen_stats():
+    """
+    Fraction of clause evaluations resolved by the rule pre-screen without an LLM call.
+    """
+    return prescreen_stats.to_dict()
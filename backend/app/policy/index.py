@@ -0,0 +1,227 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlmodel import Session, select
+
+from app.core.embeddings import active_embedding_space, chunk_vector
+from app.models import Policy, PolicyChunk
+from app.policy.rules import ComplianceRule, compile_policy_text, extract_terms
+
+logger = logging.getLogger(__name__)
+
+
+class PolicyEntry:
+    """
+    Read-only snapshot of an active policy, its chunks and its compiled rules.
+
+    Exposes the same attributes as `Policy` (id, name, version, text_content)
+    so it can be passed anywhere a Policy is evaluated.
+    """
+
+    __slots__ = ("id", "name", "version", "text_content", "rules", "chunks")
+
+    def __init__(
+        self,
+        id: UUID,
+        name: str,
+        version: str,
+        text_content: str,
+        rules: Tuple[ComplianceRule, ...],
+        chunks: Tuple[str, ...],
+    ):
+        self.id = id
+        self.name = name
+        self.version = version
+        self.text_content = text_content
+        self.rules = rules
+        self.chunks = chunks
+
+    @classmethod
+    def from_policy(cls, policy: Policy, chunks: Iterable[PolicyChunk] = ()) -> "PolicyEntry":
+        ordered = sorted(chunks, key=lambda c: c.chunk_index)
+        return cls(
+            id=policy.id,
+            name=policy.name,
+            version=policy.version,
+            text_content=policy.text_content,
+            rules=compile_policy_text(policy.text_content),
+            chunks=tuple(c.content for c in ordered),
+        )
+
+    @property
+    def rule_terms(self) -> frozenset:
+        return frozenset(r.term for r in self.rules)
+
+
+class PolicyIndex:
+    """
+    Immutable in-memory index of active policies.
+
+    A new index is built for every change and swapped in as a whole, so readers
+    never observe a partially updated index and need no locking.
+
+    Attributes:
+        generation (int): Monotonic stamp incremented on every swap.
+        built_at (datetime): When this snapshot was built.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[PolicyEntry] = (),
+        embeddings: Optional[Dict[UUID, List[List[float]]]] = None,
+        generation: int = 0,
+    ):
+        ordered = list(entries)
+        self.entries: Mapping[UUID, PolicyEntry] = MappingProxyType({e.id: e for e in ordered})
+        self._order: Tuple[UUID, ...] = tuple(e.id for e in ordered)
+        self.generation = generation
+        self.built_at = datetime.now(timezone.utc)
+
+        # Flattened chunk matrix for in-memory similarity search
+        refs: List[Tuple[UUID, int]] = []
+        vectors: List[List[float]] = []
+        for policy_id, policy_vectors in (embeddings or {}).items():
+            for i, vector in enumerate(policy_vectors):
+                if vector is not None:
+                    refs.append((policy_id, i))
+                    vectors.append(vector)
+        self._chunk_refs: Tuple[Tuple[UUID, int], ...] = tuple(refs)
+        self._matrix = np.asarray(vectors, dtype=np.float32) if vectors else None
+        if self._matrix is not None:
+            self._matrix.setflags(write=False)
+        self._embeddings = MappingProxyType(dict(embeddings or {}))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, policy_id: UUID) -> Optional[PolicyEntry]:
+        return self.entries.get(policy_id)
+
+    def active(self) -> List[PolicyEntry]:
+        return [self.entries[pid] for pid in self._order]
+
+    def select_for_clause(self, clause_text: str, terms: Optional[Dict] = None) -> Optional[PolicyEntry]:
+        """
+        Pick the policy to evaluate a clause against.
+
+        Prefers the policy whose compiled rules cover the most terms extracted
+        from the clause (or the pre-extracted `terms`); falls back to the first
+        active policy.
+        """
+        if not self._order:
+            return None
+        terms = set(extract_terms(clause_text) if terms is None else terms)
+        best = self.entries[self._order[0]]
+        if terms:
+            best = max(self.active(), key=lambda e: len(terms & e.rule_terms))
+        return best
+
+    def search(self, query_embedding: List[float], limit: int = 5) -> List[Tuple[PolicyEntry, str]]:
+        """
+        L2 nearest-neighbour search over all cached policy chunks.
+
+        Returns:
+            List[Tuple[PolicyEntry, str]]: (policy, chunk content) pairs, nearest first.
+        """
+        if self._matrix is None:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        distances = np.linalg.norm(self._matrix - query, axis=1)
+        k = min(limit, len(distances))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        results = []
+        for i in top:
+            policy_id, chunk_index = self._chunk_refs[i]
+            entry = self.entries[policy_id]
+            results.append((entry, entry.chunks[chunk_index]))
+        return results
+
+    def replace(self, entry: Optional[PolicyEntry], policy_id: UUID,
+                embeddings: Optional[List[List[float]]] = None) -> "PolicyIndex":
+        """
+        Return a new index with one policy added, replaced or (entry=None) removed.
+        """
+        entries = [e for e in self.active() if e.id != policy_id]
+        vectors = {pid: v for pid, v in self._embeddings.items() if pid != policy_id}
+        if entry is not None:
+            entries.append(entry)
+            if embeddings:
+                vectors[policy_id] = embeddings
+        return PolicyIndex(entries, vectors, generation=self.generation + 1)
+
+
+_current_index = PolicyIndex()
+_swap_lock = asyncio.Lock()
+
+
+def get_policy_index() -> PolicyIndex:
+    """
+    Returns the current policy index snapshot (an in-memory operation).
+    """
+    return _current_index
+
+
+def _swap(index: PolicyIndex):
+    global _current_index
+    _current_index = index
+    logger.info(f"Policy index generation {index.generation} active ({len(index)} policies).")
+
+
+async def _load_chunks(session: Session, policy_ids: List[UUID]) -> Dict[UUID, List[PolicyChunk]]:
+    grouped: Dict[UUID, List[PolicyChunk]] = {pid: [] for pid in policy_ids}
+    if not policy_ids:
+        return grouped
+    result = await session.execute(
+        select(PolicyChunk).where(
+            PolicyChunk.policy_id.in_(policy_ids),
+            PolicyChunk.embedding_model.in_([active_embedding_space().key, ""]),
+        )
+    )
+    for chunk in result.scalars().all():
+        grouped.setdefault(chunk.policy_id, []).append(chunk)
+    return grouped
+
+
+def _chunk_embeddings(chunks: List[PolicyChunk]) -> List[Optional[np.ndarray]]:
+    ordered = sorted(chunks, key=lambda c: c.chunk_index)
+    return [chunk_vector(c) for c in ordered]
+
+
+async def load_policy_index(session: Session) -> PolicyIndex:
+    """
+    Build the index from all active policies and swap it in. Called at startup.
+    """
+    async with _swap_lock:
+        result = await session.execute(select(Policy).where(Policy.is_active == True))  # noqa: E712
+        policies = list(result.scalars().all())
+        chunks = await _load_chunks(session, [p.id for p in policies])
+
+        entries = [PolicyEntry.from_policy(p, chunks.get(p.id, [])) for p in policies]
+        embeddings = {p.id: _chunk_embeddings(chunks.get(p.id, [])) for p in policies}
+        index = PolicyIndex(entries, embeddings, generation=_current_index.generation + 1)
+        _swap(index)
+        return index
+
+
+async def refresh_policy(session: Session, policy_id: UUID) -> PolicyIndex:
+    """
+    Re-read a single policy after it was created/updated and swap in a new index.
+    Inactive or deleted policies are dropped from the index.
+    """
+    async with _swap_lock:
+        policy = await session.get(Policy, policy_id)
+        if policy is None or not policy.is_active:
+            index = _current_index.replace(None, policy_id)
+        else:
+            chunks = (await _load_chunks(session, [policy_id]))[policy_id]
+            index = _current_index.replace(
+                PolicyEntry.from_policy(policy, chunks), policy_id, _chunk_embeddings(chunks)
+            )
+        _swap(index)
+        return index
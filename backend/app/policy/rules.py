@@ -0,0 +1,435 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Supported mechanically-decidable terms
+TERM_PAYMENT_DAYS = "payment_days"
+TERM_RENEWAL_TERM = "renewal_term"
+TERM_LIABILITY_CAP = "liability_cap"
+TERM_AUDIT_RIGHTS = "audit_rights"
+RULE_TERMS = (TERM_PAYMENT_DAYS, TERM_RENEWAL_TERM, TERM_LIABILITY_CAP, TERM_AUDIT_RIGHTS)
+
+UNLIMITED = float("inf")
+
+_WORD_NUMBERS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fourteen": 14,
+    "fifteen": 15, "twenty": 20, "thirty": 30, "forty-five": 45, "sixty": 60,
+    "ninety": 90, "one hundred twenty": 120,
+}
+_UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+# Precompiled patterns (compiled once at import so a pre-screen costs microseconds)
+_NUM = r"(?:\d+|" + "|".join(sorted((re.escape(w) for w in _WORD_NUMBERS), key=len, reverse=True)) + r")"
+_DURATION_RE = re.compile(
+    rf"\b(?P<num>{_NUM})(?:\s*\((?P<paren>\d+)\))?[\s-]*(?:business\s+|calendar\s+)?(?P<unit>day|week|month|year)s?\b",
+    re.IGNORECASE,
+)
+_NET_RE = re.compile(r"\bnet[\s-]*(?P<days>\d+)\b", re.IGNORECASE)
+_PAYMENT_CONTEXT_RE = re.compile(r"\b(invoice|payment|payable|paid|remit)", re.IGNORECASE)
+_RENEWAL_RE = re.compile(r"\b(auto(?:matic(?:ally)?)?[\s-]*renew\w*|renew\w*)", re.IGNORECASE)
+_LIABILITY_RE = re.compile(r"\bliabilit(?:y|ies)\b", re.IGNORECASE)
+_UNLIMITED_RE = re.compile(r"\b(unlimited|uncapped|without\s+limit(?:ation)?|shall\s+not\s+be\s+limited)\b", re.IGNORECASE)
+# A negation right before an "unlimited" phrase ("shall not be unlimited") reverses it
+_NEGATED_RE = re.compile(r"\b(?:not|never|no)\b(?:\s+\w+)?\s*$", re.IGNORECASE)
+_AMOUNT_RE = re.compile(
+    r"(?:(?P<cur1>[$€£])\s?|(?P<code1>USD|EUR|GBP)\s+)?"
+    r"(?P<amount>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"\s*(?P<scale>k|m|million|thousand)?\b"
+    r"(?:\s*(?P<code2>USD|EUR|GBP))?",
+    re.IGNORECASE,
+)
+_AUDIT_RE = re.compile(r"\baudit", re.IGNORECASE)
+# Sentences (or ";"-separated parts) of a clause, each checked for obligations on its own
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.;!?])\s+|\n\s*\n")
+_OBLIGATION_RE = re.compile(
+    r"\b(shall|must|will|agrees?|undertakes?|required|obliged|obligated|responsible|entitled|may|"
+    r"payable|due|accrue\w*|indemnif\w*|warrant\w*|liab\w*|pay\w*|renew\w*|terminat\w*|audit\w*)\b",
+    re.IGNORECASE,
+)
+MIN_OBLIGATION_WORDS = 4  # Shorter fragments are numbering or headings ("Limitation of Liability.")
+_AUDIT_DENIED_RE = re.compile(
+    r"\b(no\s+(?:right|rights)\s+to\s+(?:inspect\s+or\s+)?audit|no\s+audit\s+rights?|"
+    r"(?:shall|will|may)\s+not\s+(?:be\s+entitled\s+to\s+|have\s+the\s+right\s+to\s+)?audit|"
+    r"waives?\s+(?:any|all|its)\s+(?:right|rights)\s+to\s+audit)",
+    re.IGNORECASE,
+)
+_AUDIT_GRANTED_RE = re.compile(
+    r"\b((?:right|rights|entitled)\s+to\s+(?:inspect\s+(?:and|or)\s+)?audit|audit\s+rights?|"
+    r"(?:shall|will|may)\s+(?:be\s+permitted\s+to\s+)?audit)",
+    re.IGNORECASE,
+)
+
+
+class ComplianceRule(BaseModel):
+    """
+    A single mechanically-decidable policy requirement.
+
+    Durations are normalized to days and amounts to plain currency units so
+    comparisons never need to re-parse policy text at evaluation time.
+    """
+    rule_id: str
+    term: str                                # payment_days, renewal_term, liability_cap, audit_rights
+    operator: str                            # "min", "max", "required"
+    value: Optional[float] = None
+    description: str = ""
+    applies_when: List[str] = []             # Optional keywords scoping the rule to matching clauses
+
+
+class RuleVerdict(BaseModel):
+    status: str  # "COMPLIANT" or "NON_COMPLIANT"
+    reasoning: str
+    flagged_issues: List[str]
+    matched_rules: List[str]
+
+
+class PrescreenStats:
+    """
+    Counts how many clause evaluations were resolved by the rule engine
+    without an LLM call.
+    """
+
+    def __init__(self):
+        self.evaluated = 0
+        self.resolved_by_rules = 0
+
+    def record(self, resolved: bool):
+        self.evaluated += 1
+        if resolved:
+            self.resolved_by_rules += 1
+
+    @property
+    def resolution_rate(self) -> float:
+        return self.resolved_by_rules / self.evaluated if self.evaluated else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "clauses_evaluated": self.evaluated,
+            "resolved_without_llm": self.resolved_by_rules,
+            "resolution_rate": round(self.resolution_rate, 4),
+        }
+
+
+prescreen_stats = PrescreenStats()
+
+
+# --- Term extraction ---
+
+def _to_number(token: str) -> Optional[float]:
+    token = token.strip().lower()
+    if token.isdigit():
+        return float(token)
+    return _WORD_NUMBERS.get(token)
+
+
+def parse_duration_days(text: str) -> Optional[float]:
+    """
+    Parse the first duration in `text` ("Net 45", "seven (7) days", "1 year") into days.
+    """
+    match = _NET_RE.search(text)
+    if match:
+        return float(match.group("days"))
+    match = _DURATION_RE.search(text)
+    if not match:
+        return None
+    num = _to_number(match.group("paren") or match.group("num"))
+    if num is None:
+        return None
+    return num * _UNIT_DAYS[match.group("unit").lower()]
+
+
+def find_durations_days(text: str) -> List[float]:
+    """
+    All durations in `text` ("Net 45", "seven (7) days", "1 year"), in days.
+    """
+    days = [float(m.group("days")) for m in _NET_RE.finditer(text)]
+    for match in _DURATION_RE.finditer(text):
+        num = _to_number(match.group("paren") or match.group("num"))
+        if num is not None:
+            days.append(num * _UNIT_DAYS[match.group("unit").lower()])
+    return days
+
+
+def find_amounts(text: str) -> List[float]:
+    """
+    All monetary amounts in `text` ("$5,000", "USD 2m"), in currency units.
+    Only numbers explicitly marked as money are returned.
+    """
+    amounts = []
+    for match in _AMOUNT_RE.finditer(text):
+        if not (match.group("cur1") or match.group("code1") or match.group("code2")):
+            continue
+        amount = float(match.group("amount").replace(",", ""))
+        scale = (match.group("scale") or "").lower()
+        if scale in ("k", "thousand"):
+            amount *= 1_000
+        elif scale in ("m", "million"):
+            amount *= 1_000_000
+        amounts.append(amount)
+    return amounts
+
+
+def parse_amount(text: str) -> Optional[float]:
+    """
+    Parse the monetary amount in `text` ("$5,000", "USD 2m", "unlimited") into currency units.
+
+    "Unlimited" only counts where it states the amount; negated phrases ("shall not
+    be unlimited") do not. Returns None if no amount is stated or several different
+    ones are, since then the text does not give a single cap.
+    """
+    values = find_amounts(text)
+    for match in _UNLIMITED_RE.finditer(text):
+        if not _NEGATED_RE.search(text[:match.start()]):
+            values.append(UNLIMITED)
+    return _single_value(values) if values else None
+
+
+def _single_value(values: List[float]) -> Optional[float]:
+    # Conflicting values within one clause are not mechanically decidable
+    unique = set(values)
+    return values[0] if len(unique) == 1 else None
+
+
+def extract_terms(text: str) -> Dict[str, Any]:
+    """
+    Extract normalized, mechanically comparable terms from a clause.
+
+    Returns:
+        Dict: Subset of {payment_days, renewal_term, liability_cap, audit_rights}.
+              Terms that are absent or ambiguous are omitted.
+    """
+    terms: Dict[str, Any] = {}
+
+    if _PAYMENT_CONTEXT_RE.search(text):
+        days = [float(m.group("days")) for m in _NET_RE.finditer(text)]
+        if not days:
+            days = [
+                _to_number(m.group("paren") or m.group("num")) * _UNIT_DAYS[m.group("unit").lower()]
+                for m in _DURATION_RE.finditer(text)
+                if _to_number(m.group("paren") or m.group("num")) is not None
+            ]
+        value = _single_value(days) if days else None
+        if value is not None:
+            terms[TERM_PAYMENT_DAYS] = value
+
+    renewal = _RENEWAL_RE.search(text)
+    if renewal:
+        # The renewal term is the first duration following the renewal verb;
+        # later durations are usually notice periods.
+        value = parse_duration_days(text[renewal.end():])
+        if value is not None:
+            terms[TERM_RENEWAL_TERM] = value
+
+    if _LIABILITY_RE.search(text):
+        value = parse_amount(text)
+        if value is not None:
+            terms[TERM_LIABILITY_CAP] = value
+
+    if _AUDIT_RE.search(text):
+        if _AUDIT_DENIED_RE.search(text):
+            terms[TERM_AUDIT_RIGHTS] = False
+        elif _AUDIT_GRANTED_RE.search(text):
+            terms[TERM_AUDIT_RIGHTS] = True
+
+    return terms
+
+
+# --- Rule compilation ---
+
+def _parse_rule_value(term: str, raw: Any) -> Optional[float]:
+    if raw is None or isinstance(raw, bool):
+        return None
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    if term == TERM_LIABILITY_CAP:
+        if _UNLIMITED_RE.search(str(raw)):
+            return UNLIMITED
+        amount = parse_amount(str(raw))
+        if amount is None:
+            match = _AMOUNT_RE.search(str(raw))
+            amount = float(match.group("amount").replace(",", "")) if match else None
+        return amount
+    return parse_duration_days(str(raw))
+
+
+def _compile_rule(entry: Dict[str, Any]) -> Optional[ComplianceRule]:
+    term = entry.get("term")
+    if term not in RULE_TERMS:
+        logger.warning(f"Skipping compliance rule with unsupported term: {entry}")
+        return None
+
+    operator = next((op for op in ("min", "max", "required") if op in entry), None)
+    if operator is None:
+        logger.warning(f"Skipping compliance rule without operator: {entry}")
+        return None
+
+    value = None
+    if operator != "required":
+        value = _parse_rule_value(term, entry[operator])
+        if value is None:
+            logger.warning(f"Skipping compliance rule with unparseable value: {entry}")
+            return None
+
+    return ComplianceRule(
+        rule_id=str(entry.get("rule_id", term)),
+        term=term,
+        operator=operator,
+        value=value,
+        description=entry.get("description", ""),
+        applies_when=[kw.lower() for kw in entry.get("applies_when", [])],
+    )
+
+
+def compile_rules(policy_doc: Dict[str, Any]) -> List[ComplianceRule]:
+    """
+    Compile the mechanically-decidable parts of a structured policy document.
+
+    Sources:
+        - `compliance_rules`: explicit list of {rule_id, term, min|max|required, applies_when}.
+        - `contract_drafting.standard_terms.payment_terms`: e.g. "Net 60 days standard,
+          Net 45 for small business" becomes a minimum of the most lenient value (45).
+    """
+    rules: List[ComplianceRule] = []
+
+    for entry in policy_doc.get("compliance_rules") or []:
+        if isinstance(entry, dict):
+            rule = _compile_rule(entry)
+            if rule:
+                rules.append(rule)
+
+    standard_terms = (policy_doc.get("contract_drafting") or {}).get("standard_terms") or {}
+    payment_terms = standard_terms.get("payment_terms")
+    if isinstance(payment_terms, str) and not any(r.term == TERM_PAYMENT_DAYS for r in rules):
+        days = [float(d) for d in _NET_RE.findall(payment_terms)]
+        if days:
+            rules.append(ComplianceRule(
+                rule_id="standard_terms.payment_terms",
+                term=TERM_PAYMENT_DAYS,
+                operator="min",
+                value=min(days),
+                description=payment_terms,
+            ))
+
+    return rules
+
+
+@lru_cache(maxsize=256)
+def compile_policy_text(text_content: str) -> Tuple[ComplianceRule, ...]:
+    """
+    Compile rules from a policy's raw text. Non-YAML (free text) policies yield no rules.
+    Cached on the text itself so repeated evaluations never re-parse the policy.
+    """
+    try:
+        doc = yaml.safe_load(text_content)
+    except yaml.YAMLError:
+        return ()
+    if not isinstance(doc, dict):
+        return ()
+    return tuple(compile_rules(doc))
+
+
+# --- Evaluation ---
+
+def _format(term: str, value: Any) -> str:
+    if isinstance(value, bool):
+        return "granted" if value else "excluded"
+    if value == UNLIMITED:
+        return "unlimited"
+    if term == TERM_LIABILITY_CAP:
+        return f"{value:,.0f}"
+    return f"{value:g} days"
+
+
+def _check(rule: ComplianceRule, actual: Any) -> bool:
+    if rule.operator == "required":
+        return bool(actual)
+    if rule.operator == "min":
+        return actual >= rule.value
+    return actual <= rule.value
+
+
+def _uncovered_obligations(contract_text: str, covered: set) -> List[str]:
+    """
+    Sentences of a clause that state an obligation the matched rules do not decide,
+    either because no supported term could be extracted from them or because a
+    term they state has no matching rule.
+    """
+    uncovered = []
+    for sentence in _SENTENCE_SPLIT_RE.split(contract_text):
+        sentence = sentence.strip()
+        if len(sentence.split()) < MIN_OBLIGATION_WORDS or not _OBLIGATION_RE.search(sentence):
+            continue
+        terms = extract_terms(sentence)
+        if not terms or not set(terms) <= covered:
+            uncovered.append(sentence)
+    return uncovered
+
+
+def prescreen(contract_text: str, rules: Tuple[ComplianceRule, ...],
+              terms: Optional[Dict[str, Any]] = None) -> Optional[RuleVerdict]:
+    """
+    Evaluate a clause against compiled rules.
+
+    Args:
+        contract_text: Clause text.
+        rules: Compiled policy rules.
+        terms: Pre-extracted terms (e.g. from a stored ContractClause); extracted
+            from `contract_text` when omitted.
+
+    Returns:
+        RuleVerdict: NON_COMPLIANT if any matched rule fails; COMPLIANT only if every
+        obligation in the clause is covered by a matched rule and all of them pass.
+        None (undetermined) otherwise, and the clause must go to the LLM.
+    """
+    if not rules:
+        return None
+
+    if terms is None:
+        terms = extract_terms(contract_text)
+    if not terms:
+        return None
+
+    lowered = contract_text.lower()
+    matched: List[str] = []
+    covered = set()
+    issues: List[str] = []
+    for rule in rules:
+        if rule.term not in terms:
+            continue
+        if rule.applies_when and not any(kw in lowered for kw in rule.applies_when):
+            continue
+        actual = terms[rule.term]
+        matched.append(rule.rule_id)
+        covered.add(rule.term)
+        if not _check(rule, actual):
+            expected = "required" if rule.operator == "required" else f"{rule.operator} {_format(rule.term, rule.value)}"
+            issues.append(
+                f"{rule.rule_id}: {rule.term} is {_format(rule.term, actual)} (policy: {expected})"
+            )
+
+    if not matched:
+        return None
+
+    if issues:
+        return RuleVerdict(
+            status="NON_COMPLIANT",
+            reasoning="Rule pre-screen found policy violations: " + "; ".join(issues),
+            flagged_issues=issues,
+            matched_rules=matched,
+        )
+    # Passing the matched rules says nothing about the rest of the clause
+    stated = {term for term in terms if term in RULE_TERMS}
+    if not stated <= covered or _uncovered_obligations(contract_text, covered):
+        return None
+    return RuleVerdict(
+        status="COMPLIANT",
+        reasoning="Rule pre-screen: all extracted terms satisfy " + ", ".join(matched) + ".",
+        flagged_issues=[],
+        matched_rules=matched,
+    )
@@ -1,7 +1,7 @@
 from typing import List, Dict, Any
 import os
 from app.simulation.persona import SupplierPersona
-from app.llm import get_llm_client, LLMMessage
+from app.llm import get_llm_client, LLMMessage, PromptBudget
 
 class SupplierAgent:
     """
@@ -10,6 +10,7 @@ class SupplierAgent:
     def __init__(self, persona_id: str):
         self.persona = self._load_persona(persona_id)
         self.llm = get_llm_client()
+        self.budget = PromptBudget()
 
     def _load_persona(self, persona_id: str) -> SupplierPersona:
         # Assuming run from backend/ dir or similar, adjusting path logic
@@ -42,10 +43,12 @@ Instructions:
     async def generate_reply(self, conversation_history: List[Dict[str, str]], latest_proposal: str) -> str:
         """
         Generates the next response in the conversation.
+
+        Only the most recent history that fits in LLM_PROMPT_MAX_TOKENS is replayed,
+        so the prompt stops growing once a negotiation gets long.
         """
-        messages = [
-            LLMMessage(role="system", content=self._build_system_prompt())
-        ]
+        system_prompt = self._build_system_prompt()
+        messages = []
         
         # Add history
         for msg in conversation_history:
@@ -54,5 +57,6 @@ Instructions:
             
         messages.append(LLMMessage(role="user", content=f"Latest Proposal/Message: {latest_proposal}"))
         
-        response = await self.llm.generate_response(messages)
+        messages = self.budget.fit("supplier_reply", messages, system_prompt)
+        response = await self.llm.generate_response(messages, system_prompt=system_prompt)
         return response
@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 
 class ExternalDataProvider(ABC):
     """
@@ -58,3 +59,23 @@ class ExternalDataProvider(ABC):
             }
         """
         pass
+
+    async def get_financial_health_many(self, duns_numbers: List[str]) -> List[Dict[str, Any]]:
+        """
+        Bulk variant of `get_financial_health`, results in input order. Vendors with
+        a bulk endpoint override this; the default issues the lookups concurrently.
+        """
+        return list(await asyncio.gather(*(self.get_financial_health(d) for d in duns_numbers)))
+
+    async def get_market_news_many(self, company_names: List[str]) -> List[List[Dict[str, str]]]:
+        """
+        Bulk variant of `get_market_news`, results in input order.
+        """
+        return list(await asyncio.gather(*(self.get_market_news(n) for n in company_names)))
+
+    async def check_compliance_many(self, entities: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Bulk variant of `check_compliance` for (company_name, country_code) pairs,
+        results in input order.
+        """
+        return list(await asyncio.gather(*(self.check_compliance(n, c) for n, c in entities)))
@@ -0,0 +1,195 @@
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+import httpx
+
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class DataProviderError(Exception):
+    """
+    Raised when a supplier data vendor cannot be reached or answers with an error.
+    """
+
+    def __init__(self, vendor: str, message: str, status_code: Optional[int] = None):
+        super().__init__(f"{vendor}: {message}")
+        self.vendor = vendor
+        self.status_code = status_code
+
+
+def build_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Async client with the configured connection pool and timeouts.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.SUPPLIER_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPPLIER_HTTP_MAX_KEEPALIVE,
+        ),
+        timeout=httpx.Timeout(settings.SUPPLIER_HTTP_TIMEOUT_SECONDS),
+        **kwargs,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide pooled client shared by all vendor adapters: keep-alive
+    connections are reused across lookups instead of a new TCP/TLS handshake per
+    request. Closed on shutdown by `close_http_client`.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = build_http_client()
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def request_json(
+    client: httpx.AsyncClient,
+    vendor: str,
+    method: str,
+    url: str,
+    **kwargs,
+) -> Any:
+    """
+    Send a request and decode the JSON body. Transport errors, 429 and 5xx gateway
+    errors are retried with backoff (honouring a short Retry-After).
+
+    Raises:
+        DataProviderError: The vendor is unreachable or returned an error status.
+    """
+    attempts = settings.SUPPLIER_HTTP_RETRIES + 1
+    for attempt in range(attempts):
+        delay = 0.2 * 2 ** attempt
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt + 1 == attempts:
+                raise DataProviderError(vendor, f"request failed: {e!r}")
+            logger.warning(f"{vendor}: {e!r}, retrying in {delay:.1f}s")
+        else:
+            if response.status_code < 400:
+                return response.json()
+            if response.status_code not in RETRY_STATUS_CODES or attempt + 1 == attempts:
+                raise DataProviderError(vendor, f"HTTP {response.status_code}", response.status_code)
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+            logger.warning(f"{vendor}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+class ResponseCache:
+    """
+    In-memory TTL cache of vendor responses with a TTL per data type (credit
+    data changes daily, news within minutes). Bounded by `max_entries` with LRU
+    eviction. Concurrent misses for the same key share one fetch, and callers get
+    their own copy of the cached value.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that went to the vendor (or joined such a fetch).
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: Optional[int] = None):
+        self.ttls = ttls
+        self.max_entries = max_entries or settings.SUPPLIER_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._fetches = SingleFlight("supplier.data")
+
+    def _get(self, kind: str, key: Hashable):
+        entry = self._entries.get((kind, key))
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(kind, key)]
+            return False, None
+        self._entries.move_to_end((kind, key))
+        return True, value
+
+    def _put(self, kind: str, key: Hashable, value: Any):
+        ttl = self.ttls.get(kind, 0)
+        if ttl <= 0:
+            return
+        self._entries[(kind, key)] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end((kind, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(self, kind: str, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        hit, value = self._get(kind, key)
+        if hit:
+            self.hits += 1
+            return copy.deepcopy(value)
+        self.misses += 1
+
+        async def load():
+            result = await fetch()
+            self._put(kind, key, result)
+            return result
+
+        return copy.deepcopy(await self._fetches.do((kind, key), load))
+
+    async def get_or_fetch_many(
+        self,
+        kind: str,
+        keys: Sequence[Hashable],
+        fetch_many: Callable[[List[Hashable]], Awaitable[List[Any]]],
+    ) -> List[Any]:
+        """
+        Batch variant: cached keys are served locally, the rest are fetched with one
+        `fetch_many(missing_keys)` call returning results in the same order.
+        """
+        results: Dict[Hashable, Any] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            hit, value = self._get(kind, key)
+            if hit:
+                results[key] = value
+            else:
+                missing.append(key)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            async def load(flight_keys: List[Hashable]) -> List[Any]:
+                fetched = await fetch_many([k[1] for k in flight_keys])
+                for (_, key), value in zip(flight_keys, fetched):
+                    self._put(kind, key, value)
+                return fetched
+
+            fetched = await self._fetches.do_many([(kind, key) for key in missing], load)
+            results.update(zip(missing, fetched))
+        return [copy.deepcopy(results[key]) for key in keys]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "fetches": self._fetches.stats(),
+        }
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from app.core.config import settings
+from .base import ExternalDataProvider
+from .dnb import DnBClient
+from .http import ResponseCache, get_http_client
+from .newsapi import NewsApiClient
+from .sanctions import LocalSanctionsScreener, SanctionsClient
+
+
+def _company_key(company_name: str) -> str:
+    return " ".join(company_name.lower().split())
+
+
+class LiveDataProvider(ExternalDataProvider):
+    """
+    Vendor-backed provider: D&B Direct+ financials, NewsAPI headlines and
+    OpenSanctions-style screening, all over one pooled HTTP client.
+
+    Responses are cached per data type (see SUPPLIER_CACHE_TTL_*), so repeated
+    refreshes of a supplier within the TTL do not hit the vendors again.
+    """
+
+    def __init__(
+        self,
+        financials: DnBClient,
+        news: NewsApiClient,
+        sanctions: Union[SanctionsClient, LocalSanctionsScreener],
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.financials = financials
+        self.news = news
+        self.sanctions = sanctions
+        self.cache = cache or ResponseCache({
+            "financials": settings.SUPPLIER_CACHE_TTL_FINANCIALS_SECONDS,
+            "news": settings.SUPPLIER_CACHE_TTL_NEWS_SECONDS,
+            # Local screening is cheap, and a cache would hide freshly swapped-in lists
+            "sanctions": 0 if isinstance(sanctions, LocalSanctionsScreener) else settings.SUPPLIER_CACHE_TTL_SANCTIONS_SECONDS,
+        })
+
+    @classmethod
+    def from_settings(cls, client: Optional[httpx.AsyncClient] = None) -> "LiveDataProvider":
+        client = client or get_http_client()
+        if settings.SANCTIONS_SCREENING == "local":
+            sanctions = LocalSanctionsScreener()
+        else:
+            sanctions = SanctionsClient(
+                client, settings.SANCTIONS_API_URL, settings.SANCTIONS_API_KEY,
+                dataset=settings.SANCTIONS_DATASET,
+                threshold=settings.SANCTIONS_MATCH_THRESHOLD,
+                batch_size=settings.SANCTIONS_BATCH_SIZE,
+            )
+        return cls(
+            DnBClient(client, settings.DNB_API_URL, settings.DNB_API_KEY or "", settings.DNB_API_SECRET or ""),
+            NewsApiClient(client, settings.NEWS_API_URL, settings.NEWS_API_KEY or ""),
+            sanctions,
+        )
+
+    async def get_financial_health(self, duns_number: str) -> Dict[str, Any]:
+        return await self.cache.get_or_fetch(
+            "financials", duns_number, lambda: self.financials.get_financial_health(duns_number)
+        )
+
+    async def get_market_news(self, company_name: str) -> List[Dict[str, str]]:
+        return await self.cache.get_or_fetch(
+            "news", _company_key(company_name), lambda: self.news.get_market_news(company_name)
+        )
+
+    async def check_compliance(self, company_name: str, country_code: str) -> Dict[str, Any]:
+        return (await self.check_compliance_many([(company_name, country_code)]))[0]
+
+    async def check_compliance_many(self, entities: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        # Uncached entities are screened in batched requests
+        names = {(_company_key(name), country.upper()): name for name, country in entities}
+        return await self.cache.get_or_fetch_many(
+            "sanctions",
+            [(_company_key(name), country.upper()) for name, country in entities],
+            lambda keys: self.sanctions.check_compliance_many([(names[k], k[1]) for k in keys]),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -1,13 +1,19 @@
 import random
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from .base import ExternalDataProvider
 
 class MockDataProvider(ExternalDataProvider):
     """
     Mock Data Provider for testing and development.
     Generates realistic scenarios based on triggers in the company name or DUNS.
+
+    With a `screener` (e.g. LocalSanctionsScreener), names that hit no trigger are
+    screened against the local sanctions lists instead of reported clean.
     """
 
+    def __init__(self, screener: Optional[Any] = None):
+        self.screener = screener
+
     async def get_financial_health(self, duns_number: str) -> Dict[str, Any]:
         # Scenario: "999..." is always High Risk
         if duns_number.startswith("999"):
@@ -47,6 +53,8 @@ class MockDataProvider(ExternalDataProvider):
                 "sanctions_flag": True,
                 "list_match": "OFAC SDN List"
             }
+        if self.screener is not None:
+            return await self.screener.check_compliance(company_name, country_code)
         return {
             "sanctions_flag": False,
             "list_match": None
@@ -0,0 +1,63 @@
+import re
+from typing import Any, Dict, List
+
+import httpx
+
+from .http import request_json
+
+VENDOR = "newsapi"
+
+# NewsAPI carries no sentiment; headlines with these terms count as adverse media.
+# The LLM analysis still scores the overall sentiment from the full list.
+ADVERSE_TERMS = re.compile(
+    r"\b(fraud|lawsuit|sued|bankrupt\w*|insolven\w*|default\w*|sanction\w*|recall\w*|scandal|"
+    r"investigation|probe|layoffs?|strike|fine[ds]?|breach|loss(es)?|downgrade\w*|steps down)\b",
+    re.IGNORECASE,
+)
+POSITIVE_TERMS = re.compile(
+    r"\b(award\w*|expands?|expansion|growth|record|wins?|partnership|upgrade\w*|profit\w*)\b",
+    re.IGNORECASE,
+)
+
+
+def headline_sentiment(title: str) -> str:
+    if ADVERSE_TERMS.search(title):
+        return "negative"
+    if POSITIVE_TERMS.search(title):
+        return "positive"
+    return "neutral"
+
+
+def map_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    return [
+        {
+            "title": article.get("title") or "",
+            "source": (article.get("source") or {}).get("name") or VENDOR,
+            "sentiment": headline_sentiment(article.get("title") or ""),
+            "url": article.get("url") or "",
+            "published_at": article.get("publishedAt") or "",
+        }
+        for article in articles
+    ]
+
+
+class NewsApiClient:
+    """
+    NewsAPI `/v2/everything` search for recent headlines about a company. The API
+    has no multi-company query that keeps results attributable, so there is no
+    bulk variant.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, base_url: str, api_key: str, page_size: int = 20):
+        self.client = client
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.page_size = page_size
+
+    async def get_market_news(self, company_name: str) -> List[Dict[str, str]]:
+        body = await request_json(
+            self.client, VENDOR, "GET", f"{self.base_url}/v2/everything",
+            params={"q": f'"{company_name}"', "sortBy": "publishedAt", "language": "en", "pageSize": self.page_size},
+            headers={"X-Api-Key": self.api_key},
+        )
+        return map_articles(body.get("articles") or [])
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.supplier.sanctions_index import get_sanctions_index
+from .http import DataProviderError, request_json
+
+VENDOR = "sanctions"
+
+
+def map_match(response: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    """
+    The best result of one screening query in the provider schema. A result counts
+    as a hit when the service marks it a match or it scores at least `threshold`.
+    """
+    results = sorted(response.get("results") or [], key=lambda r: r.get("score", 0), reverse=True)
+    for result in results:
+        if result.get("match") or result.get("score", 0) >= threshold:
+            datasets = ", ".join(result.get("datasets") or [])
+            return {
+                "sanctions_flag": True,
+                "list_match": f"{result.get('caption')} ({datasets})" if datasets else result.get("caption"),
+                "match_score": result.get("score"),
+            }
+    return {"sanctions_flag": False, "list_match": None}
+
+
+class SanctionsClient:
+    """
+    Sanctions/PEP screening against an OpenSanctions-style `/match/{dataset}`
+    endpoint, which accepts many entity queries per request. Bulk screening sends
+    `batch_size` entities per request.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str,
+        api_key: Optional[str] = None,
+        dataset: str = "default",
+        threshold: float = 0.7,
+        batch_size: int = 50,
+    ):
+        self.client = client
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"ApiKey {api_key}"} if api_key else {}
+        self.dataset = dataset
+        self.threshold = threshold
+        self.batch_size = batch_size
+
+    async def check_compliance_many(self, entities: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Args:
+            entities: (company_name, country_code) pairs.
+
+        Returns:
+            List[Dict]: One provider-schema result per entity, in order.
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(entities), self.batch_size):
+            batch = entities[start:start + self.batch_size]
+            queries = {
+                f"q{i}": {"schema": "Company", "properties": {"name": [name], "country": [country.lower()]}}
+                for i, (name, country) in enumerate(batch)
+            }
+            body = await request_json(
+                self.client, VENDOR, "POST", f"{self.base_url}/match/{self.dataset}",
+                json={"queries": queries}, headers=self.headers,
+            )
+            responses = body.get("responses") or {}
+            results.extend(map_match(responses.get(f"q{i}") or {}, self.threshold) for i in range(len(batch)))
+        return results
+
+    async def check_compliance(self, company_name: str, country_code: str) -> Dict[str, Any]:
+        return (await self.check_compliance_many([(company_name, country_code)]))[0]
+
+
+class LocalSanctionsScreener:
+    """
+    Screening against the in-process list index (see app.supplier.sanctions_index):
+    no vendor call per supplier. New list files dropped into SANCTIONS_LIST_DIR are
+    picked up by the reload loop and swapped in.
+
+    Until an index with entries is loaded, screening raises DataProviderError
+    rather than reporting every supplier as clean.
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = settings.SANCTIONS_LIST_MATCH_THRESHOLD if threshold is None else threshold
+
+    async def check_compliance_many(self, entities: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        # One snapshot for the whole batch, even if a reload swaps the index meanwhile
+        index = get_sanctions_index()
+        if not index.loaded:
+            raise DataProviderError(
+                VENDOR, f"no sanctions lists loaded from SANCTIONS_LIST_DIR ({settings.SANCTIONS_LIST_DIR}); "
+                "suppliers cannot be screened", 503,
+            )
+        results = []
+        for name, country in entities:
+            matches = index.screen(name, country, limit=1, threshold=self.threshold)
+            if matches:
+                best = matches[0]
+                results.append({
+                    "sanctions_flag": True,
+                    "list_match": f"{best['name']} ({best['list']})",
+                    "match_score": best["score"],
+                    "list_generation": index.generation,
+                })
+            else:
+                results.append({"sanctions_flag": False, "list_match": None, "list_generation": index.generation})
+        return results
+
+    async def check_compliance(self, company_name: str, country_code: str) -> Dict[str, Any]:
+        return (await self.check_compliance_many([(company_name, country_code)]))[0]
@@ -0,0 +1,124 @@
+"""
+Local stand-ins for the supplier data vendors (D&B Direct+, NewsAPI and an
+OpenSanctions-style match API) for offline development, tests and benchmarks.
+
+They answer the subset of each API the adapters use, with deterministic data
+following the same triggers as MockDataProvider: DUNS starting with "999" is
+high risk, "Risky"/"Volatile" companies have adverse news, "Sanctioned"
+companies and KP/RU/IR entities are listed.
+
+Run them with scripts/run_provider_standins.py.
+"""
+import asyncio
+import hashlib
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Header, HTTPException, Request
+
+SANCTIONED_COUNTRIES = {"kp", "ru", "ir"}
+
+
+def _stable_int(text: str, modulo: int) -> int:
+    return int(hashlib.sha256(text.encode()).hexdigest()[:8], 16) % modulo
+
+
+def build_standin_app(latency: float = 0.0, token_ttl: int = 3600) -> FastAPI:
+    """
+    One app serving all three vendor APIs (their paths do not overlap), so each
+    vendor base URL can point at the same server.
+
+    Args:
+        latency: Seconds added to every response, to approximate a remote vendor.
+        token_ttl: Lifetime reported for D&B bearer tokens.
+
+    The app's `state.requests` counts requests per endpoint and `state.peak_in_flight`
+    the most requests per endpoint served at once; `state.fail_next` makes the next
+    N data requests answer 503.
+    """
+    app = FastAPI(title="Supplier data vendor stand-ins")
+    app.state.requests = Counter()
+    app.state.in_flight = Counter()
+    app.state.peak_in_flight = Counter()
+    app.state.tokens = set()
+    app.state.fail_next = 0
+
+    async def simulate(request: Request, endpoint: str):
+        app.state.requests[endpoint] += 1
+        if latency:
+            app.state.in_flight[endpoint] += 1
+            app.state.peak_in_flight[endpoint] = max(app.state.peak_in_flight[endpoint], app.state.in_flight[endpoint])
+            try:
+                await asyncio.sleep(latency)
+            finally:
+                app.state.in_flight[endpoint] -= 1
+        if endpoint != "token" and app.state.fail_next > 0:
+            app.state.fail_next -= 1
+            raise HTTPException(status_code=503, detail="Stand-in failure")
+
+    @app.post("/v2/token")
+    async def token(request: Request):
+        await simulate(request, "token")
+        if not request.headers.get("Authorization", "").startswith("Basic "):
+            raise HTTPException(status_code=401, detail="Missing client credentials")
+        access_token = f"standin-{len(app.state.tokens) + 1}"
+        app.state.tokens.add(access_token)
+        return {"access_token": access_token, "expiresIn": token_ttl}
+
+    @app.get("/v1/data/duns/{duns}")
+    async def duns_data(duns: str, request: Request, blockIDs: str = "", authorization: Optional[str] = Header(None)):
+        await simulate(request, "duns")
+        if not authorization or authorization.removeprefix("Bearer ") not in app.state.tokens:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        high_risk = duns.startswith("999")
+        percentile = 5 + _stable_int(duns, 20) if high_risk else 70 + _stable_int(duns, 30)
+        return {
+            "organization": {
+                "duns": duns,
+                "primaryName": f"Company {duns}",
+                "dnbAssessment": {
+                    "failureScore": {"nationalPercentile": percentile, "classScore": 5 if high_risk else 1},
+                    "standardRating": {"rating": "CC" if high_risk else "5A1"},
+                },
+            },
+            "blockIDs": blockIDs.split(","),
+        }
+
+    @app.get("/v2/everything")
+    async def everything(request: Request, q: str, pageSize: int = 20, x_api_key: Optional[str] = Header(None)):
+        await simulate(request, "news")
+        if not x_api_key:
+            raise HTTPException(status_code=401, detail="apiKeyMissing")
+        company = q.strip('"')
+        if "Risky" in company or "Volatile" in company:
+            titles = [f"{company} faces class action lawsuit over fraud", f"CEO of {company} steps down amid scandal"]
+        elif "Green" in company:
+            titles = [f"{company} wins sustainability award", f"{company} expands into new markets"]
+        else:
+            titles = [f"{company} publishes quarterly report"]
+        articles = [
+            {"source": {"id": None, "name": "StandInWire"}, "title": title,
+             "url": f"https://news.example/{_stable_int(title, 10 ** 6)}", "publishedAt": "2024-06-01T00:00:00Z"}
+            for title in titles[:pageSize]
+        ]
+        return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+    @app.post("/match/{dataset}")
+    async def match(dataset: str, request: Request):
+        await simulate(request, "match")
+        body: Dict[str, Any] = await request.json()
+        responses = {}
+        for query_id, query in (body.get("queries") or {}).items():
+            props = query.get("properties") or {}
+            name = (props.get("name") or [""])[0]
+            country = (props.get("country") or [""])[0].lower()
+            results = []
+            if "Sanctioned" in name or country in SANCTIONED_COUNTRIES:
+                results.append({
+                    "id": f"NK-{_stable_int(name, 10 ** 6)}", "caption": name, "schema": "Company",
+                    "score": 0.95, "match": True, "datasets": ["us_ofac_sdn"],
+                })
+            responses[query_id] = {"status": 200, "results": results, "total": {"value": len(results)}}
+        return {"responses": responses, "limit": 5}
+
+    return app
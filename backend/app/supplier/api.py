@@ -1,9 +1,19 @@
 from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session, select
+from app.core.config import settings
 from app.database import get_session
 from app.models import Supplier, SupplierPerformance
+from app.supplier.adapters.http import DataProviderError
+from app.supplier.history import current_risk_profile, load_risk_history
+from app.supplier.intelligence import SupplierIntelligenceService, SupplierNotFound
+from app.supplier.performance import (
+    DEFAULT_MOVING_WINDOW, build_reports, load_rankings, load_trend, record_performance
+)
+from app.supplier.sanctions_index import get_sanctions_index
+from app.supplier.scoring import RiskWeights, rescore_suppliers
 from pydantic import BaseModel
 
 router = APIRouter(tags=["supplier"])
@@ -18,7 +28,6 @@ class PerformanceCreate(BaseModel):
 @router.get("/")
 async def list_suppliers(session: Session = Depends(get_session)):
     # Simple list for debug
-    from sqlmodel import select
     result = await session.exec(select(Supplier))
     return result.all()
 
@@ -34,22 +43,148 @@ async def add_performance_report(
     supplier = await session.get(Supplier, supplier_id)
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
-        
-    # Calculate simple average for overall if not provided
-    overall = (report.quality_score + report.delivery_score + report.cost_score) / 3.0
-    
-    perf_entry = SupplierPerformance(
-        supplier_id=supplier_id,
-        period_start=report.period_start,
-        period_end=report.period_end,
-        quality_score=report.quality_score,
-        delivery_score=report.delivery_score,
-        cost_score=report.cost_score,
-        overall_score=overall
-    )
-    
-    session.add(perf_entry)
-    await session.commit()
+
+    # Overall is the simple average of the KPIs; monthly/quarterly rollups are updated too
+    [perf_entry] = await record_performance(session, build_reports(supplier_id, [report]))
     await session.refresh(perf_entry)
-    
     return perf_entry
+
+class BulkPerformanceEntry(PerformanceCreate):
+    supplier_id: UUID
+
+class BulkPerformanceRequest(BaseModel):
+    reports: List[BulkPerformanceEntry]
+
+@router.post("/performance/bulk")
+async def add_performance_reports(request: BulkPerformanceRequest, session: Session = Depends(get_session)):
+    """
+    Ingest many performance scorecards in one transaction (one rollup update per
+    supplier and period, however many reports it receives).
+    """
+    supplier_ids = {entry.supplier_id for entry in request.reports}
+    result = await session.execute(select(Supplier.id).where(Supplier.id.in_(supplier_ids)))
+    missing = supplier_ids - set(result.scalars().all())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown suppliers: {', '.join(sorted(str(m) for m in missing))}")
+
+    reports = [r for entry in request.reports for r in build_reports(entry.supplier_id, [entry])]
+    await record_performance(session, reports)
+    return {"inserted": len(reports), "suppliers": len(supplier_ids)}
+
+@router.get("/performance/rankings")
+async def performance_rankings(
+    period: str = "quarter",
+    metric: str = "overall",
+    period_start: Optional[datetime] = None,
+    limit: int = 20,
+    ascending: bool = False,
+    session: Session = Depends(get_session),
+):
+    """
+    Suppliers ranked by average KPI in a month/quarter (default: the latest one with reports).
+    """
+    try:
+        return await load_rankings(session, period, period_start, metric, limit, ascending)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.get("/{supplier_id}/performance/trend")
+async def performance_trend(
+    supplier_id: UUID,
+    period: str = "month",
+    window: int = DEFAULT_MOVING_WINDOW,
+    since: Optional[datetime] = None,
+    session: Session = Depends(get_session),
+):
+    """
+    Per-period KPI averages with trailing moving averages over `window` periods.
+    """
+    try:
+        points = await load_trend(session, supplier_id, period, max(window, 1), since)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"supplier_id": str(supplier_id), "period_type": period, "window": window, "points": points}
+
+class RescoreRequest(BaseModel):
+    weights: Optional[RiskWeights] = None # Defaults to the configured RISK_WEIGHT_* settings
+    dry_run: bool = False # What-if: report the resulting scores without writing them
+
+@router.post("/risk/rescore")
+async def rescore_portfolio(request: RescoreRequest, session: Session = Depends(get_session)):
+    """
+    Recompute every supplier's risk score from its latest risk profile and
+    performance report in one vectorized pass.
+    """
+    return await rescore_suppliers(session, request.weights, dry_run=request.dry_run)
+
+@router.get("/sanctions/screen")
+async def screen_sanctions(
+    name: str,
+    country: Optional[str] = None,
+    limit: int = Query(5, ge=1, le=50),
+):
+    """
+    Fuzzy-match a name against the local sanctions lists (SANCTIONS_LIST_DIR).
+    """
+    index = get_sanctions_index()
+    if not index.loaded:
+        raise HTTPException(status_code=503, detail="No sanctions lists loaded")
+    matches = index.screen(name, country, limit=limit)
+    threshold = settings.SANCTIONS_LIST_MATCH_THRESHOLD
+    return {
+        "generation": index.generation,
+        "threshold": threshold,
+        "hit": bool(matches) and matches[0]["score"] >= threshold,
+        "matches": matches,
+    }
+
+@router.get("/sanctions/status")
+async def sanctions_index_status():
+    """
+    The local sanctions index in service: generation, size and source files.
+    """
+    return get_sanctions_index().stats()
+
+class RiskRefreshRequest(BaseModel):
+    supplier_ids: List[UUID]
+
+@router.post("/risk/refresh")
+async def refresh_risk_profiles(request: RiskRefreshRequest, session: Session = Depends(get_session)):
+    """
+    Fetch fresh external data for several suppliers (bulk vendor lookups where
+    supported) and store a new risk profile for each.
+    """
+    try:
+        profiles = await SupplierIntelligenceService().refresh_risk_profiles(session, request.supplier_ids)
+    except SupplierNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except DataProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return {"refreshed": len(profiles), "profiles": profiles}
+
+@router.get("/{supplier_id}/risk")
+async def get_current_risk(supplier_id: UUID, session: Session = Depends(get_session)):
+    """
+    The supplier's current risk profile.
+    """
+    profile = await current_risk_profile(session, supplier_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="No risk profile for this supplier")
+    return profile
+
+@router.get("/{supplier_id}/risk/history")
+async def get_risk_history(
+    supplier_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """
+    Risk snapshots in [start, end), optionally reduced to one per day or week.
+    """
+    try:
+        points = await load_risk_history(session, supplier_id, start, end, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"supplier_id": str(supplier_id), "resolution": resolution, "points": points}
@@ -1,17 +1,32 @@
+import logging
+from functools import lru_cache
 from app.core.config import settings
 from .adapters.base import ExternalDataProvider
 from .adapters.mock import MockDataProvider
 
+logger = logging.getLogger(__name__)
+
+@lru_cache()
 def get_supplier_data_provider() -> ExternalDataProvider:
     """
     Factory function to return the configured ExternalDataProvider.
+
+    The instance is shared process-wide so every service uses the same
+    connection pool and response cache.
     """
     provider_type = settings.SUPPLIER_DATA_PROVIDER.lower()
     
     if provider_type == "mock":
+        if settings.SANCTIONS_SCREENING == "local":
+            from .adapters.sanctions import LocalSanctionsScreener
+            return MockDataProvider(screener=LocalSanctionsScreener())
         return MockDataProvider()
-    # elif provider_type == "dnb":
-    #     return DnBDirectProvider()
+    elif provider_type == "live":
+        if not (settings.DNB_API_KEY and settings.DNB_API_SECRET and settings.NEWS_API_KEY):
+            logger.warning("Live supplier data provider needs DNB_API_KEY, DNB_API_SECRET and NEWS_API_KEY; using mock")
+            return MockDataProvider()
+        from .adapters.live import LiveDataProvider
+        return LiveDataProvider.from_settings()
     else:
         # Default to mock for safety if misconfigured
         return MockDataProvider()
@@ -0,0 +1,183 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Hashable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import Supplier, SupplierRiskProfile
+from app.supplier.scoring import score_supplier
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = ("day", "week")
+DELETE_CHUNK_SIZE = 5000
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; compare everything as naive UTC
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def bucket_key(moment: datetime, resolution: str) -> Hashable:
+    if resolution == "day":
+        return ("day", moment.date())
+    if resolution == "week":
+        year, week, _ = moment.isocalendar()
+        return ("week", year, week)
+    raise ValueError(f"Unknown resolution '{resolution}' (expected one of {', '.join(RESOLUTIONS)})")
+
+
+def retention_bucket(moment: datetime, now: datetime) -> Optional[Hashable]:
+    """
+    Downsampling bucket of a snapshot taken at `moment`: None (keep) while recent,
+    then one per day, then one per ISO week.
+    """
+    age = now - moment
+    if age < timedelta(days=settings.RISK_HISTORY_KEEP_ALL_DAYS):
+        return None
+    if age < timedelta(days=settings.RISK_HISTORY_DAILY_DAYS):
+        return bucket_key(moment, "day")
+    return bucket_key(moment, "week")
+
+
+async def current_risk_profile(session: Session, supplier_id: UUID) -> Optional[SupplierRiskProfile]:
+    """
+    A supplier's latest risk profile: two primary-key lookups through
+    `Supplier.current_risk_profile_id`. Suppliers not backfilled yet fall back to
+    the (supplier_id, retrieved_at) index.
+    """
+    supplier = await session.get(Supplier, supplier_id)
+    if supplier is None:
+        return None
+    if supplier.current_risk_profile_id is not None:
+        profile = await session.get(SupplierRiskProfile, supplier.current_risk_profile_id)
+        if profile is not None:
+            return profile
+    result = await session.execute(
+        select(SupplierRiskProfile)
+        .where(SupplierRiskProfile.supplier_id == supplier_id)
+        .order_by(SupplierRiskProfile.retrieved_at.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def backfill_current_profiles(session: Session) -> int:
+    """
+    Point every supplier without a current profile at its latest one.
+
+    Returns:
+        int: Suppliers updated.
+    """
+    ranked = select(
+        SupplierRiskProfile.id,
+        SupplierRiskProfile.supplier_id,
+        func.row_number().over(
+            partition_by=SupplierRiskProfile.supplier_id, order_by=SupplierRiskProfile.retrieved_at.desc()
+        ).label("rank"),
+    ).subquery()
+    result = await session.execute(
+        select(ranked.c.supplier_id, ranked.c.id)
+        .join(Supplier, Supplier.id == ranked.c.supplier_id)
+        .where(ranked.c["rank"] == 1, Supplier.current_risk_profile_id.is_(None))
+    )
+    rows = [{"target": supplier_id, "profile_id": profile_id} for supplier_id, profile_id in result.all()]
+    if rows:
+        table = Supplier.__table__
+        await session.execute(
+            update(table).where(table.c.id == bindparam("target")).values(current_risk_profile_id=bindparam("profile_id")),
+            rows,
+        )
+    await session.commit()
+    return len(rows)
+
+
+async def compact_risk_history(session: Session, now: Optional[datetime] = None, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Downsample old risk snapshots: keep everything from the last
+    RISK_HISTORY_KEEP_ALL_DAYS, then the last snapshot of each day until
+    RISK_HISTORY_DAILY_DAYS, then the last snapshot of each ISO week. A supplier's
+    current profile is never removed.
+
+    Returns:
+        Dict[str, int]: Snapshots scanned and deleted.
+    """
+    now = _naive_utc(now or datetime.now(timezone.utc))
+    cutoff = now - timedelta(days=settings.RISK_HISTORY_KEEP_ALL_DAYS)
+    current = set((await session.execute(
+        select(Supplier.current_risk_profile_id).where(Supplier.current_risk_profile_id.is_not(None))
+    )).scalars().all())
+
+    # Index order: each bucket's snapshots arrive together, oldest first
+    stream = await session.stream(
+        select(SupplierRiskProfile.id, SupplierRiskProfile.supplier_id, SupplierRiskProfile.retrieved_at)
+        .where(SupplierRiskProfile.retrieved_at < cutoff.replace(tzinfo=timezone.utc))
+        .order_by(SupplierRiskProfile.supplier_id, SupplierRiskProfile.retrieved_at)
+    )
+    doomed: List[UUID] = []
+    scanned = 0
+    bucket, kept = None, None
+    async for profile_id, supplier_id, retrieved_at in stream:
+        scanned += 1
+        retention = retention_bucket(_naive_utc(retrieved_at), now)
+        if retention is None:
+            continue
+        key = (supplier_id, retention)
+        if key == bucket:
+            # A later snapshot in the same bucket supersedes the kept one
+            if kept in current:
+                doomed.append(profile_id)
+                continue
+            doomed.append(kept)
+        bucket, kept = key, profile_id
+
+    if not dry_run:
+        for start in range(0, len(doomed), DELETE_CHUNK_SIZE):
+            await session.execute(
+                delete(SupplierRiskProfile).where(SupplierRiskProfile.id.in_(doomed[start:start + DELETE_CHUNK_SIZE]))
+            )
+        await session.commit()
+    logger.info(f"Risk history compaction: {len(doomed)} of {scanned} old snapshots {'would be ' if dry_run else ''}removed")
+    return {"scanned": scanned, "deleted": len(doomed), "dry_run": dry_run}
+
+
+async def load_risk_history(
+    session: Session,
+    supplier_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    A supplier's risk snapshots in [start, end), oldest first, optionally reduced to
+    the last snapshot per day or week. Served by the (supplier_id, retrieved_at) index.
+    """
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution '{resolution}' (expected one of {', '.join(RESOLUTIONS)})")
+    query = select(SupplierRiskProfile).where(SupplierRiskProfile.supplier_id == supplier_id)
+    if start is not None:
+        query = query.where(SupplierRiskProfile.retrieved_at >= start)
+    if end is not None:
+        query = query.where(SupplierRiskProfile.retrieved_at < end)
+    profiles = list((await session.execute(query.order_by(SupplierRiskProfile.retrieved_at))).scalars().all())
+
+    if resolution is not None:
+        last: Dict[Hashable, SupplierRiskProfile] = {}
+        for profile in profiles:
+            last[bucket_key(_naive_utc(profile.retrieved_at), resolution)] = profile
+        profiles = list(last.values())
+
+    return [
+        {
+            "retrieved_at": p.retrieved_at,
+            "risk_score": score_supplier(p.financial_stress_score, p.news_sentiment_score, p.sanctions_flag),
+            "financial_stress_score": p.financial_stress_score,
+            "news_sentiment_score": p.news_sentiment_score,
+            "adverse_media_count": p.adverse_media_count,
+            "sanctions_flag": p.sanctions_flag,
+        }
+        for p in profiles
+    ]
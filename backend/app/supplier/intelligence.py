@@ -1,23 +1,76 @@
+import asyncio
 import logging
 import json
+import re
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlmodel import Session, select
-from app.models import Supplier, SupplierRiskProfile
+from typing import List, Optional
+from app.core.config import settings
+from app.models import Supplier, SupplierPerformance, SupplierRiskProfile
+from app.core.singleflight import SingleFlight
+from app.supplier.adapters.http import DataProviderError
 from app.supplier.factory import get_supplier_data_provider
+from app.supplier.scoring import score_supplier
 from app.llm import get_llm_client, LLMMessage
 
 logger = logging.getLogger(__name__)
 
+# In-flight refreshes per supplier, shared by all service instances
+supplier_refreshes = SingleFlight("supplier.refresh")
+
+# Until suppliers carry a DUNS number and address: a DUNS kept in the LEI field, and US
+DEFAULT_COUNTRY = "US"
+DUNS_RE = re.compile(r"\d{9}")
+# Neutral financials when there is no D&B record to go on
+UNKNOWN_FINANCIALS = {"financial_stress_score": 50, "credit_rating": "Unknown", "risk_class": "Unknown"}
+
+
+class SupplierNotFound(LookupError):
+    """
+    Raised when risk profiles are requested for suppliers that do not exist.
+    """
+
+    def __init__(self, supplier_ids: List[UUID]):
+        super().__init__(f"Unknown suppliers: {', '.join(str(s) for s in supplier_ids)}")
+        self.supplier_ids = supplier_ids
+
+
+def supplier_duns(supplier: Supplier) -> Optional[str]:
+    """
+    The supplier's D-U-N-S number, if it has one (a real LEI is 20 characters, not 9 digits).
+    """
+    duns = (supplier.lei or "").strip()
+    if DUNS_RE.fullmatch(duns) and duns != "000000000":
+        return duns
+    return None
+
+def combined_risk_score(
+    financial_stress_score: float,
+    news_sentiment_score: float,
+    sanctions_flag: bool,
+    performance: Optional[SupplierPerformance] = None,
+) -> float:
+    """
+    Supplier risk from 0 (safe) to 100 (critical), with the configured weights
+    (see app.supplier.scoring). By default 60% financial, 40% sentiment.
+
+    Financial stress is 1-100 where 100 is good, so it contributes (100 - score).
+    Sentiment (-1 to 1) maps -1 -> 100 and 1 -> 0. A sanctions hit is always 100.
+    """
+    return score_supplier(financial_stress_score, news_sentiment_score, sanctions_flag, performance)
+
 class SupplierIntelligenceService:
     """
     Orchestrates the gathering of external intelligence (Financial, News, Compliance)
     and uses the LLM (SCAnalyst) to synthesize a Risk Profile.
     """
 
-    def __init__(self):
+    def __init__(self, session_factory=None):
         self.data_provider = get_supplier_data_provider()
         self.llm = get_llm_client()
+        # Refreshes run in their own session (default: the application's)
+        self.session_factory = session_factory
 
     async def _analyze_sentiment_and_risk(self, financials: dict, news: list, compliance: dict) -> dict:
         """
@@ -62,10 +115,83 @@ class SupplierIntelligenceService:
                 "recommended_action": "MONITOR"
             }
 
-    async def update_supplier_risk_profile(self, session: Session, supplier_id: UUID) -> SupplierRiskProfile:
+    async def update_supplier_risk_profile(self, supplier_id: UUID) -> SupplierRiskProfile:
         """
         Full workflow: Fetch Data -> Analyze(LLM) -> Save DB.
+
+        Concurrent refreshes of the same supplier (e.g. a batch of clauses starting
+        together) share one run: one provider fetch, one LLM analysis, one profile row.
+        The shared run opens its own session, since it may outlive the caller that
+        started it.
+
+        Returns:
+            SupplierRiskProfile: The stored profile, detached; each caller gets its own copy.
+        """
+        profile = await supplier_refreshes.do(supplier_id, lambda: self._refresh_in_own_session(supplier_id))
+        return SupplierRiskProfile.model_validate(profile.model_dump())
+
+    async def refresh_risk_profiles(self, session: Session, supplier_ids: List[UUID]) -> List[SupplierRiskProfile]:
         """
+        Refresh several suppliers. External data is first prefetched with the
+        provider's bulk lookups (e.g. one batched sanctions screening instead of a
+        request per supplier); the per-supplier refreshes then hit the provider cache.
+
+        Args:
+            session: DB Session.
+            supplier_ids: Suppliers to refresh, in order.
+
+        Returns:
+            List[SupplierRiskProfile]: The new profiles, in the same order.
+
+        Raises:
+            SupplierNotFound: If any of the suppliers does not exist (nothing is refreshed).
+        """
+        result = await session.execute(select(Supplier).where(Supplier.id.in_(supplier_ids)))
+        suppliers = result.scalars().all()
+        found = {s.id for s in suppliers}
+        missing = [s for s in dict.fromkeys(supplier_ids) if s not in found]
+        if missing:
+            raise SupplierNotFound(missing)
+        if suppliers:
+            duns_numbers = [d for d in (supplier_duns(s) for s in suppliers) if d is not None]
+            prefetched = await asyncio.gather(
+                self.data_provider.get_financial_health_many(duns_numbers),
+                self.data_provider.get_market_news_many([s.name for s in suppliers]),
+                self.data_provider.check_compliance_many([(s.name, DEFAULT_COUNTRY) for s in suppliers]),
+                return_exceptions=True,
+            )
+            for error in prefetched:
+                if isinstance(error, Exception):
+                    # The per-supplier refresh retries and surfaces the error
+                    logger.warning(f"Bulk supplier data prefetch failed: {error}")
+
+        profiles = []
+        for supplier_id in supplier_ids:
+            profiles.append(await self.update_supplier_risk_profile(supplier_id))
+        return profiles
+
+    async def _financial_health(self, supplier: Supplier) -> dict:
+        """
+        D&B financials, or UNKNOWN_FINANCIALS if the supplier has no DUNS number or the
+        lookup fails: missing financials should not block the rest of the assessment.
+        """
+        duns = supplier_duns(supplier)
+        if duns is None:
+            return {**UNKNOWN_FINANCIALS, "unavailable": "no DUNS number on file"}
+        try:
+            return await self.data_provider.get_financial_health(duns)
+        except DataProviderError as e:
+            logger.warning(f"Financials for supplier {supplier.id} unavailable: {e}")
+            return {**UNKNOWN_FINANCIALS, "unavailable": str(e)}
+
+    async def _refresh_in_own_session(self, supplier_id: UUID) -> SupplierRiskProfile:
+        session_factory = self.session_factory
+        if session_factory is None:
+            from app.database import async_session as session_factory
+        async with session_factory() as session:
+            return await self._refresh_risk_profile(session, supplier_id)
+
+    async def _refresh_risk_profile(self, session: Session, supplier_id: UUID) -> SupplierRiskProfile:
         # 1. Get Supplier
         supplier = await session.get(Supplier, supplier_id)
         if not supplier:
@@ -82,15 +208,13 @@ class SupplierIntelligenceService:
                 adverse_media_count=0
             )
 
-        # 2. Fetch External Data (Parallelizable in future)
-        # Assuming we store DUNS in 'lei' field or similar for now, or use name.
-        # Fallback to a mock DUNS or use internal ID if specific fields missing.
-        duns = supplier.lei or "000000000" 
-        
-        financials = await self.data_provider.get_financial_health(duns)
-        news = await self.data_provider.get_market_news(supplier.name)
-        # Determine country code context. Defaulting to 'US' or extracting if we had address fields.
-        compliance = await self.data_provider.check_compliance(supplier.name, "US")
+        # 2. Fetch External Data (the three sources in parallel)
+        financials, news, compliance = await asyncio.gather(
+            self._financial_health(supplier),
+            self.data_provider.get_market_news(supplier.name),
+            # Determine country code context. Defaulting to 'US' or extracting if we had address fields.
+            self.data_provider.check_compliance(supplier.name, DEFAULT_COUNTRY),
+        )
 
         # 3. LLM Analysis
         analysis = await self._analyze_sentiment_and_risk(financials, news, compliance)
@@ -118,6 +242,7 @@ class SupplierIntelligenceService:
         )
 
         session.add(risk_profile)
+        supplier.current_risk_profile_id = risk_profile.id
         
         # 5. Update main Supplier score for quick access?
         # A simple heuristic: 
@@ -126,15 +251,21 @@ class SupplierIntelligenceService:
         # Financial Stress (1-100, 100 is good). So (100 - FinScore).
         # Sentiment (-1 to 1). -1 is bad.
         
-        # Simple weighted formula
-        fin_risk = 100 - financials.get("financial_stress_score", 50)
-        sentiment_risk = (1.0 - analysis.get("news_sentiment_score", 0)) * 50 # Maps -1->100, 1->0
-        
-        combined_risk = (fin_risk * 0.6) + (sentiment_risk * 0.4)
-        if compliance.get("sanctions_flag"):
-            combined_risk = 100.0
-            
-        supplier.risk_score = min(max(combined_risk, 0.0), 100.0)
+        performance = None
+        if settings.RISK_WEIGHT_PERFORMANCE > 0:
+            result = await session.execute(
+                select(SupplierPerformance)
+                .where(SupplierPerformance.supplier_id == supplier.id)
+                .order_by(SupplierPerformance.period_end.desc())
+                .limit(1)
+            )
+            performance = result.scalars().first()
+        supplier.risk_score = combined_risk_score(
+            financials.get("financial_stress_score", 50),
+            analysis.get("news_sentiment_score", 0),
+            compliance.get("sanctions_flag", False),
+            performance,
+        )
         session.add(supplier)
         
         await session.commit()
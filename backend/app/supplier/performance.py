@@ -0,0 +1,296 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.models import SupplierPerformance, SupplierPerformanceRollup
+
+logger = logging.getLogger(__name__)
+
+PERIOD_TYPES = ("month", "quarter")
+METRICS = ("quality", "delivery", "cost", "overall")
+ROLLUP_TOTALS = ("report_count", "quality_sum", "delivery_sum", "cost_sum", "overall_sum")
+DEFAULT_MOVING_WINDOW = 3
+
+RollupKey = Tuple[UUID, str, datetime]
+
+
+def overall_score(quality: float, delivery: float, cost: float) -> float:
+    return (quality + delivery + cost) / 3.0
+
+
+def period_bucket(moment: datetime, period_type: str) -> datetime:
+    """
+    Start of the calendar month or quarter containing `moment` (UTC).
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    if period_type == "month":
+        month = moment.month
+    elif period_type == "quarter":
+        month = (moment.month - 1) // 3 * 3 + 1
+    else:
+        raise ValueError(f"Unknown period type '{period_type}' (expected one of {', '.join(PERIOD_TYPES)})")
+    return datetime(moment.year, month, 1, tzinfo=timezone.utc)
+
+
+def _key(supplier_id: UUID, period_type: str, period_start: datetime) -> RollupKey:
+    # SQLite returns naive datetimes; compare keys without tzinfo
+    return supplier_id, period_type, period_start.replace(tzinfo=None)
+
+
+def _fold(rollup: SupplierPerformanceRollup, report: SupplierPerformance):
+    rollup.report_count += 1
+    rollup.quality_sum += report.quality_score
+    rollup.delivery_sum += report.delivery_score
+    rollup.cost_sum += report.cost_score
+    rollup.overall_sum += report.overall_score
+    rollup.overall_min = report.overall_score if rollup.overall_min is None else min(rollup.overall_min, report.overall_score)
+    rollup.overall_max = report.overall_score if rollup.overall_max is None else max(rollup.overall_max, report.overall_score)
+
+
+def _deltas(reports: List[SupplierPerformance]) -> Dict[RollupKey, SupplierPerformanceRollup]:
+    """
+    The reports folded into one (unsaved) rollup per supplier and period.
+    """
+    deltas: Dict[RollupKey, SupplierPerformanceRollup] = {}
+    for report in reports:
+        for period_type in PERIOD_TYPES:
+            start = period_bucket(report.period_end, period_type)
+            key = _key(report.supplier_id, period_type, start)
+            if key not in deltas:
+                deltas[key] = SupplierPerformanceRollup(supplier_id=key[0], period_type=period_type, period_start=start)
+            _fold(deltas[key], report)
+    return deltas
+
+
+async def _apply_rollups(session: Session, reports: List[SupplierPerformance]):
+    """
+    Add the reports to their rollups with one INSERT ... ON CONFLICT DO UPDATE, so the
+    database does the increments and concurrent writers cannot overwrite each other.
+    """
+    deltas = list(_deltas(reports).values())
+    if not deltas:
+        return
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        insert, least, greatest = postgresql_insert, func.least, func.greatest
+    elif dialect == "sqlite":
+        insert, least, greatest = sqlite_insert, func.min, func.max
+    else:
+        await _apply_rollups_locked(session, deltas)
+        return
+
+    table = SupplierPerformanceRollup.__table__
+    columns = ("supplier_id", "period_type", "period_start", *ROLLUP_TOTALS, "overall_min", "overall_max")
+    statement = insert(table).values([
+        {"id": uuid4(), **{column: getattr(delta, column) for column in columns}} for delta in deltas
+    ])
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=["supplier_id", "period_type", "period_start"],
+        set_={
+            **{column: table.c[column] + excluded[column] for column in ROLLUP_TOTALS},
+            "overall_min": least(func.coalesce(table.c.overall_min, excluded.overall_min), excluded.overall_min),
+            "overall_max": greatest(func.coalesce(table.c.overall_max, excluded.overall_max), excluded.overall_max),
+        },
+    )
+    await session.execute(statement)
+
+
+async def _apply_rollups_locked(session: Session, deltas: List[SupplierPerformanceRollup]):
+    # No upsert for this dialect: lock the existing rows for the rest of the transaction
+    result = await session.execute(
+        select(SupplierPerformanceRollup).where(
+            tuple_(
+                SupplierPerformanceRollup.supplier_id,
+                SupplierPerformanceRollup.period_type,
+                SupplierPerformanceRollup.period_start,
+            ).in_([(d.supplier_id, d.period_type, d.period_start) for d in deltas])
+        ).with_for_update().execution_options(populate_existing=True)
+    )
+    existing = {_key(r.supplier_id, r.period_type, r.period_start): r for r in result.scalars().all()}
+    for delta in deltas:
+        rollup = existing.get(_key(delta.supplier_id, delta.period_type, delta.period_start))
+        if rollup is None:
+            session.add(delta)
+            continue
+        for column in ROLLUP_TOTALS:
+            setattr(rollup, column, getattr(rollup, column) + getattr(delta, column))
+        rollup.overall_min = delta.overall_min if rollup.overall_min is None else min(rollup.overall_min, delta.overall_min)
+        rollup.overall_max = delta.overall_max if rollup.overall_max is None else max(rollup.overall_max, delta.overall_max)
+
+
+async def record_performance(session: Session, reports: List[SupplierPerformance]) -> List[SupplierPerformance]:
+    """
+    Insert performance reports and fold them into the monthly and quarterly rollups
+    in the same transaction.
+
+    Args:
+        session: DB Session.
+        reports: New reports (overall_score already set).
+
+    Returns:
+        List[SupplierPerformance]: The stored reports.
+    """
+    for attempt in range(2):
+        session.add_all(reports)
+        await _apply_rollups(session, reports)
+        try:
+            await session.commit()
+            return reports
+        except IntegrityError:
+            # Without upsert support, another writer may create one of the same rollups
+            # first; re-read and fold again
+            await session.rollback()
+            if attempt:
+                raise
+            logger.info("Performance rollup conflict, retrying")
+    return reports
+
+
+async def rebuild_rollups(session: Session, batch_size: int = 5000) -> int:
+    """
+    Recompute every rollup from the raw reports (backfill or repair).
+
+    Returns:
+        int: Reports folded.
+    """
+    await session.execute(delete(SupplierPerformanceRollup))
+    folded = 0
+    offset = 0
+    while True:
+        result = await session.execute(
+            select(SupplierPerformance).order_by(SupplierPerformance.id).offset(offset).limit(batch_size)
+        )
+        reports = list(result.scalars().all())
+        if not reports:
+            break
+        await _apply_rollups(session, reports)
+        await session.flush()
+        folded += len(reports)
+        offset += batch_size
+    await session.commit()
+    return folded
+
+
+def rollup_averages(rollup: SupplierPerformanceRollup) -> Dict[str, float]:
+    count = rollup.report_count or 1
+    return {
+        "quality": rollup.quality_sum / count,
+        "delivery": rollup.delivery_sum / count,
+        "cost": rollup.cost_sum / count,
+        "overall": rollup.overall_sum / count,
+    }
+
+
+async def load_trend(
+    session: Session,
+    supplier_id: UUID,
+    period_type: str = "month",
+    window: int = DEFAULT_MOVING_WINDOW,
+    since: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    A supplier's per-period averages with trailing moving averages over `window`
+    periods (report-weighted), oldest first. Reads rollups only.
+    """
+    if period_type not in PERIOD_TYPES:
+        raise ValueError(f"Unknown period type '{period_type}'")
+    query = select(SupplierPerformanceRollup).where(
+        SupplierPerformanceRollup.supplier_id == supplier_id,
+        SupplierPerformanceRollup.period_type == period_type,
+    )
+    rollups = list((await session.execute(query.order_by(SupplierPerformanceRollup.period_start))).scalars().all())
+
+    trend = []
+    for i, rollup in enumerate(rollups):
+        recent = rollups[max(0, i - window + 1):i + 1]
+        reports = sum(r.report_count for r in recent) or 1
+        point = {
+            "period_start": rollup.period_start,
+            "reports": rollup.report_count,
+            **rollup_averages(rollup),
+            "overall_min": rollup.overall_min,
+            "overall_max": rollup.overall_max,
+        }
+        for metric in METRICS:
+            point[f"{metric}_moving_avg"] = sum(getattr(r, f"{metric}_sum") for r in recent) / reports
+        trend.append(point)
+    if since is not None:
+        since = since.replace(tzinfo=None)
+        trend = [p for p in trend if p["period_start"].replace(tzinfo=None) >= since]
+    return trend
+
+
+async def load_rankings(
+    session: Session,
+    period_type: str = "quarter",
+    period_start: Optional[datetime] = None,
+    metric: str = "overall",
+    limit: int = 20,
+    ascending: bool = False,
+) -> Dict[str, Any]:
+    """
+    Suppliers ranked by their average `metric` in one period (default: the latest
+    period with data). Reads rollups only.
+    """
+    if period_type not in PERIOD_TYPES:
+        raise ValueError(f"Unknown period type '{period_type}'")
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}' (expected one of {', '.join(METRICS)})")
+
+    if period_start is None:
+        period_start = (await session.execute(
+            select(func.max(SupplierPerformanceRollup.period_start))
+            .where(SupplierPerformanceRollup.period_type == period_type)
+        )).scalar()
+        if period_start is None:
+            return {"period_type": period_type, "period_start": None, "metric": metric, "suppliers": []}
+    else:
+        period_start = period_bucket(period_start, period_type)
+
+    average = getattr(SupplierPerformanceRollup, f"{metric}_sum") / SupplierPerformanceRollup.report_count
+    result = await session.execute(
+        select(SupplierPerformanceRollup, average.label("average"))
+        .where(
+            SupplierPerformanceRollup.period_type == period_type,
+            SupplierPerformanceRollup.period_start == period_start,
+        )
+        .order_by(average.asc() if ascending else average.desc())
+        .limit(limit)
+    )
+    return {
+        "period_type": period_type,
+        "period_start": period_start,
+        "metric": metric,
+        "suppliers": [
+            {"rank": i + 1, "supplier_id": str(rollup.supplier_id), "average": avg,
+             "reports": rollup.report_count}
+            for i, (rollup, avg) in enumerate(result.all())
+        ],
+    }
+
+
+def build_reports(supplier_id: UUID, entries: Iterable[Any]) -> List[SupplierPerformance]:
+    """
+    SupplierPerformance rows from API payloads (period_start, period_end and the KPI scores).
+    """
+    return [
+        SupplierPerformance(
+            supplier_id=supplier_id,
+            period_start=entry.period_start,
+            period_end=entry.period_end,
+            quality_score=entry.quality_score,
+            delivery_score=entry.delivery_score,
+            cost_score=entry.cost_score,
+            overall_score=overall_score(entry.quality_score, entry.delivery_score, entry.cost_score),
+        )
+        for entry in entries
+    ]
@@ -0,0 +1,472 @@
+import asyncio
+import csv
+import logging
+import re
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Legal forms and filler words carry no identity; "Acme Ltd" and "ACME Limited" are the same name
+STOPWORDS = frozenset(
+    "ltd limited llc inc incorporated corp corporation co company plc gmbh ag sa sas sarl srl spa bv nv "
+    "oy ab as jsc pjsc ojsc oao ooo zao llp lp the and of".split()
+)
+POSTINGS_BUDGET = 6000  # Name rows gathered from the rarest query keys
+MIN_QUERY_KEYS = 3
+POOL_SIZE = 256  # Candidates scored against every query key
+CANDIDATES = 8  # Best of the pool re-ranked by exact name similarity
+PHONETIC_WEIGHT = 0.35  # Weight of sound-alike tokens when they raise the trigram similarity
+COUNTRY_BOOST = 0.05
+IGNORED_SUFFIXES = (".tmp", ".part", ".partial")
+
+_SOUNDEX_CODES = {c: str(d) for d, letters in enumerate(("aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r")) for c in letters}
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> List[str]:
+    """
+    Tokens of a name: accents stripped, lower case, punctuation removed, legal
+    forms dropped (unless nothing else is left).
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    tokens = _NON_WORD.sub(" ", ascii_folded.lower()).split()
+    meaningful = [t for t in tokens if t not in STOPWORDS]
+    return meaningful or tokens
+
+
+def trigrams(tokens: Iterable[str]) -> set:
+    # Over the joined name, so "Aero Caribbean" and "AEROCARIBBEAN" share almost all
+    padded = f"${''.join(tokens)}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def soundex(token: str) -> str:
+    """
+    American Soundex of an ASCII word ("mohammed" and "muhammad" -> m530);
+    other tokens are their own key.
+    """
+    if not token.isascii() or not token.isalpha():
+        return token
+    codes = [token[0]]
+    previous = _SOUNDEX_CODES.get(token[0], "")
+    for c in token[1:]:
+        code = _SOUNDEX_CODES.get(c, "")
+        if code != "0" and code != previous:
+            codes.append(code)
+        if c not in "hw":
+            previous = code
+    return ("".join(codes) + "000")[:4]
+
+
+def phonetic_keys(tokens: Iterable[str]) -> set:
+    return {f"#{soundex(t)}" for t in tokens}
+
+
+def token_keys(tokens: Iterable[str]) -> set:
+    return {f"={t}" for t in tokens}
+
+
+class SanctionsEntry:
+    """
+    One listed party with all its names (primary first).
+    """
+
+    __slots__ = ("id", "names", "list_name", "program", "countries", "schema")
+
+    def __init__(
+        self,
+        id: str,
+        names: Sequence[str],
+        list_name: str,
+        program: str = "",
+        countries: Sequence[str] = (),
+        schema: str = "entity",
+    ):
+        self.id = id
+        self.names = tuple(names)
+        self.list_name = list_name
+        self.program = program
+        self.countries = tuple(c.upper() for c in countries if c)
+        self.schema = schema
+
+
+class SanctionsIndex:
+    """
+    Immutable in-memory index for fuzzy sanctions screening.
+
+    Every listed name is keyed by its whole tokens, their character trigrams and
+    their Soundex codes. Each key maps to a sorted int32 array of name rows, and
+    each name row to its key ids (one flat int32 array with offsets).
+
+    A query gathers a candidate pool from its rarest keys (within
+    POSTINGS_BUDGET), scores the pool against all its keys by IDF-weighted Dice,
+    and returns the best by trigram similarity, lifted by phonetic token overlap.
+
+    Like the policy index, a new index is built off to the side and swapped in
+    whole, so screening never sees a half-loaded list.
+
+    Attributes:
+        generation (int): Monotonic stamp incremented on every swap.
+        built_at (datetime): When this snapshot was built.
+        sources (List[str]): List files it was built from.
+    """
+
+    def __init__(self, entries: Iterable[SanctionsEntry] = (), generation: int = 0, sources: Sequence[str] = ()):
+        self.entries: List[SanctionsEntry] = list(entries)
+        self.generation = generation
+        self.built_at = datetime.now(timezone.utc)
+        self.sources = list(sources)
+
+        key_ids: Dict[str, int] = {}
+        keyed: List[List[int]] = []
+        name_entry: List[int] = []
+        name_keys: List[int] = []
+        name_offsets = [0]
+        self._name_tokens: List[Tuple[str, ...]] = []
+        for entry_idx, entry in enumerate(self.entries):
+            seen = set()
+            for name in entry.names:
+                tokens = tuple(normalize_name(name))
+                if not tokens or tokens in seen:
+                    continue
+                seen.add(tokens)
+                row = len(name_entry)
+                name_entry.append(entry_idx)
+                self._name_tokens.append(tokens)
+                for key in trigrams(tokens) | phonetic_keys(tokens) | token_keys(tokens):
+                    key_id = key_ids.setdefault(key, len(keyed))
+                    if key_id == len(keyed):
+                        keyed.append([])
+                    keyed[key_id].append(row)
+                    name_keys.append(key_id)
+                name_offsets.append(len(name_keys))
+
+        self._key_ids = key_ids
+        self._postings: List[np.ndarray] = [np.array(rows, dtype=np.int32) for rows in keyed]
+        self._name_entry = np.array(name_entry, dtype=np.int32)
+        self._name_keys = np.array(name_keys, dtype=np.int32)
+        self._name_offsets = np.array(name_offsets, dtype=np.int64)
+
+        # Rare keys identify a name; a key on every name says nothing
+        sizes = np.array([len(p) for p in self._postings], dtype=np.float64)
+        self._key_idf = np.log1p(len(name_entry) / np.maximum(sizes, 1))
+        self._unseen_idf = float(np.log1p(len(name_entry)))
+        self._key_kind = np.zeros(len(keyed), dtype=np.int8)  # 0 trigram, 1 phonetic, 2 token
+        for key, key_id in key_ids.items():
+            self._key_kind[key_id] = 1 if key[0] == "#" else 2 if key[0] == "=" else 0
+
+        rows = np.repeat(np.arange(len(name_entry)), np.diff(self._name_offsets))
+        kinds = self._key_kind[self._name_keys]
+        self._name_weight = np.bincount(rows, weights=self._key_idf[self._name_keys], minlength=len(name_entry))
+        self._name_trigrams = np.bincount(rows[kinds == 0], minlength=len(name_entry)).astype(np.int16)
+        self._name_phonetics = np.bincount(rows[kinds == 1], minlength=len(name_entry)).astype(np.int16)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def name_count(self) -> int:
+        return len(self._name_entry)
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether any list has been loaded. An empty index clears every name, so
+        screening against it must not be reported as a clean result.
+        """
+        return self.generation > 0 and len(self.entries) > 0
+
+    def screen(
+        self,
+        name: str,
+        country_code: Optional[str] = None,
+        limit: int = 5,
+        threshold: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Listed parties whose names best match `name`, best first.
+
+        Args:
+            name: Name to screen.
+            country_code: ISO alpha-2 code; entries listed for it get a small boost.
+            limit: Max matches returned.
+            threshold: Min score (0-1) to include.
+
+        Returns:
+            List[Dict]: {"entry_id", "name", "matched_name", "score", "list", "program", "countries", "schema"}.
+        """
+        tokens = normalize_name(name)
+        if not tokens or not self._postings:
+            return []
+        grams = trigrams(tokens)
+        phonetics = phonetic_keys(tokens)
+        query_keys = grams | phonetics | token_keys(tokens)
+        known = sorted(
+            (self._key_ids[k] for k in query_keys if k in self._key_ids), key=lambda key_id: len(self._postings[key_id])
+        )
+        if not known:
+            return []
+        known_ids = np.array(known, dtype=np.int32)
+        query_weight = float(self._key_idf[known_ids].sum()) + self._unseen_idf * (len(query_keys) - len(known))
+
+        # Candidate pool from the rare keys: selective and cheap to gather
+        selected, gathered = 0, 0
+        for key_id in known:
+            size = len(self._postings[key_id])
+            if selected >= MIN_QUERY_KEYS and gathered + size > POSTINGS_BUDGET:
+                break
+            selected += 1
+            gathered += size
+        rows, hits = np.unique(np.concatenate([self._postings[k] for k in known[:selected]]), return_counts=True)
+        if len(rows) > POOL_SIZE:
+            rows = rows[np.argpartition(-hits, POOL_SIZE)[:POOL_SIZE]]
+
+        # Score the pool against every query key, common ones included
+        starts = self._name_offsets[rows]
+        counts = self._name_offsets[rows + 1] - starts
+        segment = np.repeat(np.arange(len(rows)), counts)
+        keys = self._name_keys[np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)]
+        query_mask = np.zeros(len(self._postings), dtype=bool)
+        query_mask[known_ids] = True
+        matched = query_mask[keys]
+        segment, keys = segment[matched], keys[matched]
+        weights = np.bincount(segment, weights=self._key_idf[keys], minlength=len(rows))
+        similarity = 2 * weights / (query_weight + self._name_weight[rows])
+        if len(rows) > CANDIDATES:
+            best = np.argpartition(-similarity, CANDIDATES)[:CANDIDATES]
+            renumber = np.full(len(rows), -1)
+            renumber[best] = np.arange(len(best))
+            segment = renumber[segment]
+            kept = segment >= 0
+            rows, segment, keys = rows[best], segment[kept], keys[kept]
+        kinds = self._key_kind[keys]
+        trigram_hits = np.bincount(segment[kinds == 0], minlength=len(rows))
+        phonetic_hits = np.bincount(segment[kinds == 1], minlength=len(rows))
+        dice = 2 * trigram_hits / (len(grams) + self._name_trigrams[rows])
+        phonetic = phonetic_hits / np.maximum(len(phonetics), self._name_phonetics[rows])
+        # Sound-alike tokens can lift a score but never sink a close spelling ("Aero Caribbean")
+        scores = np.maximum(dice, (1 - PHONETIC_WEIGHT) * dice + PHONETIC_WEIGHT * phonetic)
+
+        country = country_code.upper() if country_code else None
+        best: Dict[int, Tuple[float, int]] = {}
+        for row, score in zip(rows.tolist(), scores.tolist()):
+            entry_idx = int(self._name_entry[row])
+            if country and country in self.entries[entry_idx].countries:
+                score = min(1.0, score + COUNTRY_BOOST)
+            if score >= threshold and score > best.get(entry_idx, (-1.0, 0))[0]:
+                best[entry_idx] = (score, row)
+
+        ranked = sorted(best.items(), key=lambda item: -item[1][0])[:limit]
+        return [
+            {
+                "entry_id": self.entries[entry_idx].id,
+                "name": self.entries[entry_idx].names[0],
+                "matched_name": " ".join(self._name_tokens[row]),
+                "score": round(score, 4),
+                "list": self.entries[entry_idx].list_name,
+                "program": self.entries[entry_idx].program,
+                "countries": list(self.entries[entry_idx].countries),
+                "schema": self.entries[entry_idx].schema,
+            }
+            for entry_idx, (score, row) in ranked
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "loaded": self.loaded,
+            "built_at": self.built_at.isoformat(),
+            "entries": len(self.entries),
+            "names": self.name_count,
+            "keys": len(self._postings),
+            "index_bytes": int(sum(p.nbytes for p in self._postings) + self._name_keys.nbytes),
+            "sources": self.sources,
+        }
+
+
+# --- List files ---
+
+def _split(value: str, separators: str = "|;") -> List[str]:
+    return [part.strip() for part in re.split(f"[{re.escape(separators)}]", value or "") if part.strip()]
+
+
+def _ofac_value(value: str) -> str:
+    # OFAC marks empty fields with "-0-"
+    value = (value or "").strip()
+    return "" if value == "-0-" else value
+
+
+def _read_rows(path: Path, delimiter: str = ",") -> List[List[str]]:
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        return [row for row in csv.reader(f, delimiter=delimiter) if row]
+
+
+def read_list_file(path: Path) -> Tuple[List[SanctionsEntry], Dict[str, List[str]]]:
+    """
+    Parse one list file. Supported layouts:
+
+    - OFAC SDN `sdn.csv` (no header: ent_num, name, type, program, ...) and its
+      `alt.csv` aliases (ent_num, alt_num, type, alias, ...);
+    - EU consolidated list CSV (";"-separated, one row per name alias);
+    - a simple CSV with a header row: id, name, aliases ("|"-separated),
+      countries, list, program, type.
+
+    Returns:
+        Tuple: Entries, and aliases for entries defined in another file (OFAC alt.csv).
+    """
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        first_line = f.readline()
+
+    if "NameAlias_WholeName" in first_line:
+        return _read_eu(path), {}
+    if path.name.lower().startswith("alt"):
+        aliases: Dict[str, List[str]] = {}
+        for row in _read_rows(path):
+            if len(row) >= 4 and _ofac_value(row[3]):
+                aliases.setdefault(f"ofac:{row[0].strip()}", []).append(_ofac_value(row[3]))
+        return [], aliases
+    if first_line.split(",")[0].strip().isdigit():
+        entries = [
+            SanctionsEntry(
+                id=f"ofac:{row[0].strip()}",
+                names=[_ofac_value(row[1])],
+                list_name="OFAC SDN",
+                program=_ofac_value(row[3]) if len(row) > 3 else "",
+                schema=(_ofac_value(row[2]).lower() or "entity") if len(row) > 2 else "entity",
+            )
+            for row in _read_rows(path) if len(row) > 1 and _ofac_value(row[1])
+        ]
+        return entries, {}
+    return _read_simple(path), {}
+
+
+def _read_eu(path: Path) -> List[SanctionsEntry]:
+    grouped: Dict[str, Dict[str, Any]] = {}
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            entity_id = (row.get("Entity_LogicalId") or "").strip()
+            if not entity_id:
+                continue
+            entity = grouped.setdefault(entity_id, {
+                "names": [], "countries": set(),
+                "program": (row.get("Entity_Regulation_Programme") or "").strip(),
+                "schema": (row.get("Entity_SubjectType") or "entity").strip().lower() or "entity",
+            })
+            alias = (row.get("NameAlias_WholeName") or "").strip()
+            if alias and alias not in entity["names"]:
+                entity["names"].append(alias)
+            for column in ("Address_CountryIso2Code", "Citizenship_CountryIso2Code"):
+                if (row.get(column) or "").strip():
+                    entity["countries"].add(row[column].strip())
+    return [
+        SanctionsEntry(f"eu:{entity_id}", e["names"], "EU Consolidated", e["program"], sorted(e["countries"]), e["schema"])
+        for entity_id, e in grouped.items() if e["names"]
+    ]
+
+
+def _read_simple(path: Path) -> List[SanctionsEntry]:
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or "name" not in reader.fieldnames:
+            raise ValueError(f"{path.name}: unrecognized sanctions list layout")
+        return [
+            SanctionsEntry(
+                id=row.get("id") or f"{path.stem}:{i}",
+                names=[row["name"]] + _split(row.get("aliases", ""), "|"),
+                list_name=row.get("list") or path.stem,
+                program=row.get("program") or "",
+                countries=_split(row.get("countries", "")),
+                schema=(row.get("type") or "entity").lower(),
+            )
+            for i, row in enumerate(reader) if (row.get("name") or "").strip()
+        ]
+
+
+def list_files(directory: Path) -> List[Path]:
+    """
+    List files in `directory`. Files still being written should use a temporary
+    name (leading "." or .tmp/.part suffix) and be renamed when complete.
+    """
+    if not directory.is_dir():
+        return []
+    return sorted(
+        p for p in directory.iterdir()
+        if p.is_file() and not p.name.startswith(".") and not p.name.endswith(IGNORED_SUFFIXES)
+    )
+
+
+def build_index(paths: Sequence[Path], generation: int = 0) -> SanctionsIndex:
+    """
+    Parse the list files and build an index (CPU-bound; run off the event loop).
+    """
+    entries: List[SanctionsEntry] = []
+    aliases: Dict[str, List[str]] = {}
+    for path in paths:
+        file_entries, file_aliases = read_list_file(path)
+        entries.extend(file_entries)
+        for entry_id, names in file_aliases.items():
+            aliases.setdefault(entry_id, []).extend(names)
+    if aliases:
+        entries = [
+            SanctionsEntry(e.id, e.names + tuple(aliases[e.id]), e.list_name, e.program, e.countries, e.schema)
+            if e.id in aliases else e
+            for e in entries
+        ]
+    return SanctionsIndex(entries, generation=generation, sources=[p.name for p in paths])
+
+
+# --- Current index ---
+
+_current_index = SanctionsIndex()
+_current_signature: Optional[Tuple] = None
+_swap_lock = asyncio.Lock()
+
+
+def get_sanctions_index() -> SanctionsIndex:
+    """
+    The current index snapshot. Hold on to the returned object for a consistent view.
+    """
+    return _current_index
+
+
+def _signature(paths: Sequence[Path]) -> Tuple:
+    return tuple((p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in paths)
+
+
+async def reload_sanctions_index(directory: Optional[str] = None, force: bool = False) -> SanctionsIndex:
+    """
+    Rebuild the index if the list files in `directory` (default SANCTIONS_LIST_DIR)
+    changed since the last build, then swap it in. A file that fails to parse
+    keeps the previous index in service.
+
+    Returns:
+        SanctionsIndex: The index in service afterwards.
+    """
+    global _current_index, _current_signature
+    async with _swap_lock:
+        paths = list_files(Path(directory or settings.SANCTIONS_LIST_DIR))
+        signature = _signature(paths)
+        if signature == _current_signature and not force:
+            return _current_index
+        try:
+            index = await asyncio.to_thread(build_index, paths, _current_index.generation + 1)
+        except Exception as e:
+            logger.error(f"Sanctions list reload failed, keeping generation {_current_index.generation}: {e}")
+            return _current_index
+        _current_index, _current_signature = index, signature
+        if not index.loaded:
+            logger.error(f"No sanctions entries found in '{directory or settings.SANCTIONS_LIST_DIR}'; "
+                         "local screening is unavailable until list files are added.")
+        logger.info(
+            f"Sanctions index generation {index.generation} active "
+            f"({len(index)} entries, {index.name_count} names from {len(paths)} files)."
+        )
+        return index
@@ -0,0 +1,212 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+from sqlalchemy import bindparam, func, select, update
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import Supplier, SupplierPerformance, SupplierRiskProfile
+
+logger = logging.getLogger(__name__)
+
+UPDATE_CHUNK_SIZE = 10000
+SCORE_TOLERANCE = 1e-6  # Scores closer than this to the stored one are not rewritten
+
+
+class RiskWeights(BaseModel):
+    """
+    Weights of the supplier risk score components. Only their ratios matter; a
+    supplier missing a component (no profile yet, no performance report) is scored
+    on the components it has.
+    """
+    financial: float = settings.RISK_WEIGHT_FINANCIAL
+    sentiment: float = settings.RISK_WEIGHT_SENTIMENT
+    performance: float = settings.RISK_WEIGHT_PERFORMANCE
+    # Blend of the performance KPIs (each 0-100, higher is better)
+    quality: float = 1.0
+    delivery: float = 1.0
+    cost: float = 1.0
+
+
+class PortfolioRiskInputs:
+    """
+    Latest risk inputs of every supplier as aligned arrays (NaN where missing).
+    """
+
+    def __init__(
+        self,
+        supplier_ids: List[Any],
+        current: np.ndarray,
+        financial: np.ndarray,
+        sentiment: np.ndarray,
+        sanctions: np.ndarray,
+        quality: np.ndarray,
+        delivery: np.ndarray,
+        cost: np.ndarray,
+    ):
+        self.supplier_ids = supplier_ids
+        self.current = current
+        self.financial = financial
+        self.sentiment = sentiment
+        self.sanctions = sanctions
+        self.quality = quality
+        self.delivery = delivery
+        self.cost = cost
+
+    def __len__(self) -> int:
+        return len(self.supplier_ids)
+
+
+def score_portfolio(inputs: PortfolioRiskInputs, weights: Optional[RiskWeights] = None) -> np.ndarray:
+    """
+    Risk from 0 (safe) to 100 (critical) for every supplier at once. With the
+    default weights this matches `combined_risk_score` (60% financial, 40%
+    sentiment, sanctions hit -> 100).
+
+    Returns:
+        np.ndarray: Scores, NaN for suppliers without any risk input.
+    """
+    weights = weights or RiskWeights()
+    financial_risk = 100.0 - inputs.financial
+    sentiment_risk = (1.0 - inputs.sentiment) * 50.0
+    kpi_weights = np.array([weights.quality, weights.delivery, weights.cost])
+    kpis = np.stack([inputs.quality, inputs.delivery, inputs.cost])
+    performance_risk = 100.0 - (kpis * kpi_weights[:, None]).sum(axis=0) / kpi_weights.sum()
+
+    components = np.stack([financial_risk, sentiment_risk, performance_risk])
+    component_weights = np.array([weights.financial, weights.sentiment, weights.performance])[:, None]
+    present = ~np.isnan(components) & (component_weights > 0)
+    weight_sum = (component_weights * present).sum(axis=0)
+    weighted = (np.where(present, components, 0.0) * component_weights).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.clip(weighted / weight_sum, 0.0, 100.0)
+    return np.where(inputs.sanctions > 0.5, 100.0, scores)
+
+
+def score_supplier(
+    financial_stress_score: float,
+    news_sentiment_score: float,
+    sanctions_flag: bool,
+    performance: Optional[SupplierPerformance] = None,
+    weights: Optional[RiskWeights] = None,
+) -> float:
+    """
+    `score_portfolio` for a single supplier.
+    """
+    kpis = (performance.quality_score, performance.delivery_score, performance.cost_score) if performance else (None,) * 3
+    inputs = PortfolioRiskInputs(
+        [None], np.zeros(1),
+        *(np.array([v], dtype=np.float64)
+          for v in (financial_stress_score, news_sentiment_score, sanctions_flag) + kpis),
+    )
+    return float(score_portfolio(inputs, weights)[0])
+
+
+def _latest(model, order_column):
+    ranked = select(
+        model,
+        func.row_number().over(partition_by=model.supplier_id, order_by=order_column.desc()).label("rank"),
+    ).subquery()
+    return ranked, ranked.c["rank"] == 1
+
+
+async def load_portfolio(session: Session) -> PortfolioRiskInputs:
+    """
+    One query: every supplier joined with its current risk profile and latest
+    performance report.
+    """
+    performance, performance_latest = _latest(SupplierPerformance, SupplierPerformance.period_end)
+    query = (
+        select(
+            Supplier.id,
+            Supplier.risk_score,
+            SupplierRiskProfile.financial_stress_score,
+            SupplierRiskProfile.news_sentiment_score,
+            SupplierRiskProfile.sanctions_flag,
+            performance.c.quality_score,
+            performance.c.delivery_score,
+            performance.c.cost_score,
+        )
+        .outerjoin(SupplierRiskProfile, SupplierRiskProfile.id == Supplier.current_risk_profile_id)
+        .outerjoin(performance, (performance.c.supplier_id == Supplier.id) & performance_latest)
+    )
+    rows = (await session.execute(query)).all()
+    if not rows:
+        empty = np.empty(0)
+        return PortfolioRiskInputs([], empty, empty, empty, empty, empty, empty, empty)
+
+    columns = list(zip(*rows))
+    # None (no profile / no report) becomes NaN
+    arrays = [np.array(column, dtype=np.float64) for column in columns[1:]]
+    return PortfolioRiskInputs(list(columns[0]), *arrays)
+
+
+async def rescore_suppliers(
+    session: Session,
+    weights: Optional[RiskWeights] = None,
+    dry_run: bool = False,
+    top: int = 10,
+) -> Dict[str, Any]:
+    """
+    Recompute `Supplier.risk_score` for the whole portfolio and bulk-update the
+    scores that changed. With `dry_run` nothing is written (what-if weights).
+
+    Returns:
+        Dict: Counts, score distribution and the largest changes.
+    """
+    started = time.perf_counter()
+    inputs = await load_portfolio(session)
+    loaded = time.perf_counter()
+    scores = score_portfolio(inputs, weights)
+    scored = time.perf_counter()
+
+    scoreable = ~np.isnan(scores)
+    delta = np.where(scoreable, scores - inputs.current, 0.0)
+    changed = np.flatnonzero(np.abs(delta) > SCORE_TOLERANCE)
+
+    if not dry_run and len(changed):
+        statement = (
+            update(Supplier.__table__)
+            .where(Supplier.__table__.c.id == bindparam("supplier_id"))
+            .values(risk_score=bindparam("score"))
+        )
+        for start in range(0, len(changed), UPDATE_CHUNK_SIZE):
+            chunk = changed[start:start + UPDATE_CHUNK_SIZE]
+            await session.execute(statement, [
+                {"supplier_id": inputs.supplier_ids[i], "score": float(scores[i])} for i in chunk
+            ])
+        await session.commit()
+
+    largest = changed[np.argsort(-np.abs(delta[changed]))[:top]]
+    valid = scores[scoreable]
+    summary = {
+        "suppliers": len(inputs),
+        "scored": int(scoreable.sum()),
+        "changed": int(len(changed)),
+        "dry_run": dry_run,
+        "weights": (weights or RiskWeights()).model_dump(),
+        "distribution": {
+            "mean": round(float(valid.mean()), 2) if len(valid) else None,
+            "p50": round(float(np.percentile(valid, 50)), 2) if len(valid) else None,
+            "p90": round(float(np.percentile(valid, 90)), 2) if len(valid) else None,
+            "high_risk": int((valid > 70).sum()),
+        },
+        "largest_changes": [
+            {"supplier_id": str(inputs.supplier_ids[i]), "from": round(float(inputs.current[i]), 2),
+             "to": round(float(scores[i]), 2)}
+            for i in largest
+        ],
+        "timings_ms": {
+            "load": round((loaded - started) * 1000, 1),
+            "score": round((scored - loaded) * 1000, 1),
+            "write": round((time.perf_counter() - scored) * 1000, 1),
+        },
+    }
+    logger.info(
+        f"Rescored {summary['scored']} suppliers ({summary['changed']} changed"
+        f"{', dry run' if dry_run else ''}) in {sum(summary['timings_ms'].values()):.0f} ms"
+    )
+    return summary
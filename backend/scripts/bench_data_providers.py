@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+import httpx
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.supplier.adapters.dnb import DnBClient
+from app.supplier.adapters.http import ResponseCache, build_http_client
+from app.supplier.adapters.live import LiveDataProvider
+from app.supplier.adapters.newsapi import NewsApiClient
+from app.supplier.adapters.sanctions import SanctionsClient
+from app.supplier.adapters.standins import build_standin_app
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the supplier data adapters against the local vendor stand-ins over "
+            "real sockets: a new connection per lookup vs the shared pool, single vs bulk "
+            "sanctions screening, and cached repeats."
+        )
+    )
+    parser.add_argument("--suppliers", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in latency per response (seconds)")
+    return parser.parse_args()
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def provider(client: httpx.AsyncClient, base_url: str, cache_ttl: float = 0.0) -> LiveDataProvider:
+    ttls = {"financials": cache_ttl, "news": cache_ttl, "sanctions": cache_ttl}
+    return LiveDataProvider(
+        DnBClient(client, base_url, "bench", "bench"),
+        NewsApiClient(client, base_url, "bench"),
+        SanctionsClient(client, base_url),
+        ResponseCache(ttls),
+    )
+
+async def run(label: str, items: List[str], concurrency: int, call: Callable[[str], Awaitable]):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(item: str):
+        async with semaphore:
+            start = time.perf_counter()
+            await call(item)
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(item) for item in items))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<44} {len(items) / elapsed:8.0f}/s  p50 {percentile(latencies, 50) * 1000:6.1f} ms"
+          f"  p95 {percentile(latencies, 95) * 1000:6.1f} ms")
+
+async def main():
+    args = parse_args()
+    import uvicorn
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = uvicorn.Server(uvicorn.Config(
+        build_standin_app(latency=args.latency), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    duns = [f"{100000000 + i}" for i in range(args.suppliers)]
+    names = [f"Supplier {i}" for i in range(args.suppliers)]
+    try:
+        print(f"{args.suppliers} suppliers, concurrency {args.concurrency}, stand-in latency {args.latency * 1000:.0f} ms\n")
+
+        async def unpooled(d: str):
+            # A fresh client per lookup: new connection (and token) every time
+            async with httpx.AsyncClient() as client:
+                await provider(client, base_url).get_financial_health(d)
+        await run("financials, new connection per lookup", duns, args.concurrency, unpooled)
+
+        async with build_http_client() as client:
+            pooled = provider(client, base_url)
+            await run("financials, shared pool", duns, args.concurrency, pooled.get_financial_health)
+            await run("news, shared pool", names, args.concurrency, pooled.get_market_news)
+            await run("sanctions, one request per supplier", names, args.concurrency,
+                      lambda n: pooled.sanctions.check_compliance(n, "US"))
+
+            started = time.perf_counter()
+            await pooled.check_compliance_many([(n, "US") for n in names])
+            elapsed = time.perf_counter() - started
+            print(f"{'sanctions, bulk screening':<44} {len(names) / elapsed:8.0f}/s  "
+                  f"({-(-len(names) // pooled.sanctions.batch_size)} requests)")
+
+            cached = provider(client, base_url, cache_ttl=3600)
+            await cached.get_financial_health_many(duns)
+            await run("financials, cached repeat", duns, args.concurrency, cached.get_financial_health)
+            print(f"\ncache: {cached.stats()}")
+    finally:
+        server.should_exit = True
+        await serving
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.embeddings import decode, encode
+
+CHUNKS = 20000
+DIMENSIONS = 1536
+QUERIES = 50
+TOP_K = 10
+RESCORE_FACTOR = 4
+
+def top_k(matrix, query, k):
+    distances = np.linalg.norm(matrix - query, axis=1)
+    top = np.argpartition(distances, k - 1)[:k]
+    return top[np.argsort(distances[top])]
+
+def recall(found, truth):
+    return len(set(found) & set(truth)) / len(truth)
+
+def main():
+    rng = np.random.default_rng(0)
+    corpus = rng.standard_normal((CHUNKS, DIMENSIONS)).astype(np.float32)
+    queries = corpus[rng.choice(CHUNKS, QUERIES, replace=False)] + 0.1 * rng.standard_normal((QUERIES, DIMENSIONS))
+    truth = [top_k(corpus, q, TOP_K) for q in queries]
+
+    # Legacy storage: the vector column serialized as JSON text
+    json_rows = [json.dumps(v.tolist()) for v in corpus[:1000]]
+    start = time.perf_counter()
+    for row in json_rows:
+        np.asarray(json.loads(row), dtype=np.float32)
+    json_decode_ms = (time.perf_counter() - start) * CHUNKS
+    print(f"{'format':<10} {'bytes/chunk':>12} {'load ms':>10} {'recall@10':>10} {'rescored':>10}")
+    print(f"{'json':<10} {sum(map(len, json_rows)) / len(json_rows):>12.0f} {json_decode_ms:>10.1f} {1.0:>10.3f} {'-':>10}")
+
+    full = corpus
+    for fmt in ("float32", "float16", "int8"):
+        blobs = [encode(v, fmt) for v in corpus]
+        start = time.perf_counter()
+        matrix = np.vstack([decode(b) for b in blobs])
+        load_ms = (time.perf_counter() - start) * 1000
+
+        coarse_recall, rescored_recall = [], []
+        for query, expected in zip(queries, truth):
+            coarse = top_k(matrix, query, TOP_K * RESCORE_FACTOR)
+            coarse_recall.append(recall(coarse[:TOP_K], expected))
+            rescored = coarse[top_k(full[coarse], query, TOP_K)]
+            rescored_recall.append(recall(rescored, expected))
+        print(f"{fmt:<10} {len(blobs[0]):>12} {load_ms:>10.1f} "
+              f"{np.mean(coarse_recall):>10.3f} {np.mean(rescored_recall):>10.3f}")
+
+if __name__ == "__main__":
+    main()
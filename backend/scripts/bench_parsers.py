@@ -0,0 +1,82 @@
+import asyncio
+import io
+import os
+import sys
+import time
+import zipfile
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.contract.parser import SNIFF_BYTES, detect_parser
+
+PARAGRAPHS = 2000
+RUNS = 3
+CLAUSE = "The Supplier shall invoice monthly in arrears and invoices are payable Net 45 from receipt"
+
+def make_text() -> bytes:
+    return "\n\n".join(f"{i}. {CLAUSE}." for i in range(PARAGRAPHS)).encode("utf-8")
+
+def make_html() -> bytes:
+    body = "".join(f"<p>{i}. {CLAUSE}.</p>" for i in range(PARAGRAPHS))
+    return f"<!DOCTYPE html><html><head><title>MSA</title></head><body>{body}</body></html>".encode("utf-8")
+
+def make_docx() -> bytes:
+    body = "".join(f"<w:p><w:r><w:t>{i}. {CLAUSE}.</w:t></w:r></w:p>" for i in range(PARAGRAPHS))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr(
+            "word/document.xml",
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>",
+        )
+    return buffer.getvalue()
+
+def make_pdf(lines_per_page: int = 40) -> bytes:
+    """
+    Minimal multi-page PDF with Helvetica text, written by hand (no PDF library needed).
+    """
+    pages = [list(range(i, min(i + lines_per_page, PARAGRAPHS))) for i in range(0, PARAGRAPHS, lines_per_page)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        ops = "BT /F1 8 Tf 20 800 Td 10 TL " + " ".join(f"({i}. {CLAUSE}.) '" for i in page) + " ET"
+        objects.append(f"<< /Length {len(ops)} >>\nstream\n{ops}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 600 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+async def bench(name: str, data: bytes):
+    parser = detect_parser(data[:SNIFF_BYTES])
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        document = await parser.parse_document(io.BytesIO(data), name)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{parser.format:<6} {len(data) / 1024:>9.0f} {len(document.segments):>9} {best * 1000:>9.1f} "
+          f"{len(data) / best / 1024 / 1024:>9.1f} {len(document.text) / best / 1_000_000:>11.2f}")
+
+async def main():
+    print(f"{'format':<6} {'KB':>9} {'segments':>9} {'ms':>9} {'MB/s':>9} {'Mchars/s':>11}")
+    for name, data in (("contract.pdf", make_pdf()), ("contract.docx", make_docx()),
+                       ("contract.html", make_html()), ("contract.txt", make_text())):
+        await bench(name, data)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.llm.base import AbstractLLMClient, LLMMessage
+from app.models import Policy
+from app.policy.engine import PolicyEvaluator, estimate_tokens
+
+# Latency model for the stub provider: fixed round trip + prompt processing time
+BASE_LATENCY_S = 0.25
+PER_1K_PROMPT_TOKENS_S = 0.05
+OUTPUT_TOKENS_PER_RESULT = 80
+
+class LatencyStubLLM(AbstractLLMClient):
+    """
+    Stub provider that sleeps in proportion to prompt size and counts tokens.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    async def _call(self, messages: List[LLMMessage], system_prompt: Optional[str]):
+        tokens = estimate_tokens(system_prompt or "") + sum(estimate_tokens(m.content) for m in messages)
+        self.calls += 1
+        self.prompt_tokens += tokens
+        await asyncio.sleep(BASE_LATENCY_S + PER_1K_PROMPT_TOKENS_S * tokens / 1000)
+
+    async def generate_response(self, messages: List[LLMMessage], system_prompt: Optional[str] = None,
+                                temperature: float = 0.7) -> str:
+        await self._call(messages, system_prompt)
+        self.output_tokens += OUTPUT_TOKENS_PER_RESULT
+        return "Stubbed."
+
+    async def generate_json(self, messages: List[LLMMessage], schema: Dict[str, Any],
+                            system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        await self._call(messages, system_prompt)
+
+        result = {"status": "COMPLIANT", "score": 80, "reasoning": "Stubbed.", "flagged_issues": []}
+        if "results" in schema.get("properties", {}):
+            pairs = messages[-1].content.count("pair_id ")
+            self.output_tokens += OUTPUT_TOKENS_PER_RESULT * pairs
+            return {"results": [{"pair_id": i, **result} for i in range(pairs)]}
+        self.output_tokens += OUTPUT_TOKENS_PER_RESULT
+        return result
+
+    async def generate_embedding(self, text: str) -> List[float]:
+        return [0.0] * 8
+
+def _policies(count: int) -> List[Policy]:
+    topics = ["payment", "liability", "data protection", "audit", "termination", "insurance"]
+    return [
+        Policy(name=f"{topics[i % len(topics)].title()} Policy", version="1",
+               text_content=f"The {topics[i % len(topics)]} requirements are as follows. " * 40)
+        for i in range(count)
+    ]
+
+def _clauses(count: int) -> List[str]:
+    return [f"Clause {i}: The supplier shall comply with reasonable requests from the customer. " * 6
+            for i in range(count)]
+
+async def _run(mode: str, pairs) -> Dict[str, float]:
+    stub = LatencyStubLLM()
+    evaluator = PolicyEvaluator()
+    evaluator.llm = stub
+
+    start = time.perf_counter()
+    if mode == "single":
+        for contract_text, policy in pairs:
+            await evaluator.evaluate(contract_text, policy)
+    else:
+        await evaluator.evaluate_batch(pairs)
+    elapsed = time.perf_counter() - start
+
+    n = len(pairs)
+    return {
+        "calls": stub.calls,
+        "prompt_tokens_per_pair": stub.prompt_tokens / n,
+        "output_tokens_per_pair": stub.output_tokens / n,
+        "latency_ms_per_pair": elapsed * 1000 / n,
+        "wall_s": elapsed,
+    }
+
+async def main():
+    print("--- Policy Evaluation Benchmark (single-pair vs batched) ---")
+    print(f"Stub latency: {BASE_LATENCY_S}s + {PER_1K_PROMPT_TOKENS_S}s per 1k prompt tokens\n")
+    scenarios = [
+        ("1 clause x 3 policies", _clauses(1), _policies(3)),
+        ("8 clauses x 1 policy", _clauses(8), _policies(1)),
+        ("4 clauses x 3 policies", _clauses(4), _policies(3)),
+    ]
+    header = f"{'scenario':<24}{'mode':<8}{'calls':>6}{'prompt tok/pair':>17}{'out tok/pair':>14}{'ms/pair':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, clauses, policies in scenarios:
+        pairs = [(c, p) for c in clauses for p in policies]
+        for mode in ("single", "batch"):
+            r = await _run(mode, pairs)
+            print(f"{name:<24}{mode:<8}{r['calls']:>6}{r['prompt_tokens_per_pair']:>17.0f}"
+                  f"{r['output_tokens_per_pair']:>14.0f}{r['latency_ms_per_pair']:>10.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.supplier.sanctions_index import build_index, normalize_name
+
+SYLLABLES = ["al", "an", "ar", "ba", "de", "el", "fa", "ga", "ha", "ib", "ka", "ko", "la", "ma", "mo", "na",
+             "ni", "ol", "ra", "ro", "sa", "sh", "ta", "to", "va", "vo", "ya", "za", "zh", "ev", "ov", "in"]
+SECTORS = ["Trading", "Shipping", "Industries", "Petroleum", "Logistics", "Metals", "Holdings", "Energy",
+           "Chemicals", "Aviation", "Marine", "Import Export", "Engineering", "Finance", "Mining"]
+FORMS = ["LLC", "Ltd", "JSC", "OOO", "GmbH", "SA", "Co", ""]
+COUNTRIES = ["RU", "IR", "KP", "SY", "BY", "CU", "VE", "AE", "CN", "TR"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark local sanctions screening on a synthetic list: build time, index size, "
+            "query latency, recall for listed (exact and misspelled) names and false hits for unlisted ones."
+        )
+    )
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000, help="Queries per kind")
+    parser.add_argument("--threshold", type=float, default=None, help="Hit threshold (default: SANCTIONS_LIST_MATCH_THRESHOLD)")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+def company(rng: random.Random) -> str:
+    return " ".join([word(rng) for _ in range(rng.randint(1, 2))] + [rng.choice(SECTORS), rng.choice(FORMS)]).strip()
+
+def misspell(rng: random.Random, name: str) -> str:
+    # One edit in a distinctive word: substitution, deletion, transposition or a vowel swap
+    words = name.split()
+    i = rng.randrange(max(1, len(words) - 2))
+    w = words[i]
+    j = rng.randrange(1, len(w)) if len(w) > 1 else 0
+    edit = rng.choice(("sub", "del", "swap", "vowel"))
+    if edit == "sub":
+        w = w[:j] + rng.choice("abcdefghijklmnoprstuvz") + w[j + 1:]
+    elif edit == "del" and len(w) > 3:
+        w = w[:j] + w[j + 1:]
+    elif edit == "swap" and j < len(w) - 1:
+        w = w[:j] + w[j + 1] + w[j] + w[j + 2:]
+    else:
+        w = w.replace("a", "e", 1) if "a" in w[1:] else w + "h"
+    words[i] = w
+    return " ".join(words)
+
+def write_list(path: Path, entries: int, rng: random.Random) -> List[Tuple[str, str]]:
+    rows = []
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "aliases", "countries", "list", "program", "type"])
+        for i in range(entries):
+            name = company(rng)
+            aliases = "|".join(company(rng) for _ in range(rng.choice((0, 0, 1, 2))))
+            writer.writerow([f"syn:{i}", name, aliases, rng.choice(COUNTRIES), "Synthetic", "BENCH", "entity"])
+            rows.append((f"syn:{i}", name))
+    return rows
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+def main():
+    args = parse_args()
+    from app.core.config import settings
+    threshold = args.threshold if args.threshold is not None else settings.SANCTIONS_LIST_MATCH_THRESHOLD
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "synthetic.csv"
+        listed = write_list(path, args.entries, rng)
+
+        started = time.perf_counter()
+        index = build_index([path])
+        build_seconds = time.perf_counter() - started
+
+    stats = index.stats()
+    print(f"{len(index)} entries, {index.name_count} names, {stats['keys']} keys")
+    print(f"build {build_seconds:.1f}s, index arrays {stats['index_bytes'] / 2 ** 20:.1f} MiB\n")
+
+    sample = rng.sample(listed, min(args.queries, len(listed)))
+    listed_names = {" ".join(normalize_name(name)) for _, name in listed}
+    unlisted = []
+    while len(unlisted) < len(sample):
+        name = company(rng)
+        if " ".join(normalize_name(name)) not in listed_names:
+            unlisted.append((None, name))
+    kinds = {
+        "exact": [(name, name) for _, name in sample],
+        "misspelled": [(name, misspell(rng, name)) for _, name in sample],
+        # Same vocabulary as the list: shares sector words and syllables with many entries
+        "unlisted": unlisted,
+    }
+    print(f"threshold {threshold}")
+    for kind, queries in kinds.items():
+        latencies, found, ranked_first, hits = [], 0, 0, 0
+        for listed_name, query in queries:
+            start = time.perf_counter()
+            matches = index.screen(query, limit=5)
+            latencies.append(time.perf_counter() - start)
+            # Synthetic names repeat; any entry listed under the same name is the right answer
+            correct = bool(matches) and listed_name is not None and (
+                matches[0]["matched_name"] == " ".join(normalize_name(listed_name))
+            )
+            ranked_first += correct
+            if matches and matches[0]["score"] >= threshold:
+                hits += 1
+                found += correct
+        if kind == "unlisted":
+            rate = f"false hits {hits / len(queries):6.1%}"
+        else:
+            rate = f"ranked first {ranked_first / len(queries):6.1%}, hit at threshold {found / len(queries):6.1%}"
+        print(f"{kind:<11} p50 {percentile(latencies, 50) * 1e3:6.3f} ms  p95 {percentile(latencies, 95) * 1e3:6.3f} ms"
+              f"  p99 {percentile(latencies, 99) * 1e3:6.3f} ms  {rate}")
+
+if __name__ == "__main__":
+    main()
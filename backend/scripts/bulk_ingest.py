@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.ingestion import BulkIngestor
+from app.database import async_session, engine, init_db
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Bulk-load contract documents (PDF, DOCX, HTML, text) and policy YAMLs from a directory tree."
+    )
+    parser.add_argument("root", help="Directory to walk for *.pdf, *.docx, *.html, *.txt, *.yaml and *.yml files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Parser processes (default: CPU count)")
+    parser.add_argument("--embed-batch-size", type=int, default=64,
+                        help="Texts per embedding request (default: 64)")
+    parser.add_argument("--embed-concurrency", type=int, default=4,
+                        help="Concurrent embedding requests (default: 4)")
+    parser.add_argument("--db-batch-size", type=int, default=50,
+                        help="Documents per bulk-insert transaction (default: 50)")
+    parser.add_argument("--checkpoint", default=".ingest_checkpoint.jsonl",
+                        help="Progress file used to resume after a crash")
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    # Per-statement SQL echo dominates runtime for bulk loads
+    engine.echo = False
+
+    await init_db()
+    ingestor = BulkIngestor(
+        async_session,
+        workers=args.workers,
+        embed_batch_size=args.embed_batch_size,
+        embed_concurrency=args.embed_concurrency,
+        db_batch_size=args.db_batch_size,
+        checkpoint_path=args.checkpoint,
+    )
+    report = await ingestor.run(args.root)
+    print(report.format())
+
+if __name__ == "__main__":
+    asyncio.run(main())
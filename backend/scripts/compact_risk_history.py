@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.database import async_session, engine, init_db
+from app.supplier.history import backfill_current_profiles, compact_risk_history
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Downsample old supplier risk snapshots (daily, then weekly) and backfill current-profile pointers."
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without deleting")
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    engine.echo = False
+
+    await init_db()
+    async with async_session() as session:
+        # Suppliers refreshed before Supplier.current_risk_profile_id existed
+        backfilled = await backfill_current_profiles(session)
+        result = await compact_risk_history(session, dry_run=args.dry_run)
+    print(f"Backfilled {backfilled} current profiles; "
+          f"{'would remove' if args.dry_run else 'removed'} {result['deleted']} of {result['scanned']} old snapshots")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import exists, select
+
+from app.contract.clauses import ClauseExtractor
+from app.database import async_session, engine, init_db
+from app.models import Contract, ContractClause
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Segment, classify and normalize the clauses of stored contracts."
+    )
+    parser.add_argument("--all", action="store_true",
+                        help="Re-extract every contract (default: only contracts without clauses)")
+    parser.add_argument("--no-llm", action="store_true",
+                        help="Heuristics only; undecided clauses are stored as 'other'")
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    engine.echo = False
+
+    await init_db()
+    extractor = ClauseExtractor(use_llm=not args.no_llm)
+    query = select(Contract.id)
+    if not args.all:
+        query = query.where(~exists().where(ContractClause.contract_id == Contract.id))
+    async with async_session() as session:
+        contract_ids = list((await session.execute(query)).scalars().all())
+
+    total = 0
+    for contract_id in contract_ids:
+        async with async_session() as session:
+            contract = await session.get(Contract, contract_id)
+            total += len(await extractor.extract(session, contract))
+    print(f"Extracted {total} clauses from {len(contract_ids)} contracts")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Local multi-process load test: start scripts/serve.py with increasing worker "
+            "counts against the mock LLM with injected latency, run negotiate + resume "
+            "round trips and report throughput scaling."
+        )
+    )
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--threads-per-worker", type=int, default=40,
+                        help="Negotiation threads per worker (total work grows with the worker count)")
+    parser.add_argument("--concurrency-per-worker", type=int, default=8,
+                        help="Concurrent client sessions per worker")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Injected mock LLM latency (seconds)")
+    parser.add_argument("--database-url", default=None,
+                        help="Shared database (Postgres recommended; default: a fresh SQLite file per run)")
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args()
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+def start_server(workers: int, port: int, llm_latency: float, database_url: Optional[str]) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "mock",
+        "MOCK_LLM_LATENCY_SECONDS": str(llm_latency),
+        "GRAPH_CHECKPOINTER": "database",
+        "SQLALCHEMY_DATABASE_URI": database_url or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/load_test.db",
+    })
+    return subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, "scripts", "serve.py"),
+         "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError("Server did not become ready")
+
+async def negotiation_round_trip(client: httpx.AsyncClient) -> Dict[str, float]:
+    """
+    One thread: negotiate (pauses for approval), then resume. The two requests are
+    independent, so the resume is usually served by a different worker.
+    """
+    thread_id = str(uuid.uuid4())
+    start = time.perf_counter()
+    response = await client.post("/api/v1/agent/negotiate", json={
+        "contract_id": str(uuid.uuid4()),
+        "supplier_id": str(uuid.uuid4()),
+        "clause_text": "Payment is due within 90 days of invoice receipt.",
+        "thread_id": thread_id,
+    })
+    response.raise_for_status()
+    negotiated = time.perf_counter()
+    if response.json().get("status") == "paused":
+        response = await client.post("/api/v1/agent/resume", json={"thread_id": thread_id, "action": "APPROVED"})
+        response.raise_for_status()
+        if response.json().get("status") != "completed":
+            raise RuntimeError(f"Resume of {thread_id} did not complete: {response.json()}")
+    return {"negotiate": negotiated - start, "total": time.perf_counter() - start}
+
+async def run_load(base_url: str, threads: int, concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    results: List[Dict[str, float]] = []
+    errors = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        await wait_ready(client)
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                try:
+                    results.append(await negotiation_round_trip(client))
+                except Exception as e:
+                    errors += 1
+                    print(f"  error: {e}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(threads)))
+        elapsed = time.perf_counter() - start
+
+    totals = [r["total"] for r in results] or [0.0]
+    return {
+        "threads": len(results),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput": len(results) / elapsed if elapsed else 0.0,
+        "p50_s": statistics.median(totals),
+        "p99_s": percentile(totals, 99),
+    }
+
+async def main():
+    args = parse_args()
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"Mock LLM latency {args.llm_latency}s, {args.threads_per_worker} threads and "
+          f"{args.concurrency_per_worker} concurrent sessions per worker\n")
+    if max(worker_counts) > (os.cpu_count() or 1):
+        print(f"Warning: {os.cpu_count()} CPU(s) available; workers beyond that compete for the same cores\n")
+    if not args.database_url:
+        print("Note: SQLite serializes writes across processes; pass --database-url (Postgres) to measure scaling\n")
+    baseline = None
+    for workers in worker_counts:
+        server = start_server(workers, args.port, args.llm_latency, args.database_url)
+        try:
+            stats = await run_load(base_url, args.threads_per_worker * workers, args.concurrency_per_worker * workers)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        baseline = baseline or stats["throughput"] / workers
+        efficiency = stats["throughput"] / (baseline * workers) if baseline else 0.0
+        print(
+            f"workers={workers:<3} threads={stats['threads']:<5} errors={stats['errors']:<3} "
+            f"throughput={stats['throughput']:7.2f} threads/s  p50={stats['p50_s']:.2f}s  "
+            f"p99={stats['p99_s']:.2f}s  scaling efficiency={efficiency:.0%}"
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.embeddings import migrate_embeddings
+from app.database import async_session, engine, init_db
+from app.models import ContractChunk, PolicyChunk
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Backfill binary embedding columns for chunks stored before they existed."
+    )
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="Rows converted per transaction (default: 500)")
+    parser.add_argument("--drop-legacy", action="store_true",
+                        help="Clear the legacy JSON embedding column after conversion (ignored on Postgres)")
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    engine.echo = False
+
+    # init_db adds the embedding_blob / embedding_q columns if they are missing
+    await init_db()
+    async with async_session() as session:
+        for model in (ContractChunk, PolicyChunk):
+            count = await migrate_embeddings(session, model, args.batch_size, args.drop_legacy)
+            print(f"{model.__tablename__}: {count} rows migrated")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.database import async_session, engine, init_db
+from app.supplier.performance import rebuild_rollups
+
+async def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    engine.echo = False
+
+    # Creates the rollup table on existing databases; reports stored before it existed need a backfill
+    await init_db()
+    async with async_session() as session:
+        folded = await rebuild_rollups(session)
+    print(f"Rebuilt performance rollups from {folded} reports")
+
+if __name__ == "__main__":
+    asyncio.run(main())
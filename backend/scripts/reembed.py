@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.embeddings import resolve_space
+from app.core.reembed import prune_spaces, reembed, reembed_progress
+from app.database import async_session, engine, init_db
+from app.models import ContractChunk, PolicyChunk
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Migrate chunk embeddings to another model without downtime.",
+        epilog=(
+            "Rollout: (1) run with --model while the service keeps serving the old space; "
+            "(2) set EMBEDDING_MODEL/EMBEDDING_DIMENSIONS and restart; "
+            "(3) run again to catch up chunks ingested in between; "
+            "(4) run with --prune to drop the old space."
+        ),
+    )
+    parser.add_argument("--model", required=True, help="Target embedding model, e.g. text-embedding-3-small")
+    parser.add_argument("--dimensions", type=int, default=None,
+                        help="Target width (default: the model's native width)")
+    parser.add_argument("--batch-size", type=int, default=64,
+                        help="Chunks per embedding call and transaction (default: 64)")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete chunks embedded in any other space instead of re-embedding")
+    return parser.parse_args()
+
+async def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    engine.echo = False
+
+    target = resolve_space(args.model, args.dimensions)
+    await init_db()
+    for model in (ContractChunk, PolicyChunk):
+        if args.prune:
+            async with async_session() as session:
+                pending, _ = await reembed_progress(session, model, target)
+                if pending:
+                    print(f"{model.__tablename__}: {pending} chunks not yet in {target.key}; not pruning")
+                    continue
+                await prune_spaces(session, model, target)
+        else:
+            count = await reembed(async_session, model, target, batch_size=args.batch_size)
+            print(f"{model.__tablename__}: {count} chunks re-embedded into {target.key}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+import argparse
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.supplier.adapters.standins import build_standin_app
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Serve local stand-ins for the supplier data vendors (D&B, NewsAPI, sanctions screening)."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    base_url = f"http://{args.host}:{args.port}"
+    print("Point the API at the stand-ins with:")
+    for name, value in (
+        ("SUPPLIER_DATA_PROVIDER", "live"),
+        ("DNB_API_URL", base_url), ("DNB_API_KEY", "standin"), ("DNB_API_SECRET", "standin"),
+        ("NEWS_API_URL", base_url), ("NEWS_API_KEY", "standin"),
+        ("SANCTIONS_API_URL", base_url),
+    ):
+        print(f"  export {name}={value}")
+
+    import uvicorn
+    uvicorn.run(build_standin_app(latency=args.latency), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
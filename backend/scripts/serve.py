@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add parent dir to path so we can import app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Production entry point: serve the API with several worker processes."
+    )
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="Worker processes (default: WEB_CONCURRENCY)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args()
+
+async def prepare_database():
+    from app.database import engine, init_db
+    # Schema changes run once here rather than racing in every worker's startup
+    await init_db()
+    await engine.dispose()
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    os.environ.setdefault("SQL_ECHO", "false")
+    # Workers share nothing in memory: graph checkpoints (including threads paused for
+    # approval) must live in the database so any worker can resume any thread.
+    # Set before importing app so the workers inherit it.
+    if args.workers > 1:
+        os.environ.setdefault("GRAPH_CHECKPOINTER", "database")
+    asyncio.run(prepare_database())
+
+    from app.core.config import settings
+    # Workers (and an in-process single worker) skip init_db in their startup
+    os.environ["SKIP_INIT_DB"] = "true"
+    settings.SKIP_INIT_DB = True
+    if args.workers > 1 and settings.GRAPH_CHECKPOINTER != "database":
+        sys.exit("GRAPH_CHECKPOINTER must be 'database' with more than one worker")
+    if args.workers > 1 and settings.SQLALCHEMY_DATABASE_URI is None:
+        logging.warning("Several workers on the default SQLite database: writes will contend; use Postgres")
+
+    import uvicorn
+    uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+
+if __name__ == "__main__":
+    main()
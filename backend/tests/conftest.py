@@ -2,11 +2,11 @@ import pytest
 import asyncio
 from httpx import AsyncClient, ASGITransport
 from typing import Generator
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
 from app.core.config import settings
-
-# Note: We will import the 'app' object after the app structure is confirmed active
-# For now, we mock the app import or use a placeholder if main.py is providing it
-from main import app
+from app.main import app
 
 @pytest.fixture(scope="session")
 def event_loop() -> Generator:
@@ -23,3 +23,23 @@ async def async_client() -> Generator:
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
+
+@pytest.fixture
+async def engine(tmp_path):
+    """
+    A throwaway SQLite database per test, with every table created.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+@pytest.fixture
+async def session(session_factory):
+    async with session_factory() as session:
+        yield session
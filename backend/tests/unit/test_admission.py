@@ -0,0 +1,122 @@
+import asyncio
+from uuid import uuid4
+import pytest
+from fastapi.testclient import TestClient
+from app.agent.admission import (
+    PRIORITY_NEGOTIATE, PRIORITY_RESUME, AdmissionController, AdmissionRejected
+)
+
+async def _hold(controller, keys, release: asyncio.Event, order=None, name=None, priority=PRIORITY_NEGOTIATE):
+    async with controller.admit(keys, priority):
+        if order is not None:
+            order.append(name)
+        await release.wait()
+
+@pytest.mark.asyncio
+async def test_queue_full_is_rejected_with_retry_after():
+    controller = AdmissionController(max_concurrent=1, max_per_key={}, max_queue=1, max_wait=5)
+    release = asyncio.Event()
+    running = asyncio.create_task(_hold(controller, [], release))
+    queued = asyncio.create_task(_hold(controller, [], release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as e:
+        async with controller.admit([]):
+            pass
+    assert e.value.retry_after >= 1
+    assert controller.stats()["queued"] == 1 and controller.rejected == 1
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert controller.admitted == 2 and controller.stats()["active"] == 0
+
+@pytest.mark.asyncio
+async def test_wait_timeout_frees_the_queue_slot():
+    controller = AdmissionController(max_concurrent=1, max_per_key={}, max_queue=4, max_wait=0.05)
+    release = asyncio.Event()
+    running = asyncio.create_task(_hold(controller, [], release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected):
+        async with controller.admit([]):
+            pass
+    assert controller.stats()["queued"] == 0
+
+    release.set()
+    await running
+
+@pytest.mark.asyncio
+async def test_resume_is_admitted_before_queued_negotiations():
+    controller = AdmissionController(max_concurrent=1, max_per_key={}, max_queue=4, max_wait=5)
+    release, order = asyncio.Event(), []
+    first = asyncio.create_task(_hold(controller, [], release, order, "first"))
+    await asyncio.sleep(0)
+    new = asyncio.create_task(_hold(controller, [], release, order, "negotiate"))
+    await asyncio.sleep(0)
+    resume = asyncio.create_task(_hold(controller, [], release, order, "resume", PRIORITY_RESUME))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(first, new, resume)
+    assert order == ["first", "resume", "negotiate"]
+
+@pytest.mark.asyncio
+async def test_saturated_supplier_does_not_block_others():
+    controller = AdmissionController(max_concurrent=4, max_per_key={"supplier": 1}, max_queue=4, max_wait=5)
+    release_a, order = asyncio.Event(), []
+    busy = asyncio.create_task(_hold(controller, [("supplier", "a")], release_a, order, "a1"))
+    await asyncio.sleep(0)
+    blocked = asyncio.create_task(_hold(controller, [("supplier", "a")], asyncio.Event(), order, "a2"))
+    await asyncio.sleep(0)
+
+    # Supplier "b" runs straight away although "a2" is queued ahead of it
+    async with controller.admit([("supplier", "b")]):
+        order.append("b")
+    assert order == ["a1", "b"]
+
+    release_a.set()
+    await busy
+    await asyncio.sleep(0)
+    assert order == ["a1", "b", "a2"]
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+    assert controller.stats()["active"] == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_skipped_by_a_release_in_the_same_iteration():
+    controller = AdmissionController(max_concurrent=1, max_per_key={}, max_queue=4, max_wait=5)
+    await controller._acquire([], PRIORITY_NEGOTIATE)
+    cancelled = asyncio.create_task(_hold(controller, [], asyncio.Event()))
+    behind = asyncio.create_task(_hold(controller, [], asyncio.Event()))
+    await asyncio.sleep(0)
+    assert controller.stats()["queued"] == 2
+
+    # Cancellation (or a wait_for timeout) cancels the waiter's future right away, but
+    # the task only leaves the queue when it resumes; the slot frees up before that
+    cancelled.cancel()
+    controller._queue[0].future.cancel()
+    controller._release([])
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    await asyncio.sleep(0)
+    assert controller.stats()["active"] == 1 and controller.stats()["queued"] == 0  # Granted to "behind"
+
+    behind.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await behind
+    assert controller.stats()["active"] == 0
+
+def test_negotiate_returns_429_when_full(mocker):
+    from app.main import app
+    from app.agent import api
+
+    async def rejected(*args, **kwargs):
+        raise AdmissionRejected("Negotiation queue full (0 waiting)", 7)
+    mocker.patch.object(api.admission_controller, "_acquire", side_effect=rejected)
+
+    response = TestClient(app).post("/api/v1/agent/negotiate", json={
+        "contract_id": str(uuid4()), "supplier_id": "s1", "clause_text": "Net 90.", "thread_id": "t-429",
+    })
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
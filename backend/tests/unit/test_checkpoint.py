@@ -0,0 +1,72 @@
+import operator
+from typing import Annotated, List, TypedDict
+import pytest
+from langgraph.graph import END, StateGraph
+from langgraph.types import Command, interrupt
+from app.agent.checkpoint import DatabaseCheckpointSaver, build_checkpointer
+from app.llm import LLMMessage
+
+class ReviewState(TypedDict):
+    messages: Annotated[List[LLMMessage], operator.add]
+    status: str
+
+def _propose(state: ReviewState):
+    return {"messages": [LLMMessage(role="agent", content="Counter: Net 60.")]}
+
+def _review(state: ReviewState):
+    decision = interrupt({"reasoning": "Needs approval"})
+    return {"status": decision["status"]}
+
+def _build(checkpointer):
+    workflow = StateGraph(ReviewState)
+    workflow.add_node("propose", _propose)
+    workflow.add_node("review", _review)
+    workflow.set_entry_point("propose")
+    workflow.add_edge("propose", "review")
+    workflow.add_edge("review", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("durability", ["async", "exit"])
+async def test_paused_thread_resumes_on_another_worker(session_factory, durability):
+    config = {"configurable": {"thread_id": "thread-1"}}
+    first = _build(DatabaseCheckpointSaver(session_factory))
+    await first.ainvoke({"messages": [LLMMessage(role="user", content="Net 90?")], "status": "PENDING"},
+                        config, durability=durability)
+    assert (await first.aget_state(config)).next == ("review",)
+
+    # A separate saver and graph stand in for another worker process
+    second = _build(DatabaseCheckpointSaver(session_factory))
+    snapshot = await second.aget_state(config)
+    assert snapshot.next == ("review",)
+    assert snapshot.tasks[0].interrupts[0].value == {"reasoning": "Needs approval"}
+
+    result = await second.ainvoke(Command(resume={"status": "APPROVED"}), config, durability=durability)
+    assert result["status"] == "APPROVED"
+    assert [m.content for m in result["messages"]] == ["Net 90?", "Counter: Net 60."]
+    assert (await first.aget_state(config)).next == ()
+
+@pytest.mark.asyncio
+async def test_history_and_delete(session_factory):
+    saver = DatabaseCheckpointSaver(session_factory)
+    graph = _build(saver)
+    config = {"configurable": {"thread_id": "thread-2"}}
+    await graph.ainvoke({"messages": [], "status": "PENDING"}, config)
+
+    history = [c async for c in saver.alist(config)]
+    assert len(history) >= 2
+    assert history[0].checkpoint["id"] > history[-1].checkpoint["id"]  # Newest first
+    assert [c.checkpoint["id"] async for c in saver.alist(config, limit=1)] == [history[0].checkpoint["id"]]
+    assert history[0].parent_config["configurable"]["checkpoint_id"] == history[1].checkpoint["id"]
+
+    await saver.adelete_thread("thread-2")
+    assert await saver.aget_tuple(config) is None
+
+def test_sync_access_is_rejected(session_factory):
+    graph = _build(DatabaseCheckpointSaver(session_factory))
+    with pytest.raises(NotImplementedError):
+        graph.get_state({"configurable": {"thread_id": "thread-3"}})
+
+def test_build_checkpointer_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        build_checkpointer("redis")
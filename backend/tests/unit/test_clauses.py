@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+import pytest
+from sqlalchemy import select
+from app.contract.clauses import (
+    ClauseExtractor, classify_heuristic, normalize_terms, rule_terms, segment_clauses
+)
+from app.models import Contract, ContractClause, Supplier
+from app.policy.rules import UNLIMITED
+
+CONTRACT = """MASTER SERVICES AGREEMENT between Acme and Globex.
+
+1. Payment Terms. Invoices are payable within
+45 days of receipt. Late payments accrue 1.5% interest per month.
+2. Limitation of Liability. Supplier's aggregate liability is capped at $2,000,000.
+2.1 Liability Exclusions. Nothing limits liability for fraud.
+3. Miscellaneous. The parties shall cooperate in good faith.
+"""
+
+def test_segment_clauses_numbering_and_offsets():
+    segments = segment_clauses(CONTRACT)
+
+    assert [s.number for s in segments] == [None, "1", "2", "2.1", "3"]
+    assert segments[1].heading == "Payment Terms"
+    # The wrapped "45 days" line is not mistaken for a clause heading
+    assert "45 days of receipt" in segments[1].text
+    for segment in segments:
+        assert segment.text == CONTRACT[segment.start:segment.end].strip()
+
+def test_classify_heuristic():
+    assert classify_heuristic("Payment Terms", "Invoices are payable within 45 days.") == "payment"
+    assert classify_heuristic("Limitation of Liability", "Liability is capped.") == "liability"
+    # No evidence: left to the LLM
+    assert classify_heuristic("Miscellaneous", "The parties shall cooperate.") is None
+
+def test_normalize_terms_is_json_safe():
+    terms = normalize_terms("Payment due Net 30. Liability shall be unlimited. Discount of 2%.")
+    assert terms["payment_days"] == 30
+    assert terms["liability_cap"] == "unlimited"
+    assert terms["percentages"] == [2.0]
+    assert rule_terms(terms)["liability_cap"] == UNLIMITED
+
+    assert normalize_terms("capped at USD 2m")["amounts"] == [2_000_000]
+
+@pytest.mark.asyncio
+async def test_extract_uses_llm_only_for_undecided(session, mocker):
+    llm = mocker.Mock()
+    llm.generate_json = mocker.AsyncMock(return_value={"clauses": [
+        {"clause_id": 0, "category": "other"},
+        {"clause_id": 1, "category": "governing_law"},
+    ]})
+    contract = Contract(title="MSA", content_text=CONTRACT, created_at=datetime.now(timezone.utc))
+    session.add(contract)
+    await session.commit()
+
+    extractor = ClauseExtractor(llm=llm)
+    await extractor.extract(session, contract)
+    await extractor.extract(session, contract)  # Re-extraction replaces, not appends
+
+    result = await session.execute(
+        select(ContractClause).where(ContractClause.contract_id == contract.id).order_by(ContractClause.clause_index)
+    )
+    clauses = result.scalars().all()
+
+    assert [(c.category, c.classified_by) for c in clauses] == [
+        ("other", "llm"), ("payment", "rules"), ("liability", "rules"), ("liability", "rules"),
+        ("governing_law", "llm"),
+    ]
+    assert clauses[1].terms["durations_days"] == [45.0]
+    assert clauses[2].terms["liability_cap"] == 2_000_000
+    # One batched call per extraction, carrying only the undecided clauses
+    assert llm.generate_json.call_count == 2
+    prompt = llm.generate_json.call_args.args[0][0].content
+    assert "Miscellaneous" in prompt and "Payment Terms" not in prompt
+
+@pytest.mark.asyncio
+async def test_upload_extracts_clauses_in_background(session, session_factory, mocker):
+    from app.contract.api import _extract_clauses
+
+    llm = mocker.Mock()
+    llm.generate_json = mocker.AsyncMock(return_value={"clauses": []})
+    mocker.patch("app.contract.api.async_session", session_factory)
+    mocker.patch("app.contract.api.ClauseExtractor", return_value=ClauseExtractor(llm=llm))
+    contract = Contract(title="MSA", content_text=CONTRACT, created_at=datetime.now(timezone.utc))
+    session.add(contract)
+    await session.commit()
+
+    await _extract_clauses(contract.id)
+    await _extract_clauses(uuid4())  # Deleted meanwhile: nothing to do
+
+    result = await session.execute(select(ContractClause).where(ContractClause.contract_id == contract.id))
+    assert len(result.scalars().all()) == 5
+
+@pytest.mark.asyncio
+async def test_negotiation_rejects_clause_of_another_contract(session, session_factory, mocker):
+    from fastapi import HTTPException
+    from app.agent.api import NegotiationRequest, start_negotiation
+
+    mocker.patch("app.agent.api.async_session", session_factory)
+    run_graph = mocker.patch("app.agent.api._run_graph")
+    now = datetime.now(timezone.utc)
+    supplier = Supplier(name="Acme", created_at=now)
+    session.add(supplier)
+    await session.commit()
+    ours = Contract(title="MSA", supplier_id=supplier.id, content_text=CONTRACT, created_at=now)
+    theirs = Contract(title="Other MSA", content_text=CONTRACT, created_at=now)
+    session.add_all([ours, theirs])
+    await session.commit()
+    clause = ContractClause(contract_id=theirs.id, clause_index=0, content="Net 7", start_offset=0, end_offset=5,
+                            created_at=now)
+    session.add(clause)
+    await session.commit()
+
+    with pytest.raises(HTTPException) as e:
+        await start_negotiation(NegotiationRequest(
+            contract_id=str(ours.id), supplier_id=str(supplier.id), clause_id=clause.id
+        ))
+    assert e.value.status_code == 422
+
+    clause.contract_id = ours.id
+    session.add(clause)
+    await session.commit()
+    with pytest.raises(HTTPException) as e:
+        await start_negotiation(NegotiationRequest(contract_id=str(ours.id), supplier_id=str(uuid4()), clause_id=clause.id))
+    assert e.value.status_code == 422
+    assert not run_graph.called
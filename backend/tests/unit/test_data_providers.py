@@ -0,0 +1,116 @@
+import asyncio
+import httpx
+import pytest
+from app.supplier.adapters.dnb import DnBClient
+from app.supplier.adapters.http import DataProviderError, ResponseCache
+from app.supplier.adapters.live import LiveDataProvider
+from app.supplier.adapters.newsapi import NewsApiClient
+from app.supplier.adapters.sanctions import SanctionsClient
+from app.supplier.adapters.standins import build_standin_app
+
+BASE_URL = "http://standin"
+
+def _provider(app, ttl=3600.0, batch_size=50):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    return LiveDataProvider(
+        DnBClient(client, BASE_URL, "key", "secret"),
+        NewsApiClient(client, BASE_URL, "key"),
+        SanctionsClient(client, BASE_URL, batch_size=batch_size),
+        ResponseCache({"financials": ttl, "news": ttl, "sanctions": ttl}),
+    )
+
+@pytest.mark.asyncio
+async def test_adapters_map_vendor_responses():
+    provider = _provider(build_standin_app())
+
+    risky = await provider.get_financial_health("999123456")
+    assert risky["risk_class"] == "High" and risky["financial_stress_score"] <= 30
+    assert risky["credit_rating"] == "CC"
+    stable = await provider.get_financial_health("123456789")
+    assert stable["risk_class"] == "Low" and stable["financial_stress_score"] >= 70
+
+    news = await provider.get_market_news("Risky Corp")
+    assert [n["sentiment"] for n in news] == ["negative", "negative"]
+    assert (await provider.get_market_news("Green Corp"))[0]["sentiment"] == "positive"
+
+    hit = await provider.check_compliance("Acme", "KP")
+    assert hit["sanctions_flag"] is True and "us_ofac_sdn" in hit["list_match"]
+    assert (await provider.check_compliance("Acme", "DE"))["sanctions_flag"] is False
+
+@pytest.mark.asyncio
+async def test_cache_serves_repeats_and_shares_concurrent_misses():
+    app = build_standin_app(latency=0.02)
+    provider = _provider(app)
+
+    await asyncio.gather(*(provider.get_financial_health("123456789") for _ in range(10)))
+    await provider.get_financial_health("123456789")
+    await provider.get_market_news("Acme")
+    await provider.get_market_news("  acme ")
+    assert app.state.requests["duns"] == 1 and app.state.requests["token"] == 1
+    assert app.state.requests["news"] == 1
+    assert provider.stats()["hits"] == 2
+
+    uncached = _provider(app, ttl=0)
+    await uncached.get_market_news("Acme")
+    await uncached.get_market_news("Acme")
+    assert app.state.requests["news"] == 3
+
+@pytest.mark.asyncio
+async def test_bulk_screening_batches_requests_and_skips_cached():
+    app = build_standin_app()
+    provider = _provider(app, batch_size=50)
+    entities = [(f"Supplier {i}", "US") for i in range(120)] + [("Sanctioned Ltd", "US")]
+
+    results = await provider.check_compliance_many(entities)
+    assert app.state.requests["match"] == 3
+    assert [r["sanctions_flag"] for r in results] == [False] * 120 + [True]
+
+    # Cached entities are not screened again; only the new one is sent
+    again = await provider.check_compliance_many(entities[:10] + [("New Co", "IR")])
+    assert app.state.requests["match"] == 4
+    assert again[-1]["sanctions_flag"] is True
+
+@pytest.mark.asyncio
+async def test_retries_gateway_errors_and_refreshes_rejected_token():
+    app = build_standin_app()
+    provider = _provider(app, ttl=0)
+
+    app.state.fail_next = 1
+    assert (await provider.get_financial_health("123456789"))["risk_class"] == "Low"
+    assert app.state.requests["duns"] == 2
+
+    app.state.tokens.clear()  # Revoked server-side
+    await provider.get_financial_health("123456789")
+    assert app.state.requests["token"] == 2
+
+    app.state.fail_next = 10
+    with pytest.raises(DataProviderError) as e:
+        await provider.get_market_news("Acme")
+    assert e.value.vendor == "newsapi" and e.value.status_code == 503
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_overlap_vendor_latency():
+    app = build_standin_app(latency=0.05)
+    provider = _provider(app, ttl=0)
+    await provider.get_financial_health("000000001")  # Token
+
+    duns = [f"{100000000 + i}" for i in range(40)]
+    results = await provider.get_financial_health_many(duns)
+
+    assert len(results) == 40 and app.state.requests["duns"] == 41
+    # All lookups wait on the vendor at the same time instead of one after another
+    assert app.state.peak_in_flight["duns"] == 40
+
+@pytest.mark.asyncio
+async def test_bulk_screening_needs_one_round_trip_per_batch():
+    app = build_standin_app()
+    provider = _provider(app, ttl=0, batch_size=100)
+    entities = [(f"Supplier {i}", "US") for i in range(100)]
+
+    for name, country in entities[:20]:
+        await provider.sanctions.check_compliance(name, country)
+    assert app.state.requests["match"] == 20
+
+    # 100 entities in one vendor round trip instead of 100 (timings: scripts/bench_data_providers.py)
+    results = await provider.check_compliance_many(entities)
+    assert len(results) == 100 and app.state.requests["match"] == 21
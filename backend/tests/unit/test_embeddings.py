@@ -0,0 +1,48 @@
+from uuid import uuid4
+import numpy as np
+import pytest
+from sqlalchemy import select
+from app.core.embeddings import decode, embedding_fields, encode, is_lossy, migrate_embeddings
+from app.core.search import vector_search
+from app.models import ContractChunk
+
+def test_encode_round_trip_and_sizes():
+    vector = np.random.default_rng(0).standard_normal(256).astype(np.float32)
+
+    assert np.array_equal(decode(encode(vector, "float32")), vector)
+    assert not is_lossy(encode(vector, "float32"))
+    assert np.allclose(decode(encode(vector, "float16")), vector, atol=1e-2)
+
+    quantized = encode(vector, "int8")
+    assert is_lossy(quantized)
+    assert len(quantized) == 1 + 4 + 256  # header + scale + one byte per dimension
+    # Symmetric quantization error is at most half a step
+    step = np.max(np.abs(vector)) / 127
+    assert np.max(np.abs(decode(quantized) - vector)) <= step / 2 + 1e-6
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_rows(session):
+    session.add(ContractChunk(contract_id=uuid4(), chunk_index=0, content="legacy", embedding=[1.0, 2.0, 3.0]))
+    await session.commit()
+
+    assert await migrate_embeddings(session, ContractChunk, drop_vector_column=True) == 1
+    assert await migrate_embeddings(session, ContractChunk) == 0
+    session.expire_all()
+    chunk = (await session.execute(select(ContractChunk))).scalar_one()
+    assert chunk.embedding is None
+    assert decode(chunk.embedding_blob).tolist() == [1.0, 2.0, 3.0]
+
+@pytest.mark.asyncio
+async def test_quantized_search_rescores_at_full_precision(session, mocker):
+    mocker.patch("app.core.embeddings.settings.EMBEDDING_QUANTIZATION", "int8")
+    # Two near-identical vectors that int8 cannot tell apart; float32 can
+    target = [1.0, 0.5004, 0.0]
+    decoy = [1.0, 0.5, 0.0]
+    ids = {}
+    for name, vector in (("decoy", decoy), ("target", target)):
+        chunk = ContractChunk(contract_id=uuid4(), chunk_index=0, content=name, **embedding_fields(vector))
+        session.add(chunk)
+        ids[name] = chunk.id
+    await session.commit()
+
+    assert await vector_search(session, ContractChunk, [1.0, 0.5005, 0.0], 1) == [ids["target"]]
@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from app.agent.routing import FastPathStats, fast_path_decision
+
+LOW_RISK = {"financial_stress_score": 90, "news_sentiment_score": 0.5, "sanctions_flag": False}
+
+def _state(level="AUTONOMOUS", status="COMPLIANT", **risk):
+    return {
+        "agency_level": level,
+        "policy_analysis": {"status": status, "score": 95, "policy_version": "2.1"},
+        "risk_profile": {**LOW_RISK, **risk},
+    }
+
+def test_fast_path_rules():
+    accept = fast_path_decision(_state())
+    assert (accept.rule, accept.decision) == ("compliant_low_risk", "ACCEPT")
+    assert "v2.1" in accept.reasoning
+
+    reject = fast_path_decision(_state(status="NON_COMPLIANT", sanctions_flag=True, sanctions_list_match="OFAC SDN"))
+    assert (reject.rule, reject.decision) == ("sanctions_hit", "REJECT")
+    assert "OFAC SDN" in reject.reasoning
+
+    assert fast_path_decision(_state(status="NON_COMPLIANT")) is None
+    assert fast_path_decision(_state(financial_stress_score=10, news_sentiment_score=-0.8)) is None
+    # STRICT and MEDIUM keep the full path (and its human review)
+    assert fast_path_decision(_state(level="STRICT")) is None
+    assert fast_path_decision(_state(level="MEDIUM")) is None
+    assert fast_path_decision(_state(level="MEDIUM", sanctions_flag=True)) is None
+
+def test_fast_path_stats():
+    stats = FastPathStats()
+    stats.record(fast_path_decision(_state()))
+    stats.record(None)
+    assert stats.to_dict() == {
+        "clauses_routed": 2, "fast_path": 1, "by_rule": {"compliant_low_risk": 1}, "fast_path_rate": 0.5
+    }
+
+@pytest.mark.asyncio
+async def test_graph_skips_llm_nodes_on_fast_path(mocker):
+    from app.agent.graph import negotiation_graph
+
+    policy_eval = AsyncMock()
+    policy_eval.evaluate.return_value = MagicMock(dict=lambda: {"status": "COMPLIANT", "score": 100})
+    mocker.patch("app.agent.nodes.policy_evaluator", policy_eval)
+    index = MagicMock(generation=1)
+    mocker.patch("app.agent.nodes.get_policy_index", return_value=index)
+    supplier_svc = AsyncMock()
+    supplier_svc.update_supplier_risk_profile.return_value = MagicMock(dict=lambda: dict(LOW_RISK))
+    mocker.patch("app.agent.nodes.supplier_service", supplier_svc)
+    llm = AsyncMock()
+    mocker.patch("app.agent.nodes.llm", llm)
+
+    async def get_session():
+        yield AsyncMock()
+    mocker.patch("app.agent.nodes.get_session", get_session)
+
+    config = {"configurable": {"thread_id": f"fast-path-{uuid4()}"}}
+    final_state = await negotiation_graph.ainvoke(
+        {"contract_id": str(uuid4()), "supplier_id": str(uuid4()), "current_clause_text": "Payment Net 30",
+         "agency_level": "AUTONOMOUS", "human_approval_status": "PENDING"},
+        config=config,
+    )
+
+    assert final_state["strategy_decision"] == "ACCEPT"
+    assert final_state["proposed_redline"] is None
+    # No strategy or drafting call, and no pause for review
+    assert llm.generate_json.call_count == 0 and llm.generate_response.call_count == 0
+    assert negotiation_graph.get_state(config).next == ()
@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.core import embeddings
+from app.core.search import (
+    SearchFilters, create_lexical_indexes, hybrid_search, lexical_search, reciprocal_rank_fusion, vector_search
+)
+from app.models import Contract, ContractChunk, Supplier
+
+@pytest.fixture
+async def session(engine, session_factory):
+    async with engine.begin() as conn:
+        await create_lexical_indexes(conn, "sqlite")
+    async with session_factory() as s:
+        yield s
+
+async def _seed(session):
+    now = datetime.now(timezone.utc)
+    supplier_a, supplier_b = Supplier(name="Acme", created_at=now), Supplier(name="Globex", created_at=now)
+    contract_a = Contract(title="A", supplier_id=supplier_a.id, created_at=now)
+    contract_b = Contract(title="B", supplier_id=supplier_b.id, created_at=now)
+    texts = [
+        (contract_a, ["Invoices are payable Net 45 from receipt.", "Section 12.3 Governing law is New York."]),
+        (contract_b, ["Invoices are payable Net 30.", "Confidential information must be protected."]),
+    ]
+    session.add_all([supplier_a, supplier_b, contract_a, contract_b])
+    for contract, chunks in texts:
+        for i, content in enumerate(chunks):
+            # Embeddings are deliberately uninformative, as with the mock LLM provider
+            session.add(ContractChunk(contract_id=contract.id, chunk_index=i, content=content,
+                                      embedding=[0.0, 0.0, 0.0]))
+    await session.commit()
+    return supplier_a, contract_a, contract_b
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]])
+    assert [doc for doc, _ in fused][:2] in (["a", "b"], ["b", "a"])
+    assert fused[-1][0] in ("c", "d")
+
+@pytest.mark.asyncio
+async def test_exact_terms_rank_first_and_filters_apply(session):
+    supplier_a, contract_a, contract_b = await _seed(session)
+
+    results = await hybrid_search(session, ContractChunk, "Section 12.3", [0.0, 0.0, 0.0], limit=1)
+    assert results[0].content.startswith("Section 12.3")
+
+    scoped = await hybrid_search(session, ContractChunk, "payable Net", [0.0, 0.0, 0.0],
+                                 limit=5, filters=SearchFilters(contract_id=contract_b.id))
+    assert {c.contract_id for c in scoped} == {contract_b.id}
+
+    by_supplier = await lexical_search(session, ContractChunk, "Invoices", 5,
+                                       SearchFilters(supplier_id=supplier_a.id))
+    assert len(by_supplier) == 1
+
+@pytest.mark.asyncio
+async def test_vector_search_scoped_to_contract(session):
+    _, contract_a, _ = await _seed(session)
+
+    ids = await vector_search(session, ContractChunk, [0.0, 0.0, 0.0], 10,
+                              SearchFilters(contract_id=contract_a.id))
+    assert len(ids) == 2
+
+class RecordingSession:
+    """
+    Stands in for a Postgres session: records the statements vector_search executes.
+    Catalog lookups report pgvector columns of `vector_width`.
+    """
+    def __init__(self, vector_width: int):
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.vector_width = vector_width
+        self.statements = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        if "format_type" in str(stmt):
+            rows = [(t, f"vector({self.vector_width})") for t in ("contractchunk", "policychunk")]
+            return SimpleNamespace(all=lambda: rows)
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda: [])
+
+    def sql(self) -> str:
+        return str(self.statements[-1].compile(dialect=postgresql.dialect()))
+
+@pytest.mark.asyncio
+async def test_postgres_scoped_plan_prefilters_candidates(monkeypatch):
+    monkeypatch.setattr(embeddings, "_vector_widths", None)
+    query = [0.0] * 8
+
+    unscoped = RecordingSession(vector_width=8)
+    await vector_search(unscoped, ContractChunk, query, 5)
+    assert "MATERIALIZED" not in unscoped.sql()
+    assert "ORDER BY contractchunk.embedding <->" in unscoped.sql()
+
+    scoped = RecordingSession(vector_width=8)
+    await vector_search(scoped, ContractChunk, query, 5, SearchFilters(supplier_id=uuid4()))
+    sql = scoped.sql()
+    assert "WITH candidates AS MATERIALIZED" in sql
+    assert "contract.supplier_id" in sql
+    assert "ORDER BY candidates.embedding <->" in sql
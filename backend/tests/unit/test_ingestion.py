@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import func, select
+from app.core.embeddings import EmbeddingSpace
+from app.core.ingestion import BulkIngestor
+from app.models import Policy, PolicyChunk
+
+POLICY_YAML = """
+policy_meta:
+  name: "Travel Policy"
+  version: "2.0"
+rules:
+  - "Economy class only"
+"""
+
+class FakeEmbedder:
+    embedding_space = EmbeddingSpace("fake", 3)
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_embeddings(self, texts):
+        self.calls += 1
+        return [[0.0] * 3 for _ in texts]
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_and_resume(tmp_path, session_factory):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    for i in range(3):
+        (corpus / f"policy_{i}.yaml").write_text(POLICY_YAML + f'notes: "{"x" * 1500}"\n')
+    (corpus / "broken.pdf").write_bytes(b"NOT_A_PDF")
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+
+    embedder = FakeEmbedder()
+    ingestor = BulkIngestor(session_factory, workers=2, db_batch_size=2,
+                            checkpoint_path=checkpoint, llm=embedder)
+    report = await ingestor.run(str(corpus))
+
+    assert report.documents == 3
+    assert len(report.failures) == 1
+    assert report.chunks == report.embeddings == 6
+    assert embedder.calls == 3  # one batched call per document
+
+    async with session_factory() as session:
+        policies = (await session.execute(select(Policy))).scalars().all()
+        chunk_count = (await session.execute(select(func.count()).select_from(PolicyChunk))).scalar()
+    assert {p.name for p in policies} == {"Travel Policy"}
+    assert chunk_count == 6
+
+    # Second run resumes from the checkpoint and skips committed files
+    resumed = await BulkIngestor(session_factory, workers=1, checkpoint_path=checkpoint,
+                                 llm=embedder).run(str(corpus))
+    assert resumed.documents == 0
+    assert resumed.skipped == 3
@@ -1,19 +1,20 @@
 import pytest
 from unittest.mock import AsyncMock
+from datetime import datetime, timezone
 from uuid import uuid4
-from app.supplier.intelligence import SupplierIntelligenceService
-from app.models import Supplier
+from fastapi import HTTPException
+from sqlalchemy import select
+from app.supplier.adapters.http import DataProviderError
+from app.supplier.intelligence import SupplierIntelligenceService, SupplierNotFound
+from app.models import Supplier, SupplierRiskProfile
 
 @pytest.mark.asyncio
-async def test_intelligence_flow(mocker):
-    # 1. Mock DB Session (AsyncMock because we use await session.xxx)
-    mock_session = AsyncMock()
-    mock_supplier = Supplier(id=uuid4(), name="Test Corp", lei="999000000")
-    
-    # Configure get return value
-    # For AsyncMock, calling the method returns an awaitable. 
-    # To set the RESULT of the awaitable, we set return_value.
-    mock_session.get.return_value = mock_supplier
+async def test_intelligence_flow(mocker, session_factory):
+    # 1. A stored supplier
+    async with session_factory() as session:
+        supplier = Supplier(name="Test Corp", lei="999000000", created_at=datetime.now(timezone.utc))
+        session.add(supplier)
+        await session.commit()
     
     # 2. Mock LLM Client
     mock_llm = AsyncMock()
@@ -33,8 +34,8 @@ async def test_intelligence_flow(mocker):
     mocker.patch("app.supplier.intelligence.get_supplier_data_provider", return_value=mock_provider)
     
     # Run Service
-    service = SupplierIntelligenceService()
-    risk_profile = await service.update_supplier_risk_profile(mock_session, mock_supplier.id)
+    service = SupplierIntelligenceService(session_factory)
+    risk_profile = await service.update_supplier_risk_profile(supplier.id)
     
     # Assertions
     # 1. Check if LLM was called with data
@@ -43,10 +44,82 @@ async def test_intelligence_flow(mocker):
     assert "--- FINANCIALS ---" in user_message
     
     # 2. Check Risk Profile creation
-    assert risk_profile.supplier_id == mock_supplier.id
+    assert risk_profile.supplier_id == supplier.id
     assert risk_profile.financial_stress_score == 20
     assert risk_profile.news_sentiment_score == -0.5
     
-    # 3. Check DB commit
-    assert mock_session.add.call_count >= 2 # Profile + Supplier update
-    assert mock_session.commit.called
+    # 3. Check DB commit (profile + supplier update)
+    async with session_factory() as session:
+        stored = (await session.execute(select(SupplierRiskProfile))).scalars().all()
+        updated = await session.get(Supplier, supplier.id)
+    assert [p.id for p in stored] == [risk_profile.id]
+    assert updated.current_risk_profile_id == risk_profile.id and updated.risk_score > 50
+
+@pytest.fixture
+def provider(mocker):
+    llm = AsyncMock()
+    llm.generate_json.return_value = {"news_sentiment_score": 0.0, "risk_summary": "", "recommended_action": "MONITOR"}
+    mocker.patch("app.supplier.intelligence.get_llm_client", return_value=llm)
+    provider = AsyncMock()
+    provider.get_financial_health.side_effect = DataProviderError("dnb", "HTTP 404", 404)
+    provider.get_financial_health_many.side_effect = DataProviderError("dnb", "HTTP 404", 404)
+    provider.get_market_news.return_value = []
+    provider.check_compliance.return_value = {"sanctions_flag": False}
+    mocker.patch("app.supplier.intelligence.get_supplier_data_provider", return_value=provider)
+    return provider
+
+async def _stored_suppliers(session_factory):
+    async with session_factory() as session:
+        now = datetime.now(timezone.utc)
+        with_lei = Supplier(name="LEI Corp", lei="5493001KJTIIGC8Y1R12", created_at=now)
+        with_duns = Supplier(name="DUNS Corp", lei="123456789", created_at=now)
+        session.add_all([with_lei, with_duns])
+        await session.commit()
+        return with_lei, with_duns
+
+@pytest.mark.asyncio
+async def test_refresh_degrades_to_unknown_financials(provider, session_factory):
+    with_lei, with_duns = await _stored_suppliers(session_factory)
+    service = SupplierIntelligenceService(session_factory)
+
+    async with session_factory() as session:
+        profiles = await service.refresh_risk_profiles(session, [with_lei.id, with_duns.id])
+
+    # Only the real DUNS goes to D&B; its lookup failing does not fail the refresh
+    provider.get_financial_health_many.assert_awaited_once_with(["123456789"])
+    provider.get_financial_health.assert_awaited_once_with("123456789")
+    assert [p.supplier_id for p in profiles] == [with_lei.id, with_duns.id]
+    assert {(p.financial_stress_score, p.credit_rating) for p in profiles} == {(50, "Unknown")}
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_unknown_suppliers(provider, session_factory):
+    with_lei, _ = await _stored_suppliers(session_factory)
+    service = SupplierIntelligenceService(session_factory)
+    unknown = uuid4()
+
+    async with session_factory() as session:
+        with pytest.raises(SupplierNotFound) as e:
+            await service.refresh_risk_profiles(session, [with_lei.id, unknown])
+        assert e.value.supplier_ids == [unknown]
+        assert (await session.execute(select(SupplierRiskProfile))).scalars().all() == []
+
+@pytest.mark.asyncio
+async def test_risk_refresh_endpoint(provider, session_factory, mocker):
+    from app.supplier.api import RiskRefreshRequest, refresh_risk_profiles
+
+    mocker.patch("app.database.async_session", session_factory)
+    with_lei, with_duns = await _stored_suppliers(session_factory)
+
+    async with session_factory() as session:
+        response = await refresh_risk_profiles(RiskRefreshRequest(supplier_ids=[with_lei.id, with_duns.id]), session)
+        assert response["refreshed"] == 2
+
+        with pytest.raises(HTTPException) as e:
+            await refresh_risk_profiles(RiskRefreshRequest(supplier_ids=[uuid4()]), session)
+        assert e.value.status_code == 404
+
+        # Sanctions screening that cannot run still fails the request
+        provider.check_compliance.side_effect = DataProviderError("sanctions", "no lists loaded", 503)
+        with pytest.raises(HTTPException) as e:
+            await refresh_risk_profiles(RiskRefreshRequest(supplier_ids=[with_lei.id]), session)
+        assert e.value.status_code == 502
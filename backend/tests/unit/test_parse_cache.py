@@ -0,0 +1,117 @@
+from datetime import datetime, timezone
+import io
+import os
+import threading
+import time
+import pytest
+from sqlalchemy import select
+from app.contract.cache import ParsedDocumentCache, file_sha256
+from app.contract.parser import ParsedDocument, TextParser
+from app.core.embeddings import embedding_fields
+from app.models import Contract, ContractChunk, Supplier
+
+def _document(text):
+    return ParsedDocument(format="text", text=text)
+
+def test_lru_eviction(tmp_path):
+    cache = ParsedDocumentCache(str(tmp_path), max_bytes=10_000)
+    for name in ("a", "b", "c"):
+        cache.put(name, _document(name * 3000))
+        time.sleep(0.01)
+    # Touch "a" so "b" becomes least recently used
+    assert cache.get("a").text == "a" * 3000
+    cache.put("d", _document("d" * 3000))
+
+    assert cache.get("b") is None
+    assert {n for n in ("a", "c", "d") if cache.get(n) is not None} >= {"a", "d"}
+    assert sum(os.path.getsize(tmp_path / f) for f in os.listdir(tmp_path)) <= 10_000
+
+@pytest.mark.asyncio
+async def test_get_or_parse_parses_once(tmp_path, mocker):
+    cache = ParsedDocumentCache(str(tmp_path), max_bytes=1_000_000)
+    parser = TextParser()
+    spy = mocker.spy(parser, "parse_document")
+    file = io.BytesIO(b"Clause 1\n\nClause 2\n")
+    content_hash = file_sha256(file)
+
+    first = await cache.get_or_parse(content_hash, parser, file, "a.txt")
+    second = await cache.get_or_parse(content_hash, parser, file, "copy-of-a.txt")
+    assert first == second
+    assert len(second.segments) == 2
+    assert spy.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_get_or_parse_keeps_disk_work_off_the_event_loop(tmp_path, mocker):
+    cache = ParsedDocumentCache(str(tmp_path), max_bytes=1_000_000)
+    threads = []
+
+    def on_thread(method):
+        def call(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return call
+    mocker.patch.object(cache, "get", side_effect=on_thread(cache.get))
+    mocker.patch.object(cache, "put", side_effect=on_thread(cache.put))
+
+    await cache.get_or_parse("h", TextParser(), io.BytesIO(b"Clause 1\n"), "a.txt")
+    assert len(threads) == 2 and threading.main_thread() not in threads
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_contract(session, mocker):
+    from app.contract.api import _find_duplicate
+
+    ingest = mocker.patch("app.contract.api.RAGService.ingest_contract")
+    now = datetime.now(timezone.utc)
+    supplier_a, supplier_b = Supplier(name="Acme", created_at=now), Supplier(name="Globex", created_at=now)
+    session.add_all([supplier_a, supplier_b])
+    await session.commit()
+    assert await _find_duplicate(session, "abc", supplier_a.id) is None
+
+    contract = Contract(title="MSA", supplier_id=supplier_a.id, content_text="Net 45", content_hash="abc",
+                        created_at=now)
+    session.add(contract)
+    await session.commit()
+    response = await _find_duplicate(session, "abc", supplier_a.id)
+
+    assert response["id"] == str(contract.id) and response["duplicate"]
+    # No chunks were stored for it yet, so it is re-chunked from the stored text
+    ingest.assert_called_once()
+
+    # The same file from another supplier is not that supplier's contract
+    assert await _find_duplicate(session, "abc", supplier_b.id) is None
+    assert await _find_duplicate(session, "abc") is None
+
+@pytest.mark.asyncio
+async def test_same_file_for_another_supplier_reuses_chunks(session):
+    from app.contract.api import _copy_chunks
+
+    now = datetime.now(timezone.utc)
+    first = Contract(title="MSA", content_text="Net 45", content_hash="abc", created_at=now)
+    second = Contract(title="MSA", content_text="Net 45", content_hash="abc", created_at=now)
+    session.add_all([first, second])
+    await session.commit()
+    assert await _copy_chunks(session, "abc", second.id) == 0
+
+    session.add_all([
+        ContractChunk(contract_id=first.id, chunk_index=i, content=f"chunk {i}", **embedding_fields([float(i), 1.0]))
+        for i in range(2)
+    ])
+    await session.commit()
+    assert await _copy_chunks(session, "abc", second.id) == 2
+
+    result = await session.execute(select(ContractChunk).where(ContractChunk.contract_id == second.id))
+    copies = sorted(result.scalars().all(), key=lambda c: c.chunk_index)
+    assert [c.content for c in copies] == ["chunk 0", "chunk 1"]
+    assert copies[1].embedding_blob == embedding_fields([1.0, 1.0])["embedding_blob"]
+
+@pytest.mark.asyncio
+async def test_add_missing_columns_migrates_old_tables(engine):
+    from sqlalchemy import text
+    from app.core.embeddings import add_missing_columns
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE legacy (id INTEGER PRIMARY KEY)"))
+        assert await add_missing_columns(conn, "legacy", {"id": "INTEGER", "content_hash": "VARCHAR"}) == ["content_hash"]
+        assert await add_missing_columns(conn, "legacy", {"content_hash": "VARCHAR"}) == []
+        await conn.execute(text("INSERT INTO legacy (id, content_hash) VALUES (1, 'abc')"))
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import select
+from app.models import Supplier, SupplierPerformanceRollup
+from app.supplier.performance import (
+    build_reports, load_rankings, load_trend, period_bucket, rebuild_rollups, record_performance
+)
+
+class Entry:
+    def __init__(self, month, quality, delivery, cost):
+        self.period_start = datetime(2024, month, 1, tzinfo=timezone.utc)
+        self.period_end = datetime(2024, month, 28, tzinfo=timezone.utc)
+        self.quality_score, self.delivery_score, self.cost_score = quality, delivery, cost
+
+async def _suppliers(session, *names):
+    suppliers = [Supplier(name=n, created_at=datetime.now(timezone.utc)) for n in names]
+    session.add_all(suppliers)
+    await session.commit()
+    return suppliers
+
+def test_period_bucket():
+    moment = datetime(2024, 8, 17, 12, tzinfo=timezone.utc)
+    assert period_bucket(moment, "month") == datetime(2024, 8, 1, tzinfo=timezone.utc)
+    assert period_bucket(moment, "quarter") == datetime(2024, 7, 1, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        period_bucket(moment, "week")
+
+@pytest.mark.asyncio
+async def test_rollups_are_maintained_incrementally(session):
+    [acme] = await _suppliers(session, "Acme")
+    await record_performance(session, build_reports(acme.id, [Entry(1, 90, 60, 30), Entry(2, 60, 60, 60)]))
+    await record_performance(session, build_reports(acme.id, [Entry(2, 80, 80, 80), Entry(4, 30, 30, 30)]))
+
+    rollups = (await session.execute(select(SupplierPerformanceRollup))).scalars().all()
+    by_key = {(r.period_type, r.period_start.month): r for r in rollups}
+    assert len(rollups) == 5  # Months 1, 2, 4 and quarters 1, 2
+    assert by_key[("month", 2)].report_count == 2 and by_key[("month", 2)].overall_sum == 140
+    assert by_key[("quarter", 1)].report_count == 3
+    assert (by_key[("quarter", 1)].overall_min, by_key[("quarter", 1)].overall_max) == (60, 80)
+
+    trend = await load_trend(session, acme.id, "month", window=2)
+    assert [p["period_start"].month for p in trend] == [1, 2, 4]
+    assert trend[1]["overall"] == 70
+    assert trend[1]["overall_moving_avg"] == pytest.approx((60 + 60 + 80) / 3)  # Report-weighted
+    assert trend[2]["quality_moving_avg"] == pytest.approx((60 + 80 + 30) / 3)
+
+    # A rebuild from the raw reports gives the same totals
+    await rebuild_rollups(session)
+    rebuilt = (await session.execute(select(SupplierPerformanceRollup))).scalars().all()
+    assert sorted((r.period_type, r.period_start, r.overall_sum) for r in rebuilt) == \
+        sorted((r.period_type, r.period_start, r.overall_sum) for r in rollups)
+
+@pytest.mark.asyncio
+async def test_rankings_read_the_latest_period(session):
+    good, bad = await _suppliers(session, "Good", "Bad")
+    await record_performance(session, build_reports(good.id, [Entry(5, 95, 95, 95)]) +
+                             build_reports(bad.id, [Entry(5, 40, 90, 50), Entry(1, 99, 99, 99)]))
+
+    ranking = await load_rankings(session, "quarter")
+    assert ranking["period_start"].month == 4
+    assert [s["supplier_id"] for s in ranking["suppliers"]] == [str(good.id), str(bad.id)]
+
+    by_quality = await load_rankings(session, "month", datetime(2024, 5, 10), metric="quality", ascending=True)
+    assert by_quality["suppliers"][0]["supplier_id"] == str(bad.id)
+    with pytest.raises(ValueError):
+        await load_rankings(session, metric="price")
+
+@pytest.mark.asyncio
+async def test_concurrent_reports_are_all_counted(session, session_factory):
+    [acme] = await _suppliers(session, "Acme")
+    await record_performance(session, build_reports(acme.id, [Entry(3, 50, 50, 50)]))
+    # A writer that read the rollups before the others committed (a stale snapshot)
+    stale = (await session.execute(select(SupplierPerformanceRollup))).scalars().all()
+    assert [r.report_count for r in stale] == [1, 1]
+
+    async def report(score):
+        async with session_factory() as own:
+            await record_performance(own, build_reports(acme.id, [Entry(3, score, score, score)]))
+    await asyncio.gather(*(report(score) for score in range(60, 100, 4)))
+    await record_performance(session, build_reports(acme.id, [Entry(3, 40, 40, 40)]))
+
+    async with session_factory() as fresh:
+        rollups = (await fresh.execute(select(SupplierPerformanceRollup))).scalars().all()
+    by_key = {(r.period_type, r.period_start.month): r for r in rollups}
+    for key in (("month", 3), ("quarter", 1)):
+        assert by_key[key].report_count == 12
+        assert by_key[key].overall_sum == 50 + sum(range(60, 100, 4)) + 40
+        assert (by_key[key].overall_min, by_key[key].overall_max) == (40, 96)
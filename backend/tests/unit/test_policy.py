@@ -1,3 +1,5 @@
+import asyncio
+import re
 import pytest
 from app.policy.engine import PolicyEvaluator, EvaluationResult
 from app.models import Policy
@@ -47,3 +49,98 @@ async def test_policy_prompt_injection_composition(mocker):
     user_content = messages[0].content
     assert "--- CONTRACT SEGMENT ---" in user_content
     assert injection_text in user_content
+
+def _answer_by_policy(statuses):
+    """
+    A batched LLM stub that answers each pair from the policy it names in the prompt,
+    so results only line up if the evaluator maps pair ids back correctly.
+    """
+    def answer(messages, schema, system_prompt=None):
+        content = messages[0].content
+        labels = dict(re.findall(r"^\[(P\d+)\] (\w+) \(v", content, re.MULTILINE))
+        pairs = re.findall(r"^pair_id (\d+): C\d+ vs (P\d+)$", content, re.MULTILINE)
+        return {"results": [
+            {"pair_id": int(pair_id), "status": statuses[labels[label]], "score": 50,
+             "reasoning": labels[label], "flagged_issues": []}
+            for pair_id, label in pairs if labels[label] in statuses
+        ]}
+    return answer
+
+@pytest.mark.asyncio
+async def test_batch_evaluation_single_request_per_clause(mocker):
+    """
+    One clause checked against several policies is sent in a single LLM request
+    and mapped back to per-pair results.
+    """
+    mock_llm_client = mocker.AsyncMock()
+    mock_llm_client.generate_json.side_effect = _answer_by_policy(
+        {"Gifts": "COMPLIANT", "Privacy": "NON_COMPLIANT", "Travel": "COMPLIANT"}
+    )
+    mocker.patch("app.policy.engine.get_llm_client", return_value=mock_llm_client)
+
+    evaluator = PolicyEvaluator()
+    policies = [
+        Policy(name="Privacy", version="2", text_content="Personal data stays in the EU"),
+        Policy(name="Gifts", version="1", text_content="No gifts over $50"),
+        Policy(name="Travel", version="3", text_content="Economy class only"),
+    ]
+    clause = "Supplier may process data in any region."
+
+    results = await evaluator.evaluate_batch([(clause, p) for p in policies])
+
+    assert mock_llm_client.generate_json.call_count == 1
+    user_content = mock_llm_client.generate_json.call_args[0][0][0].content
+    assert user_content.count(clause) == 1
+    # Each result belongs to its input pair, in input order, whatever the internal batching order
+    assert [(r.policy_version, r.status, r.reasoning) for r in results] == [
+        ("2", "NON_COMPLIANT", "Privacy"), ("1", "COMPLIANT", "Gifts"), ("3", "COMPLIANT", "Travel"),
+    ]
+    assert [r.policy_id for r in results] == [str(p.id) for p in policies]
+
+@pytest.mark.asyncio
+async def test_batch_evaluation_falls_back_for_missing_pairs_concurrently(mocker):
+    answer = _answer_by_policy({"Gifts": "COMPLIANT"})
+    in_flight = 0
+    peak = 0
+
+    async def generate_json(messages, schema, system_prompt=None):
+        nonlocal in_flight, peak
+        if "results" in schema["properties"]:
+            return answer(messages, schema, system_prompt)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"status": "NEEDS_REVIEW", "score": 0, "reasoning": "single", "flagged_issues": []}
+
+    mock_llm_client = mocker.AsyncMock()
+    mock_llm_client.generate_json.side_effect = generate_json
+    mocker.patch("app.policy.engine.get_llm_client", return_value=mock_llm_client)
+
+    evaluator = PolicyEvaluator()
+    policies = [Policy(name=name, version="1", text_content=f"{name} rules") for name in ("Gifts", "Privacy", "Travel")]
+
+    results = await evaluator.evaluate_batch([("Clause text", p) for p in policies])
+
+    assert [r.reasoning for r in results] == ["Gifts", "single", "single"]
+    assert mock_llm_client.generate_json.call_count == 3
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_batch_evaluation_splits_over_budget(mocker):
+    mock_llm_client = mocker.AsyncMock()
+    mock_llm_client.generate_json.return_value = {
+        "status": "COMPLIANT", "score": 100, "reasoning": "ok", "flagged_issues": []
+    }
+    mocker.patch("app.policy.engine.get_llm_client", return_value=mock_llm_client)
+
+    evaluator = PolicyEvaluator()
+    policies = [Policy(name=f"P{i}", version="1", text_content="x" * 4000) for i in range(3)]
+
+    results = await evaluator.evaluate_batch(
+        [("Clause text", p) for p in policies], max_prompt_tokens=1500
+    )
+
+    # Each policy alone is ~1000 tokens, so every pair needs its own request
+    assert mock_llm_client.generate_json.call_count == 3
+    assert all(r.status == "COMPLIANT" for r in results)
@@ -0,0 +1,61 @@
+import pytest
+from app.models import Policy, PolicyChunk
+from app.policy.engine import PolicyEvaluator
+from app.policy.index import PolicyEntry, PolicyIndex
+
+STRUCTURED_POLICY = """
+compliance_rules:
+  - rule_id: "PAY-01"
+    term: "payment_days"
+    min: "Net 45"
+"""
+
+def _entry(name: str, text: str, chunks=()) -> PolicyEntry:
+    policy = Policy(name=name, version="1.0", text_content=text)
+    return PolicyEntry.from_policy(policy, chunks)
+
+def test_select_prefers_policy_with_matching_rules():
+    generic = _entry("Code of Conduct", "Be nice to suppliers.")
+    payments = _entry("Payments", STRUCTURED_POLICY)
+    index = PolicyIndex([generic, payments], generation=1)
+
+    assert index.select_for_clause("Invoices are payable Net 30.").name == "Payments"
+    assert index.select_for_clause("The supplier shall wear hats.").name == "Code of Conduct"
+
+def test_replace_returns_new_generation_without_mutating_old():
+    entry = _entry("Payments", STRUCTURED_POLICY)
+    index = PolicyIndex([entry], generation=3)
+
+    updated = PolicyEntry.from_policy(
+        Policy(id=entry.id, name="Payments", version="2.0", text_content=STRUCTURED_POLICY)
+    )
+    new_index = index.replace(updated, entry.id)
+
+    assert new_index.generation == 4
+    assert new_index.get(entry.id).version == "2.0"
+    assert index.get(entry.id).version == "1.0"
+    assert len(index.replace(None, entry.id)) == 0
+
+def test_in_memory_chunk_search():
+    policy = Policy(name="P", version="1", text_content="x")
+    chunks = [
+        PolicyChunk(policy_id=policy.id, chunk_index=0, content="far", embedding=[10.0, 10.0]),
+        PolicyChunk(policy_id=policy.id, chunk_index=1, content="near", embedding=[1.0, 0.0]),
+    ]
+    entry = PolicyEntry.from_policy(policy, chunks)
+    index = PolicyIndex([entry], {policy.id: [c.embedding for c in chunks]}, generation=1)
+
+    results = index.search([1.0, 0.1], limit=1)
+    assert results[0][1] == "near"
+
+@pytest.mark.asyncio
+async def test_evaluation_records_policy_version(mocker):
+    mocker.patch("app.policy.engine.get_llm_client", return_value=mocker.AsyncMock())
+    entry = _entry("Payments", STRUCTURED_POLICY)
+
+    result = await PolicyEvaluator().evaluate("Payment is due Net 10.", entry, index_generation=7)
+
+    assert result.status == "NON_COMPLIANT"
+    assert result.policy_version == "1.0"
+    assert result.policy_id == str(entry.id)
+    assert result.index_generation == 7
@@ -0,0 +1,84 @@
+import os
+import pytest
+from app.policy.engine import PolicyEvaluator
+from app.policy.rules import compile_policy_text, extract_terms, prescreen, UNLIMITED
+from app.models import Policy
+
+POLICY_PATH = os.path.join(
+    os.path.dirname(__file__), "../../../test_mock_documents/contract_management_policy.yaml"
+)
+
+@pytest.fixture
+def policy_text():
+    with open(POLICY_PATH) as f:
+        return f.read()
+
+def test_extract_terms_seed_scenarios():
+    assert extract_terms("All invoices are due and payable within seven (7) days of receipt (Net 7).")["payment_days"] == 7
+    assert extract_terms(
+        "This agreement shall automatically renew for successive terms of three (3) years "
+        "unless terminated with 6 months notice."
+    )["renewal_term"] == 3 * 365
+    assert extract_terms(
+        "Provider's total liability for any data breach or loss shall be strictly limited to $5,000 USD."
+    )["liability_cap"] == 5000
+    assert extract_terms(
+        "Licensor shall have no right to audit Licensee's systems or records."
+    )["audit_rights"] is False
+    assert extract_terms("Liability for data breach shall be unlimited.")["liability_cap"] == UNLIMITED
+    # "Unlimited" must state the cap itself
+    assert extract_terms("Liability for data breach shall not be unlimited and is capped at $5,000.")["liability_cap"] == 5000
+    assert "liability_cap" not in extract_terms("Liability shall not be unlimited.")
+    assert "liability_cap" not in extract_terms("Liability is capped at $5,000, or unlimited for fraud.")
+
+@pytest.mark.parametrize("clause", [
+    "All invoices are due and payable within seven (7) days of receipt (Net 7).",
+    "This agreement shall automatically renew for successive terms of three (3) years.",
+    "Provider's total liability for any data breach shall be strictly limited to $5,000 USD.",
+    "Licensor shall have no right to audit Licensee's systems or records regarding usage of the Software.",
+])
+def test_prescreen_non_compliant(policy_text, clause):
+    verdict = prescreen(clause, compile_policy_text(policy_text))
+    assert verdict is not None
+    assert verdict.status == "NON_COMPLIANT"
+    assert verdict.flagged_issues
+
+def test_prescreen_compliant_and_inconclusive(policy_text):
+    rules = compile_policy_text(policy_text)
+    verdict = prescreen("Invoices are payable Net 60 from receipt.", rules)
+    assert verdict.status == "COMPLIANT"
+
+    # Liability rule is scoped to data breaches; generic caps go to the LLM
+    assert prescreen("Total liability is limited to $5,000.", rules) is None
+    assert prescreen("The Supplier shall use reasonable endeavours.", rules) is None
+
+def test_prescreen_compliant_only_when_every_obligation_is_covered(policy_text):
+    rules = compile_policy_text(policy_text)
+    assert prescreen("Payment Terms. Invoices are payable Net 60 from receipt.", rules).status == "COMPLIANT"
+
+    # The payment rule passes, but the other obligations are for the LLM to judge
+    assert prescreen(
+        "Invoices are payable Net 60 from receipt. Customer shall indemnify Supplier against all claims.", rules
+    ) is None
+    assert prescreen("Invoices are payable Net 60; late payments accrue interest at 5% per month.", rules) is None
+    # A stated term without a matching rule is not covered either
+    assert prescreen("Invoices are payable Net 60. Total liability is limited to $5,000.", rules) is None
+    # A failing rule is still decisive
+    verdict = prescreen("Invoices are payable Net 7. Customer shall indemnify Supplier against all claims.", rules)
+    assert verdict.status == "NON_COMPLIANT"
+
+def test_free_text_policy_has_no_rules():
+    assert compile_policy_text("No gifts over $50") == ()
+
+@pytest.mark.asyncio
+async def test_evaluator_skips_llm_when_rules_decide(mocker, policy_text):
+    mock_llm = mocker.AsyncMock()
+    mocker.patch("app.policy.engine.get_llm_client", return_value=mock_llm)
+    evaluator = PolicyEvaluator()
+    policy = Policy(name="CMP", version="3.2", text_content=policy_text)
+
+    result = await evaluator.evaluate("Payment is due Net 7.", policy)
+
+    assert result.status == "NON_COMPLIANT"
+    assert result.evaluated_by == "rules"
+    assert not mock_llm.generate_json.called
@@ -0,0 +1,51 @@
+import json
+from app.llm import LLMMessage, PromptBudget, TokenCounter
+from app.llm.tokens import compact_context, fit_history, select_passages
+
+def _history(turns):
+    return [
+        LLMMessage(role="user" if i % 2 == 0 else "assistant", content=f"turn {i} " + "word " * 50)
+        for i in range(turns)
+    ]
+
+def test_counter_falls_back_to_character_ratio():
+    counter = TokenCounter("aws")
+    assert counter.count("") == 0
+    assert counter.count("x" * 350) == 101
+    truncated = counter.truncate("x" * 1000, 50)
+    assert truncated.endswith("[...]") and counter.count(truncated) <= 52
+
+def test_fit_history_keeps_newest():
+    counter = TokenCounter("mock")
+    history = _history(10)
+    kept, dropped = fit_history(history, 200, counter)
+    assert kept == history[-len(kept):]
+    assert dropped == 10 - len(kept) and dropped > 0
+    assert counter.count_messages(kept) <= 200
+
+def test_prompt_size_is_stable_as_history_grows():
+    budget = PromptBudget(max_tokens=500, counter=TokenCounter("mock"))
+    sizes = []
+    for turns in (20, 100, 400):
+        fitted = budget.fit("test", _history(turns), system_prompt="You are a supplier.")
+        sizes.append(budget.counter.count_messages(fitted, "You are a supplier."))
+        assert fitted[-1].content.startswith(f"turn {turns - 1}")
+        assert "earlier messages omitted" in fitted[0].content
+    assert max(sizes) <= 500
+    assert max(sizes) - min(sizes) < 100
+
+def test_compact_context_strips_irrelevant_fields():
+    profile = {
+        "id": "5f1c", "supplier_id": "9a2b", "retrieved_at": "2024-01-01T00:00:00",
+        "credit_rating": "BBB", "sanctions_flag": False, "sanctions_list_match": None,
+        "news_sentiment_score": -0.2,
+    }
+    compact = json.loads(compact_context(profile, ("credit_rating", "sanctions_flag", "sanctions_list_match",
+                                                   "news_sentiment_score")))
+    assert compact == {"credit_rating": "BBB", "sanctions_flag": False, "news_sentiment_score": -0.2}
+
+def test_select_passages_prefers_relevant_chunks():
+    chunks = ["Payment terms must not exceed Net 60.", "Travel expenses require approval.",
+              "Liability must be capped at contract value."]
+    selected = select_passages(chunks, "Supplier liability is capped at $1m", 12, TokenCounter("mock"))
+    assert selected == chunks[2]
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.core import embeddings
+from app.core.embeddings import (
+    EmbeddingSpace, embedding_fields, load_vector_column_dimensions, parse_vector_type, resolve_space
+)
+from app.core.reembed import prune_spaces, reembed, reembed_progress
+from app.core.search import SearchFilters, vector_search
+from app.models import ContractChunk
+
+OLD = EmbeddingSpace("old-model", 2)
+NEW = EmbeddingSpace("new-model", 3)
+
+class FakeEmbedder:
+    embedding_space = NEW
+
+    def __init__(self):
+        self.texts = []
+
+    async def generate_embeddings(self, texts):
+        self.texts.extend(texts)
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+def test_resolve_space():
+    assert resolve_space("text-embedding-3-small", 512).key == "text-embedding-3-small@512"
+    assert resolve_space("mistral-embed").dimensions == 1024
+    with pytest.raises(ValueError):
+        resolve_space("amazon.titan-embed-text-v1", 256)
+    with pytest.raises(ValueError):
+        resolve_space("unknown-model")
+
+@pytest.mark.asyncio
+async def test_reembed_keeps_both_spaces_until_pruned(session_factory):
+    contract_id = uuid4()
+    async with session_factory() as session:
+        for i in range(3):
+            session.add(ContractChunk(contract_id=contract_id, chunk_index=i, content=f"chunk {i}",
+                                      **embedding_fields([0.0, 1.0], OLD)))
+        await session.commit()
+
+    embedder = FakeEmbedder()
+    assert await reembed(session_factory, ContractChunk, NEW, llm=embedder, batch_size=2) == 3
+    assert sorted(embedder.texts) == ["chunk 0", "chunk 1", "chunk 2"]
+    # Idempotent: nothing left to do
+    assert await reembed(session_factory, ContractChunk, NEW, llm=embedder) == 0
+
+    async with session_factory() as session:
+        assert await reembed_progress(session, ContractChunk, NEW) == (0, 3)
+        # Each space only sees its own rows
+        old_ids = await vector_search(session, ContractChunk, [0.0, 1.0], 10, SearchFilters(embedding_space=OLD.key))
+        new_ids = await vector_search(session, ContractChunk, [1.0, 0.0, 0.0], 10,
+                                      SearchFilters(embedding_space=NEW.key))
+        assert len(old_ids) == len(new_ids) == 3
+        assert not set(old_ids) & set(new_ids)
+
+        assert await prune_spaces(session, ContractChunk, NEW) == 3
+        remaining = (await session.execute(select(ContractChunk.embedding_model))).scalars().all()
+    assert remaining == [NEW.key] * 3
+
+class CatalogSession:
+    """
+    A Postgres session whose chunk tables have pgvector columns of `width`; records
+    the search statements executed against it.
+    """
+    def __init__(self, width):
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.width = width
+        self.statements = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        if "format_type" in str(stmt):
+            return SimpleNamespace(all=lambda: [("contractchunk", f"vector({self.width})"), ("policychunk", "vector")])
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(all=lambda: [])
+
+@pytest.mark.asyncio
+async def test_model_switch_follows_database_column_width(monkeypatch):
+    # The column was created for OLD; the configured model is now NEW
+    monkeypatch.setattr(embeddings, "_vector_widths", None)
+    monkeypatch.setattr(embeddings, "keeps_vector_column", lambda: True)
+    monkeypatch.setattr(embeddings, "active_embedding_space", lambda: NEW)
+    session = CatalogSession(width=OLD.dimensions)
+
+    assert parse_vector_type("vector(1536)") == 1536 and parse_vector_type("bytea") is None
+    assert await load_vector_column_dimensions(session) == {"contractchunk": OLD.dimensions}
+
+    # New-space rows never write the old-width column, old-space rows still do
+    assert embedding_fields([1.0, 0.0, 0.0], NEW, ContractChunk)["embedding"] is None
+    assert embedding_fields([0.0, 1.0], OLD, ContractChunk)["embedding"] == [0.0, 1.0]
+
+    # The new space is searched by the binary scan, not over NULL pgvector values
+    await vector_search(session, ContractChunk, [1.0, 0.0, 0.0], 5, SearchFilters(embedding_space=NEW.key))
+    assert "<->" not in session.statements[-1] and "embedding_blob" in session.statements[-1]
+    await vector_search(session, ContractChunk, [0.0, 1.0], 5, SearchFilters(embedding_space=OLD.key))
+    assert "ORDER BY contractchunk.embedding <->" in session.statements[-1]
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.models import Supplier, SupplierRiskProfile
+from app.supplier.history import (
+    backfill_current_profiles, compact_risk_history, current_risk_profile, load_risk_history
+)
+
+NOW = datetime(2024, 6, 30, 12, tzinfo=timezone.utc)
+
+async def _supplier_with_snapshots(session, ages_in_hours):
+    supplier = Supplier(name="Acme", created_at=NOW)
+    session.add(supplier)
+    profiles = [
+        SupplierRiskProfile(supplier_id=supplier.id, retrieved_at=NOW - timedelta(hours=h),
+                            financial_stress_score=50, news_sentiment_score=0.0)
+        for h in ages_in_hours
+    ]
+    session.add_all(profiles)
+    await session.commit()
+    return supplier, profiles
+
+async def _remaining(session):
+    result = await session.execute(select(SupplierRiskProfile.retrieved_at).order_by(SupplierRiskProfile.retrieved_at))
+    return [t.replace(tzinfo=timezone.utc) for t in result.scalars().all()]
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_recent_then_daily_then_weekly(session):
+    # Every 6 hours over the last 200 days
+    supplier, _ = await _supplier_with_snapshots(session, range(0, 200 * 24, 6))
+    assert await backfill_current_profiles(session) == 1
+
+    dry = await compact_risk_history(session, now=NOW, dry_run=True)
+    assert dry["deleted"] > 0 and len(await _remaining(session)) == 800
+
+    result = await compact_risk_history(session, now=NOW)
+    assert result["deleted"] == dry["deleted"]
+    remaining = await _remaining(session)
+    ages = [NOW - t for t in remaining]
+
+    # The snapshot exactly 7 days old is not older than the cutoff: still kept in full
+    recent = [a for a in ages if a <= timedelta(days=7)]
+    daily = [t for t, a in zip(remaining, ages) if timedelta(days=7) < a < timedelta(days=90)]
+    weekly = [t for t, a in zip(remaining, ages) if a >= timedelta(days=90)]
+    assert len(recent) == 7 * 4 + 1
+    assert len({t.date() for t in daily}) == len(daily)
+    assert len({t.isocalendar()[:2] for t in weekly}) == len(weekly)
+    # Compacting again is a no-op
+    assert (await compact_risk_history(session, now=NOW))["deleted"] == 0
+
+@pytest.mark.asyncio
+async def test_current_profile_is_never_compacted(session):
+    # A supplier not refreshed for months: its latest snapshot is old
+    supplier, profiles = await _supplier_with_snapshots(session, [24 * 100 + 5, 24 * 100 + 1, 24 * 100 + 3])
+    supplier.current_risk_profile_id = profiles[0].id
+    await session.commit()
+
+    await compact_risk_history(session, now=NOW)
+    remaining = (await session.execute(select(SupplierRiskProfile.id))).scalars().all()
+    assert remaining == [profiles[0].id]
+    assert (await current_risk_profile(session, supplier.id)).id == profiles[0].id
+
+@pytest.mark.asyncio
+async def test_current_profile_falls_back_to_latest_snapshot(session):
+    supplier, profiles = await _supplier_with_snapshots(session, [48, 2, 24])
+    assert (await current_risk_profile(session, supplier.id)).id == profiles[1].id
+
+    await backfill_current_profiles(session)
+    await session.refresh(supplier)
+    assert supplier.current_risk_profile_id == profiles[1].id
+
+@pytest.mark.asyncio
+async def test_history_range_and_resolution(session):
+    supplier, _ = await _supplier_with_snapshots(session, range(0, 10 * 24, 6))
+
+    start = NOW - timedelta(days=3)
+    points = await load_risk_history(session, supplier.id, start=start, end=NOW)
+    assert len(points) == 12
+    assert all(p["risk_score"] == pytest.approx(0.6 * 50 + 0.4 * 50) for p in points)
+
+    daily = await load_risk_history(session, supplier.id, resolution="day")
+    assert len(daily) == len({p["retrieved_at"].date() for p in daily}) == 11
+    assert daily == sorted(daily, key=lambda p: p["retrieved_at"])
+    with pytest.raises(ValueError):
+        await load_risk_history(session, supplier.id, resolution="hour")
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from app.models import Supplier, SupplierPerformance, SupplierRiskProfile
+from app.supplier.intelligence import combined_risk_score
+from app.supplier.scoring import PortfolioRiskInputs, RiskWeights, rescore_suppliers, score_portfolio
+
+def _inputs(financial, sentiment, sanctions, kpis=(np.nan, np.nan, np.nan)):
+    n = len(financial)
+    arrays = [np.array(v, dtype=np.float64) for v in (financial, sentiment, sanctions)]
+    arrays += [np.full(n, k, dtype=np.float64) for k in kpis]
+    return PortfolioRiskInputs(list(range(n)), np.zeros(n), *arrays)
+
+def test_default_weights_match_the_per_supplier_formula():
+    rng = np.random.default_rng(0)
+    financial = rng.integers(1, 101, 200).astype(float)
+    sentiment = rng.uniform(-1, 1, 200)
+    sanctions = rng.random(200) < 0.1
+    scores = score_portfolio(_inputs(financial, sentiment, sanctions))
+    expected = [combined_risk_score(f, s, bool(x)) for f, s, x in zip(financial, sentiment, sanctions)]
+    np.testing.assert_allclose(scores, expected)
+
+def test_performance_kpis_and_missing_components():
+    inputs = _inputs([np.nan, 80.0, np.nan], [np.nan, 0.0, np.nan], [np.nan, 0, 1], kpis=(40.0, 60.0, 80.0))
+    inputs.quality[2] = np.nan
+    scores = score_portfolio(inputs, RiskWeights(financial=0.5, sentiment=0.0, performance=0.5))
+    assert scores[0] == pytest.approx(40.0)  # Performance only: 100 - mean(40, 60, 80)
+    assert scores[1] == pytest.approx(30.0)  # (20 + 40) / 2
+    assert scores[2] == 100.0  # Sanctions override
+
+    no_data = score_portfolio(_inputs([np.nan], [np.nan], [np.nan]))
+    assert np.isnan(no_data[0])
+
+@pytest.mark.asyncio
+async def test_rescore_uses_current_rows_and_updates_changed_scores(session):
+    now = datetime.now(timezone.utc)
+    safe, risky, unknown = (Supplier(name=n, created_at=now) for n in ("Safe", "Risky", "Unknown"))
+    session.add_all([safe, risky, unknown])
+    old_profile = SupplierRiskProfile(supplier_id=safe.id, retrieved_at=now - timedelta(days=30),
+                                      financial_stress_score=10, news_sentiment_score=-1.0)
+    safe_profile = SupplierRiskProfile(supplier_id=safe.id, retrieved_at=now, financial_stress_score=90,
+                                       news_sentiment_score=0.5)
+    risky_profile = SupplierRiskProfile(supplier_id=risky.id, retrieved_at=now, financial_stress_score=20,
+                                        news_sentiment_score=-0.5, sanctions_flag=True)
+    session.add_all([
+        old_profile, safe_profile, risky_profile,
+        SupplierPerformance(supplier_id=safe.id, period_start=now - timedelta(days=90), period_end=now,
+                            quality_score=50, delivery_score=50, cost_score=50),
+    ])
+    safe.current_risk_profile_id = safe_profile.id
+    risky.current_risk_profile_id = risky_profile.id
+    unknown.risk_score = 42.0
+    await session.commit()
+
+    what_if = await rescore_suppliers(session, RiskWeights(performance=1.0), dry_run=True)
+    assert what_if["scored"] == 2 and what_if["changed"] == 2
+    await session.refresh(safe)
+    assert safe.risk_score == 0.0  # Dry run writes nothing
+
+    summary = await rescore_suppliers(session)
+    assert summary["changed"] == 2
+    for supplier in (safe, risky, unknown):
+        await session.refresh(supplier)
+    assert safe.risk_score == pytest.approx(0.6 * 10 + 0.4 * 25)
+    assert risky.risk_score == 100.0
+    assert unknown.risk_score == 42.0  # No inputs: left alone
+
+    assert (await rescore_suppliers(session))["changed"] == 0
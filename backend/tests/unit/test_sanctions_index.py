@@ -0,0 +1,140 @@
+import os
+import random
+import statistics
+import time
+import pytest
+from app.supplier import sanctions_index
+from app.supplier.adapters.http import DataProviderError
+from app.supplier.adapters.mock import MockDataProvider
+from app.supplier.adapters.sanctions import LocalSanctionsScreener
+from app.supplier.sanctions_index import (
+    SanctionsEntry, SanctionsIndex, build_index, get_sanctions_index, normalize_name,
+    reload_sanctions_index, soundex
+)
+
+SDN = '''36,"AEROCARIBBEAN AIRLINES",-0- ,"CUBA",-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0-
+2674,"ROSNEFTEGAZ OAO",-0- ,"UKRAINE-EO13662",-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0-
+7160,"AL-RASHID TRUST","entity","SDGT",-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0-
+9306,"HUSSEIN, Saddam","individual","IRAQ2",-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0-
+'''
+ALT = '''7160,101,"aka","AL RASHEED TRUST",-0-
+7160,102,"aka","AL-AMIN WELFARE TRUST",-0-
+'''
+EU = '''Entity_LogicalId;Entity_SubjectType;Entity_Regulation_Programme;NameAlias_WholeName;Address_CountryIso2Code
+13;enterprise;PRK;Korea Mining Development Trading Corporation;KP
+13;enterprise;PRK;KOMID;KP
+27;enterprise;IRN;Islamic Republic of Iran Shipping Lines;IR
+'''
+SIMPLE = '''id,name,aliases,countries,list,program,type
+x1,Überseehandel Kühne GmbH,Kuehne Overseas Trading,DE,Internal watchlist,REVIEW,entity
+'''
+
+def _write_lists(directory):
+    (directory / "sdn.csv").write_text(SDN)
+    (directory / "alt.csv").write_text(ALT)
+    (directory / "eu_consolidated.csv").write_text(EU)
+    (directory / "watchlist.csv").write_text(SIMPLE)
+
+def test_normalization_and_phonetic_keys():
+    assert normalize_name("ROSNEFTEGAZ, O.A.O.") == ["rosneftegaz", "o", "a", "o"]
+    assert normalize_name("Rosneftegaz OAO") == ["rosneftegaz"]
+    assert normalize_name("Société Générale S.A.") == ["societe", "generale", "s", "a"]
+    assert normalize_name("The Company") == ["the", "company"]
+    assert soundex("mohammed") == soundex("muhammad") == "m530"
+    assert soundex("robert") == soundex("rupert") == "r163"
+
+def test_list_files_are_parsed_into_one_index(tmp_path):
+    _write_lists(tmp_path)
+    index = build_index(sorted(tmp_path.iterdir()))
+    assert len(index) == 7
+
+    rashid = index.screen("Al Rasheed Trust")[0]
+    assert rashid["entry_id"] == "ofac:7160" and rashid["score"] >= 0.9
+    assert index.screen("Al Amin Welfare Trust")[0]["entry_id"] == "ofac:7160"
+    assert index.screen("Saddam Hussein")[0]["schema"] == "individual"
+
+    komid = index.screen("KOMID", "KP")[0]
+    assert komid["entry_id"] == "eu:13" and komid["countries"] == ["KP"] and komid["list"] == "EU Consolidated"
+    assert index.screen("Kuhne Uberseehandel")[0]["entry_id"] == "x1"
+
+def test_fuzzy_matches_score_above_unrelated_names(tmp_path):
+    _write_lists(tmp_path)
+    index = build_index(sorted(tmp_path.iterdir()))
+    threshold = 0.8
+
+    for misspelled, expected in [
+        ("Rosneftgaz", "ofac:2674"),
+        ("Aero Caribean Airlines", "ofac:36"),
+        ("Islamic Republic of Iran Shiping Lines Co.", "eu:27"),
+    ]:
+        best = index.screen(misspelled, threshold=threshold)
+        assert best and best[0]["entry_id"] == expected, misspelled
+    assert index.screen("Acme Industrial Supplies", threshold=threshold) == []
+    assert index.screen("") == [] and SanctionsIndex().screen("Anything") == []
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    """
+    Start from an empty index; the module-global one is restored afterwards.
+    """
+    monkeypatch.setattr(sanctions_index, "_current_index", SanctionsIndex())
+    monkeypatch.setattr(sanctions_index, "_current_signature", None)
+
+@pytest.mark.asyncio
+async def test_reload_swaps_index_when_lists_change(tmp_path, fresh_index):
+    directory = str(tmp_path)
+    (tmp_path / "sdn.csv").write_text(SDN)
+    first = await reload_sanctions_index(directory)
+    assert get_sanctions_index() is first and len(first) == 4
+    assert await reload_sanctions_index(directory) is first
+
+    # Files being written are ignored until renamed into place
+    (tmp_path / "eu.csv.part").write_text(EU)
+    assert await reload_sanctions_index(directory) is first
+    os.replace(tmp_path / "eu.csv.part", tmp_path / "eu.csv")
+    second = await reload_sanctions_index(directory)
+    assert second.generation == first.generation + 1 and len(second) == 6
+
+    screener = LocalSanctionsScreener(threshold=0.8)
+    result = await screener.check_compliance("Korea Mining Development Trading Corp", "KP")
+    assert result["sanctions_flag"] is True and result["list_generation"] == second.generation
+    assert (await screener.check_compliance("Acme Industrial Supplies", "US"))["sanctions_flag"] is False
+
+    # A broken file keeps the previous index in service
+    (tmp_path / "broken.csv").write_text("foo,bar\n1,2\n")
+    assert await reload_sanctions_index(directory) is second
+
+@pytest.mark.asyncio
+async def test_screening_without_lists_is_not_clean(tmp_path, fresh_index):
+    screener = LocalSanctionsScreener()
+    with pytest.raises(DataProviderError):
+        await screener.check_compliance("Sanctioned Ltd", "KP")
+
+    # A directory without list files loads nothing either
+    empty = await reload_sanctions_index(str(tmp_path / "missing"))
+    assert empty.generation == 1 and not empty.loaded
+    with pytest.raises(DataProviderError):
+        await screener.check_compliance_many([("Acme Industrial Supplies", "US")])
+
+    # The mock provider's scenario triggers still apply on top of the screener
+    provider = MockDataProvider(screener=screener)
+    assert (await provider.check_compliance("Acme Industrial Supplies", "KP"))["sanctions_flag"] is True
+    with pytest.raises(DataProviderError):
+        await provider.check_compliance("Acme Industrial Supplies", "US")
+
+def test_screening_latency_on_a_large_list():
+    rng = random.Random(3)
+    syllables = ["al", "ba", "de", "ka", "lo", "ma", "ni", "or", "ra", "sa", "ta", "vi", "zu", "ek", "in", "go"]
+    word = lambda: "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+    names = [f"{word()} {word()} {rng.choice(['Trading', 'Shipping', 'Metals'])} LLC" for _ in range(20000)]
+    index = SanctionsIndex(SanctionsEntry(f"s{i}", [n], "Synthetic") for i, n in enumerate(names))
+
+    latencies = []
+    for name in rng.sample(names, 300):
+        query = name.replace("a", "e", 1)
+        started = time.perf_counter()
+        matches = index.screen(query)
+        latencies.append(time.perf_counter() - started)
+        assert matches
+    # Typically well under a millisecond; generous for slow CI machines
+    assert statistics.median(latencies) < 0.005
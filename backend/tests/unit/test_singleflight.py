@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from app.core.singleflight import SingleFlight
+from app.llm import CoalescingLLMClient, LLMMessage
+from app.llm.mock import MockLLMClient
+from app.models import Supplier
+
+def _slow(result, delay=0.01):
+    async def call(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return result
+    return AsyncMock(side_effect=call)
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_upstream_call():
+    flights = SingleFlight()
+    upstream = _slow({"ok": True})
+
+    results = await asyncio.gather(*(flights.do("key", upstream) for _ in range(10)))
+    assert results == [{"ok": True}] * 10
+    assert upstream.await_count == 1
+    assert flights.stats() == {"calls": 1, "shared": 9, "in_flight": 0}
+
+    # Nothing is cached after completion
+    await flights.do("key", upstream)
+    assert upstream.await_count == 2
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_cancellation_does_not_spread():
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+    results = await asyncio.gather(*(flights.do("k", failing) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    slow = _slow("done", 0.02)
+    first = asyncio.create_task(flights.do("s", slow))
+    second = asyncio.create_task(flights.do("s", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "done"
+
+@pytest.mark.asyncio
+async def test_batch_embeddings_join_in_flight_texts():
+    inner = MockLLMClient()
+    inner.generate_embedding = _slow([1.0])
+    async def embed_batch(texts):
+        await asyncio.sleep(0.01)
+        return [[2.0]] * len(texts)
+    inner.generate_embeddings = AsyncMock(side_effect=embed_batch)
+    client = CoalescingLLMClient(inner)
+
+    single, batch = await asyncio.gather(
+        client.generate_embedding("net 60"),
+        client.generate_embeddings(["net 60", "audit rights", "audit rights"]),
+    )
+    assert single == [1.0]
+    assert batch == [[1.0], [2.0], [2.0]]
+    inner.generate_embeddings.assert_awaited_once_with(["audit rights"])
+
+@pytest.mark.asyncio
+async def test_identical_json_prompts_are_coalesced():
+    inner = MockLLMClient()
+    inner.generate_json = _slow({"status": "COMPLIANT"})
+    client = CoalescingLLMClient(inner)
+    messages = [LLMMessage(role="user", content="Evaluate Net 60")]
+
+    same = await asyncio.gather(*(client.generate_json(messages, {"type": "object"}, "sys") for _ in range(5)))
+    other = await client.generate_json(messages, {"type": "object"}, "other system prompt")
+    assert inner.generate_json.await_count == 2
+    assert same[0] == other == {"status": "COMPLIANT"}
+    same[0]["status"] = "changed"
+    assert same[1]["status"] == "COMPLIANT"  # Each caller gets its own copy
+
+@pytest.mark.asyncio
+async def test_free_text_calls_work_with_clients_without_temperature():
+    class NoTemperatureClient(MockLLMClient):
+        async def generate_response(self, messages, system_prompt=None):
+            return f"answer to {messages[-1].content}"
+
+    client = CoalescingLLMClient(NoTemperatureClient())
+    messages = [LLMMessage(role="user", content="Net 60?")]
+    assert await client.generate_response(messages, system_prompt="sys") == "answer to Net 60?"
+    assert await client.generate_response(messages, temperature=0.2) == "answer to Net 60?"
+
+    inner = MockLLMClient()
+    inner.generate_response = AsyncMock(return_value="ok")
+    await CoalescingLLMClient(inner).generate_response(messages, temperature=0.2)
+    inner.generate_response.assert_awaited_once_with(messages, system_prompt=None, temperature=0.2)
+
+@pytest.mark.asyncio
+async def test_concurrent_supplier_refreshes_hit_the_provider_once(mocker, session_factory):
+    from app.supplier.intelligence import SupplierIntelligenceService
+    async with session_factory() as session:
+        supplier = Supplier(name="Test Corp", lei="999000000", created_at=datetime.now(timezone.utc))
+        session.add(supplier)
+        await session.commit()
+
+    llm = AsyncMock()
+    llm.generate_json.return_value = {"news_sentiment_score": 0.2, "risk_summary": "", "recommended_action": "PROCEED"}
+    mocker.patch("app.supplier.intelligence.get_llm_client", return_value=llm)
+    provider = AsyncMock()
+    provider.get_financial_health = _slow({"financial_stress_score": 80})
+    provider.get_market_news.return_value = []
+    provider.check_compliance.return_value = {"sanctions_flag": False}
+    mocker.patch("app.supplier.intelligence.get_supplier_data_provider", return_value=provider)
+
+    service = SupplierIntelligenceService(session_factory)
+    profiles = await asyncio.gather(*(service.update_supplier_risk_profile(supplier.id) for _ in range(8)))
+    assert provider.get_financial_health.await_count == 1
+    assert llm.generate_json.await_count == 1
+    assert len({p.id for p in profiles}) == 1
+    assert len({id(p) for p in profiles}) == 8  # Each caller gets its own copy
+    # Written in the shared run's own session
+    async with session_factory() as session:
+        stored = await session.get(Supplier, supplier.id)
+    assert stored.current_risk_profile_id == profiles[0].id
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from app.agent.nodes import drafting_node, human_review_gatekeeper
+from app.agent.speculation import SpeculativeDrafts, draft_fingerprint
+
+CONFIG = {"configurable": {"thread_id": "thread-1"}}
+
+def _state(**overrides):
+    state = {
+        "agency_level": "MEDIUM", "human_approval_status": "", "strategy_decision": "COUNTER",
+        "current_clause_text": "Payment within 90 days.", "reasoning": "Policy requires Net 60.",
+    }
+    state.update(overrides)
+    return state
+
+@pytest.fixture
+def drafts(mocker):
+    drafts = SpeculativeDrafts()
+    mocker.patch("app.agent.nodes.speculative_drafts", drafts)
+    mocker.patch("app.agent.nodes.settings.SPECULATIVE_DRAFTING", True)
+    return drafts
+
+@pytest.mark.asyncio
+async def test_approved_resume_uses_speculative_draft(drafts, mocker):
+    generate = mocker.patch("app.agent.nodes.llm.generate_response", return_value="Payment within 60 days.")
+    mocker.patch("app.agent.nodes.interrupt", side_effect=[RuntimeError("paused"),
+                                                           {"status": "APPROVED", "feedback": ""}])
+
+    # First pass pauses for review; drafting starts in the background
+    with pytest.raises(RuntimeError):
+        await human_review_gatekeeper(_state(), CONFIG)
+    await asyncio.sleep(0)
+    # Resume re-runs the gatekeeper; the draft in flight is not restarted
+    update = await human_review_gatekeeper(_state(), CONFIG)
+    result = await drafting_node(_state(**update), CONFIG)
+
+    assert result["proposed_redline"] == "Payment within 60 days."
+    assert generate.call_count == 1
+    assert (drafts.hits, drafts.misses) == (1, 0)
+
+@pytest.mark.asyncio
+async def test_rejected_resume_discards_draft(drafts, mocker):
+    mocker.patch("app.agent.nodes.llm.generate_response", return_value="Payment within 60 days.")
+    mocker.patch("app.agent.nodes.interrupt", return_value={"status": "REJECTED", "feedback": "No."})
+
+    update = await human_review_gatekeeper(_state(), CONFIG)
+    assert update["human_approval_status"] == "REJECTED"
+    assert await drafts.take("thread-1", draft_fingerprint("Payment within 90 days.", "Policy requires Net 60.")) is None
+
+@pytest.mark.asyncio
+async def test_stale_draft_is_not_served():
+    drafts = SpeculativeDrafts()
+
+    async def draft():
+        return "old text"
+    drafts.start("t", draft_fingerprint("clause", "old reasoning"), draft)
+    assert await drafts.take("t", draft_fingerprint("clause", "new reasoning")) is None
+    assert drafts.misses == 1
@@ -0,0 +1,54 @@
+import pytest
+from app.agent.nodes import summarize_node
+from app.agent.state import merge_messages, reset_messages
+from app.llm import LLMMessage
+
+def _messages(n, start=0):
+    return [LLMMessage(role="user" if i % 2 == 0 else "agent", content=f"message {i}") for i in range(start, start + n)]
+
+def test_merge_messages_appends_or_resets():
+    assert merge_messages(_messages(2), _messages(1, 2)) == _messages(3)
+    assert merge_messages(_messages(5), reset_messages(_messages(2, 3))) == _messages(2, 3)
+
+@pytest.fixture
+def writer(mocker):
+    writer = mocker.Mock()
+    writer.flush = mocker.AsyncMock(return_value=True)
+    mocker.patch("app.agent.nodes.get_transcript_writer", return_value=writer)
+    mocker.patch("app.agent.nodes.settings.NEGOTIATION_SUMMARY_THRESHOLD", 10)
+    mocker.patch("app.agent.nodes.settings.NEGOTIATION_RECENT_MESSAGES", 4)
+    return writer
+
+@pytest.mark.asyncio
+async def test_summarize_bounds_window(writer, mocker):
+    generate = mocker.patch("app.agent.nodes.llm.generate_response", return_value="Supplier wants Net 60.")
+    state = {"contract_id": "c", "messages": _messages(8)}
+
+    # Below the threshold nothing happens
+    assert await summarize_node(state) == {}
+
+    state["messages"] = _messages(12)
+    update = await summarize_node(state)
+    assert merge_messages(state["messages"], update["messages"]) == _messages(4, 8)
+    assert update["conversation_summary"] == "Supplier wants Net 60."
+    assert update["archived_message_count"] == 8
+    assert "message 0" in generate.call_args.args[0][0].content
+    writer.flush.assert_awaited_once()
+
+    # Second round feeds the previous summary back
+    state = {**state, **update, "messages": _messages(11, 8)}
+    update = await summarize_node(state)
+    assert update["archived_message_count"] == 15
+    assert "Supplier wants Net 60." in generate.call_args.args[0][0].content
+
+@pytest.mark.asyncio
+async def test_summarize_keeps_messages_if_transcript_not_stored(writer):
+    writer.flush.return_value = False
+    assert await summarize_node({"contract_id": "c", "messages": _messages(12)}) == {}
+
+@pytest.mark.asyncio
+async def test_summarize_checks_only_its_own_thread(writer, mocker):
+    mocker.patch("app.agent.nodes.llm.generate_response", return_value="Supplier wants Net 60.")
+    config = {"configurable": {"thread_id": "thread-1"}}
+    assert await summarize_node({"contract_id": "c", "messages": _messages(12)}, config)
+    writer.flush.assert_awaited_once_with("thread-1")
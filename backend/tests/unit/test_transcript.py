@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from app.agent.transcript import TranscriptWriter, load_transcript, negotiation_id_for_thread
+from app.llm import LLMMessage
+from app.models import Contract, Negotiation
+
+async def _contract(session_factory):
+    async with session_factory() as session:
+        contract = Contract(title="MSA", created_at=datetime.now(timezone.utc))
+        session.add(contract)
+        await session.commit()
+        return str(contract.id)
+
+@pytest.mark.asyncio
+async def test_writer_batches_off_the_request_path(session_factory, mocker):
+    contract_id = await _contract(session_factory)
+    writer = TranscriptWriter(session_factory, batch_size=100, flush_interval=0.05)
+    write = mocker.spy(writer, "_write")
+
+    writer.record_messages("thread-1", contract_id, [LLMMessage(role="user", content="Net 90?")], 0)
+    writer.record_decision("thread-1", contract_id, strategy="COUNTER", reasoning="Policy caps at Net 60.")
+    writer.record_messages("thread-1", contract_id, [LLMMessage(role="agent", content="Net 60.")], 1)
+    writer.record_decision("thread-1", contract_id, status="completed")
+    assert write.call_count == 0  # Recording never touches the DB
+
+    await asyncio.sleep(0.2)
+    assert write.call_count == 1 and writer.written == 4
+
+    async with session_factory() as session:
+        rows = await load_transcript(session, "thread-1")
+        negotiation = await session.get(Negotiation, negotiation_id_for_thread("thread-1"))
+        messages_only = await load_transcript(session, "thread-1", include_decisions=False)
+    assert [r.content for r in rows] == ["Net 90?", "COUNTER: Policy caps at Net 60.", "Net 60."]
+    assert [(r.sender, r.sequence) for r in messages_only] == [("supplier", 0), ("company", 1)]
+    assert (negotiation.strategy, negotiation.status) == ("COUNTER", "completed")
+
+@pytest.mark.asyncio
+async def test_bad_thread_does_not_block_others(session_factory):
+    contract_id = await _contract(session_factory)
+    writer = TranscriptWriter(session_factory, batch_size=100, flush_interval=60)
+    writer.record_messages("good", contract_id, [LLMMessage(role="user", content="hello")], 0)
+    writer.record_messages("bad", "not-a-uuid", [LLMMessage(role="user", content="lost")], 0)
+
+    assert await writer.flush() is False
+    assert writer.written == 1
+    assert writer._buffer == [] and writer.dead_lettered == 1  # Can never be written, so dropped
+    async with session_factory() as session:
+        assert [r.content for r in await load_transcript(session, "good")] == ["hello"]
+
+    # Later flushes are not poisoned by it
+    writer.record_messages("good", contract_id, [LLMMessage(role="user", content="again")], 1)
+    assert await writer.flush() is True
+    assert writer.written == 2
+    await writer.close()
+
+@pytest.mark.asyncio
+async def test_flush_reports_only_the_asked_thread(session_factory):
+    contract_id = await _contract(session_factory)
+    writer = TranscriptWriter(session_factory, batch_size=100, flush_interval=60)
+    writer.record_messages("good", contract_id, [LLMMessage(role="user", content="hello")], 0)
+    writer.record_messages("bad", "not-a-uuid", [LLMMessage(role="user", content="lost")], 0)
+
+    assert await writer.flush("good") is True
+    writer.record_messages("bad", "not-a-uuid", [LLMMessage(role="user", content="lost")], 1)
+    assert await writer.flush("bad") is False
+    await writer.close()
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_then_dropped(session_factory, mocker):
+    contract_id = await _contract(session_factory)
+    writer = TranscriptWriter(session_factory, batch_size=100, flush_interval=60, max_attempts=3)
+    mocker.patch.object(writer, "_write", side_effect=ConnectionError("database unavailable"))
+    writer.record_messages("thread-1", contract_id, [LLMMessage(role="user", content="hello")], 0)
+
+    for attempt in (1, 2):
+        assert await writer.flush() is False
+        assert [r.attempts for r in writer._buffer] == [attempt]  # Kept for the next flush
+    assert await writer.flush() is False
+    assert writer._buffer == [] and writer.dead_lettered == 1
+    assert await writer.flush() is True
+    await writer.close()